@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared keyword classifier (keyword_classifier) on the combined
+fixture corpus.
+
+The corpus is the title + description of every event the fixture parsers
+produce (see bench_pipeline.parser_cases). Each text is classified with every
+scraper's vocabulary four ways:
+
+  linear         the old per-module loops: lowercase, walk the event-type
+                 rules, lowercase again, walk the tags
+  classify       Vocabulary.classify(): one lowercasing per text shared by
+                 the event type and the tags
+  classify_many  Vocabulary.classify_many() on the whole corpus: repeated
+                 texts are classified once
+  automaton      one KeywordAutomaton (department_catalog) holding the
+                 vocabularies' keywords: a single scan per text, whose
+                 matches serve all of them
+
+and all of them are checked to agree. The automaton pays off only because
+every text goes through all vocabularies here; a scraper applies one to
+three, for which `one vocabulary` shows the same comparison.
+
+Usage (from scrapers/):
+    python benchmarks/bench_classifier.py [--repeat N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from department_catalog import KeywordAutomaton  # noqa: E402
+from keyword_classifier import Classification, Vocabulary  # noqa: E402
+
+
+def vocabularies() -> List[Tuple[str, Vocabulary]]:
+    import browser_scraper
+    import cs_cloudscraper
+    import economics_cloudscraper_new
+    import geosciences_json_scraper
+    import math_ics_scraper
+    import philosophy_ics_scraper
+    import physics_cloudscraper
+    import politics_cloudscraper_new
+    import princeton_localist_scraper
+    import spia_cloudscraper_new
+    import universal_drupal_cloudscraper
+    import universal_ics_scraper
+
+    found = []
+    for module in (browser_scraper, cs_cloudscraper, economics_cloudscraper_new, geosciences_json_scraper, math_ics_scraper,
+                   philosophy_ics_scraper, physics_cloudscraper, politics_cloudscraper_new,
+                   princeton_localist_scraper, spia_cloudscraper_new, universal_drupal_cloudscraper,
+                   universal_ics_scraper):
+        name = module.__name__
+        found.append((name, module.VOCABULARY))
+        if hasattr(module, 'CONTENT_VOCABULARY'):
+            found.append((f'{name} (content)', module.CONTENT_VOCABULARY))
+    for meta_category, vocabulary in universal_drupal_cloudscraper.TAG_VOCABULARIES.items():
+        found.append((f'universal_drupal_cloudscraper ({meta_category})', vocabulary))
+    return found
+
+
+def corpus() -> List[str]:
+    from bench_pipeline import parser_cases
+    texts = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _, call in parser_cases():
+            result = call()
+            events = result[0] if isinstance(result, tuple) else result
+            if isinstance(events, list):
+                texts.extend(f"{event.get('title', '')} {event.get('description', '') or ''}" for event in events)
+    return texts
+
+
+def linear(vocabulary: Vocabulary, text: str) -> Classification:
+    lowered = text.lower()
+    event_type = vocabulary.default_type
+    for keyword, label in vocabulary.event_types:
+        if keyword in lowered:
+            event_type = label
+            break
+    lowered = text.lower()
+    return Classification(event_type, [tag for tag in vocabulary.tags if tag in lowered])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    vocabs = vocabularies()
+    texts = corpus()
+    keywords = {keyword for _, vocabulary in vocabs for keyword in vocabulary.keywords}
+    print(f"{len(texts)} texts ({len(set(texts))} distinct), {len(vocabs)} vocabularies, "
+          f"{len(keywords)} distinct keywords\n")
+
+    vocabulary_list = [vocabulary for _, vocabulary in vocabs]
+
+    def scan(automaton: KeywordAutomaton, vocabularies: List[Vocabulary]) -> List[List[Classification]]:
+        found = [automaton.find(text.lower()) for text in texts]
+        return [[Classification(v.type_of(f), v.tags_of(f)) for f in found] for v in vocabularies]
+
+    identical = True
+    for label, group in (('all vocabularies', vocabulary_list), ('one vocabulary', vocabulary_list[:1])):
+        # Holding only this group's keywords, compiled before timing
+        automaton = KeywordAutomaton()
+        automaton.add(keyword for vocabulary in group for keyword in vocabulary.keywords)
+        automaton.find('')
+        runs = {
+            'linear': lambda: [[linear(v, text) for text in texts] for v in group],
+            'classify': lambda: [[v.classify(text) for text in texts] for v in group],
+            'classify_many': lambda: [v.classify_many(texts) for v in group],
+            'automaton': lambda: scan(automaton, group),
+        }
+        results, seconds = {}, {}
+        for name, run in runs.items():
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                results[name] = run()
+            seconds[name] = (time.perf_counter() - start) / args.repeat
+
+        classifications = len(texts) * len(group)
+        print(f"{label}:")
+        for name in runs:
+            print(f"  {name:<14} {seconds[name] * 1000:8.1f} ms  {classifications / seconds[name]:9.0f} "
+                  f"classifications/sec  {seconds['linear'] / seconds[name]:4.1f}x")
+        identical &= all(results[name] == results['linear'] for name in runs)
+    print(f"\nresults {'identical' if identical else 'DIFFERENT'}")
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark date_normalizer against the per-scraper parsing it replaced.
+
+Builds a listing-like corpus of date strings (N events over a semester, in
+the shapes the department pages use, with the repeats real listings have)
+and parses it three ways, checking they agree wherever the legacy code found
+both a date and a time:
+
+  legacy          the old Drupal _parse_date + _month_to_number and History
+                  _parse_date_time code: uncompiled re.search / strptime,
+                  month dict rebuilt per call
+  normalize       date_normalizer.normalize() per string (memoized)
+  normalize_many  date_normalizer.normalize_many() over the whole list
+
+Usage (from scrapers/):
+    python benchmarks/bench_dates.py [--events N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import date_normalizer  # noqa: E402
+
+SHAPES = [
+    '{d:%A}, {d:%B} {d.day}, {d:%Y} {t}',
+    '{d:%a}, {d:%b} {d.day}, {d:%Y} {t}',
+    '{d:%b} {d.day}, {d:%Y}, {t}',
+    '{d:%m}/{d:%d}/{d:%Y} {t}',
+]
+TIMES = ['12:00 pm – 1:15 pm', '4:30 pm – 6:00 pm', '3:00 pm', '10:00 am – 11:30 am', '12:30 p.m. – 1:30 p.m.']
+
+
+def corpus(count: int) -> List[str]:
+    rng = random.Random(15)
+    start = date(2025, 9, 1)
+    return [rng.choice(SHAPES).format(d=start + timedelta(days=rng.randrange(120)), t=rng.choice(TIMES))
+            for _ in range(count)]
+
+
+def legacy_month_to_number(month: str) -> str:
+    months = {
+        'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
+        'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
+        'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12',
+        'January': '01', 'February': '02', 'March': '03', 'April': '04',
+        'June': '06', 'July': '07', 'August': '08',
+        'September': '09', 'October': '10', 'November': '11', 'December': '12'
+    }
+    return months.get(month, '01')
+
+
+def legacy(text: str):
+    """The old Drupal _parse_date followed by the old History time lookup"""
+    parsed_date = ''
+    date_text = re.sub(r'\s+', ' ', text.strip())
+    for pattern, month_group in ((r'\w+,\s+(\w+)\s+(\d{1,2}),\s+(\d{4})', 1),
+                                 (r'(\w+),?\s+(\w+)\s+(\d{1,2}),?\s+(\d{4})', 2),
+                                 (r'(\w+)\s+(\d{1,2}),?\s+(\d{4})', 1)):
+        match = re.search(pattern, date_text)
+        if match:
+            month, day, year = match.groups()[month_group - 1:month_group + 2]
+            parsed_date = f"{year}-{legacy_month_to_number(month)}-{day.zfill(2)}"
+            break
+    if not parsed_date:
+        match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', date_text)
+        if match:
+            parsed_date = datetime.strptime(match.group(1), '%m/%d/%Y').strftime('%Y-%m-%d')
+    formatted_time = ''
+    match = re.search(r'(\d{1,2}:\d{2} [ap]m)', date_text)
+    if match:
+        formatted_time = datetime.strptime(match.group(1), '%I:%M %p').strftime('%H:%M')
+    return parsed_date, formatted_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    texts = corpus(args.events)
+    print(f"{len(texts)} date strings ({len(set(texts))} distinct)\n")
+
+    def run_normalize():
+        return [(when.date, when.start_time()) if when else ('', '')
+                for when in map(date_normalizer.normalize, texts)]
+
+    def run_normalize_many():
+        return [(when.date, when.start_time()) if when else ('', '')
+                for when in date_normalizer.normalize_many(texts)]
+
+    runs = {
+        'legacy': lambda: [legacy(text) for text in texts],
+        'normalize': run_normalize,
+        'normalize_many': run_normalize_many,
+    }
+    results, seconds = {}, {}
+    for name, run in runs.items():
+        date_normalizer.normalize.cache_clear()
+        date_normalizer.parse_date.cache_clear()
+        date_normalizer.parse_time_range.cache_clear()
+        date_normalizer.parse_iso.cache_clear()
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            results[name] = run()
+        seconds[name] = (time.perf_counter() - start) / args.repeat
+
+    for name in runs:
+        print(f"{name:<15} {seconds[name] * 1000:8.1f} ms  {len(texts) / seconds[name]:10.0f} strings/sec  "
+              f"{seconds['legacy'] / seconds[name]:5.1f}x")
+    print(f"\nnormalize cache: {date_normalizer.normalize.cache_info()}")
+    # The legacy code misses 'p.m.' times; compare wherever it found both fields
+    legacy_full = [i for i, (day, clock) in enumerate(results['legacy']) if day and clock]
+    agree = all(results[name][i] == results['legacy'][i] for name in runs for i in legacy_full)
+    gained = sum(1 for old, new in zip(results['legacy'], results['normalize']) if old != new and all(new))
+    print(f"results {'agree' if agree else 'DIFFER'} on the {len(legacy_full)} strings legacy parsed fully; "
+          f"normalize also reads {gained} more")
+    return 0 if agree else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Drupal listing extractors: BeautifulSoup (html.parser) vs lxml.
+
+Runs every fixtures/drupal_listing_*.html page through both engines of
+UniversalDrupalCloudScraper.parse_listing_page(), checks that they return
+identical events and pagination, and reports the time per page.
+
+Usage (from scrapers/):
+    python benchmarks/bench_drupal_listing.py [--repeat N]
+"""
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from universal_drupal_cloudscraper import UniversalDrupalCloudScraper  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Timestamps differ between any two runs
+VOLATILE_FIELDS = ('created_at', 'updated_at')
+
+
+def comparable(result):
+    events, has_next = result
+    return [{k: v for k, v in e.items() if k not in VOLATILE_FIELDS} for e in events], has_next
+
+
+def time_engine(engine: str, pages, repeat: int):
+    scraper = UniversalDrupalCloudScraper('Politics', 'https://politics.princeton.edu',
+                                          'https://politics.princeton.edu/events', 'social_sciences',
+                                          listing_engine=engine)
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results = [scraper.parse_listing_page(content, 'utf-8', 0) for _, content in pages]
+        elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'drupal_listing_*.html'))):
+        with open(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read()))
+    if not pages:
+        print(f"No drupal_listing_*.html fixtures in {FIXTURES_DIR}")
+        return 1
+
+    bs4_results, bs4_seconds = time_engine('bs4', pages, args.repeat)
+    lxml_results, lxml_seconds = time_engine('lxml', pages, args.repeat)
+
+    identical = True
+    for (name, _), a, b in zip(pages, bs4_results, lxml_results):
+        same = comparable(a) == comparable(b)
+        identical &= same
+        print(f"  {name:<40} {len(a[0]):3d} events  {'identical' if same else 'DIFFERENT'}")
+
+    runs = len(pages) * args.repeat
+    events = sum(len(r[0]) for r in bs4_results) * args.repeat
+    print(f"\nbs4  (html.parser): {bs4_seconds / runs * 1000:7.2f} ms/page, {events / bs4_seconds:8.0f} events/sec")
+    print(f"lxml (single pass): {lxml_seconds / runs * 1000:7.2f} ms/page, {events / lxml_seconds:8.0f} events/sec")
+    print(f"speedup: {bs4_seconds / lxml_seconds:.1f}x")
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark event_record.Event against the 23-key event dicts it replaces.
+
+Builds N events both ways (the dict exactly as the ICS scrapers used to,
+with fresh lists and two datetime.now().isoformat() calls per event), then
+reports construction time, retained memory per event (tracemalloc) and the
+time to serialize the whole list with json.dumps.
+
+Usage (from scrapers/):
+    python benchmarks/bench_event_record.py [--events N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from event_record import Event, json_default  # noqa: E402
+
+DEPARTMENTS = ['History', 'Physics', 'Politics', 'Music', 'Economics', 'Philosophy', 'Mathematics', 'English']
+
+
+def build_dict(i: int):
+    department = DEPARTMENTS[i % len(DEPARTMENTS)]
+    return {
+        'id': f'ics_{department.lower()}_{i}',
+        'title': f'Colloquium {i}',
+        'description': 'A talk.',
+        'start_date': '2026-09-01',
+        'end_date': '2026-09-01',
+        'time': '4:30 PM - 6:00 PM',
+        'location': 'Robertson Hall 016',
+        'event_type': 'Colloquium',
+        'department': department,
+        'meta_category': 'arts_humanities',
+        'source_url': f'https://example.princeton.edu/events/{i}',
+        'source_name': f'{department} Events',
+        'speaker': '',
+        'audience': '',
+        'topics': [],
+        'departments': [],
+        'tags': [],
+        'series': '',
+        'speaker_affiliation': '',
+        'speaker_url': '',
+        'image_url': '',
+        'created_at': datetime.now().isoformat(),
+        'updated_at': datetime.now().isoformat(),
+    }
+
+
+def build_event(i: int):
+    department = DEPARTMENTS[i % len(DEPARTMENTS)]
+    return Event(
+        id=f'ics_{department.lower()}_{i}',
+        title=f'Colloquium {i}',
+        description='A talk.',
+        start_date='2026-09-01',
+        end_date='2026-09-01',
+        time='4:30 PM - 6:00 PM',
+        location='Robertson Hall 016',
+        event_type='Colloquium',
+        department=department,
+        meta_category='arts_humanities',
+        source_url=f'https://example.princeton.edu/events/{i}',
+        source_name=f'{department} Events',
+    )
+
+
+def measure(build, count: int):
+    start = time.perf_counter()
+    events = [build(i) for i in range(count)]
+    build_seconds = time.perf_counter() - start
+    del events
+
+    tracemalloc.start()
+    try:
+        events = [build(i) for i in range(count)]
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    start = time.perf_counter()
+    json.dumps(events, ensure_ascii=False, default=json_default)
+    dump_seconds = time.perf_counter() - start
+    return build_seconds, retained / count, dump_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{args.events} events\n")
+    results = {}
+    for name, build in (('dict', build_dict), ('Event', build_event)):
+        results[name] = measure(build, args.events)
+        build_seconds, per_event, dump_seconds = results[name]
+        print(f"{name:<6} build {build_seconds * 1000:7.1f} ms  {per_event:7.0f} B/event  "
+              f"json {dump_seconds * 1000:7.1f} ms")
+    print(f"\nbuild speedup {results['dict'][0] / results['Event'][0]:.1f}x, "
+          f"memory {results['dict'][1] / results['Event'][1]:.1f}x smaller")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML encoding resolution and parser hand-off for the Drupal fetches.
+
+For every fixtures/*.html page:
+
+  apparent    requests' apparent_encoding (charset detection over the whole
+              body), then decode to str and parse the str
+  resolved    html_encoding.resolve_encoding() (header / <meta>, bounded
+              sniff), then hand the bytes and encoding to the parser
+
+Both are run for the BeautifulSoup and lxml listing parsers, and the parsed
+trees are checked to be identical.
+
+Usage (from scrapers/):
+    python benchmarks/bench_html_encoding.py [--repeat N]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+import drupal_listing_lxml  # noqa: E402
+from html_encoding import resolve_encoding  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+CONTENT_TYPE = 'text/html; charset=utf-8'
+
+
+def apparent_encoding(content: bytes) -> str:
+    response = requests.models.Response()
+    response._content = content
+    return response.apparent_encoding or 'utf-8'
+
+
+def old_bs4(content: bytes):
+    return BeautifulSoup(content.decode(apparent_encoding(content), errors='replace'), 'html.parser')
+
+
+def new_bs4(content: bytes):
+    return BeautifulSoup(content, 'html.parser', from_encoding=resolve_encoding(content, CONTENT_TYPE))
+
+
+def old_lxml(content: bytes):
+    text = content.decode(apparent_encoding(content), errors='replace').replace('\r', drupal_listing_lxml._CR)
+    return drupal_listing_lxml.lxml_html.document_fromstring(text)
+
+
+def new_lxml(content: bytes):
+    return drupal_listing_lxml.parse_html(content, resolve_encoding(content, CONTENT_TYPE))
+
+
+def timed(fn, pages, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [fn(content) for _, content in pages]
+    return results, (time.perf_counter() - start) / repeat / len(pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html'))):
+        with open(path, 'rb') as f:
+            pages.append((os.path.basename(path), f.read()))
+    kib = sum(len(content) for _, content in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {kib:.0f} KiB average\n")
+
+    _, detect = timed(apparent_encoding, pages, args.repeat)
+    _, resolve = timed(lambda content: resolve_encoding(content, CONTENT_TYPE), pages, args.repeat)
+    print(f"encoding   apparent {detect * 1000:7.3f} ms/page   resolved {resolve * 1000:7.3f} ms/page")
+
+    ok = True
+    for name, old, new, serialize in (
+        ('bs4', old_bs4, new_bs4, str),
+        ('lxml', old_lxml, new_lxml, drupal_listing_lxml.lxml_html.tostring),
+    ):
+        old_trees, old_seconds = timed(old, pages, args.repeat)
+        new_trees, new_seconds = timed(new, pages, args.repeat)
+        same = all(serialize(a) == serialize(b) for a, b in zip(old_trees, new_trees))
+        ok &= same
+        print(f"{name:<10} apparent {old_seconds * 1000:7.3f} ms/page   resolved {new_seconds * 1000:7.3f} ms/page   "
+              f"{old_seconds / new_seconds:4.2f}x  {'identical' if same else 'DIFFERENT'}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
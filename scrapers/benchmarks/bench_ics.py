@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming VEVENT reader (ics_stream) against icalendar.
+
+Builds a large multi-year department feed from fixtures/department_feed.ics
+(every VEVENT repeated once per year, with a VALARM added to each copy),
+reads it with icalendar (Calendar.from_ical + walk, projected to the same
+dicts) and with ics_stream.iter_vevents(), checks both return the same
+events and reports the time and peak memory of each.
+
+Usage (from scrapers/):
+    python benchmarks/bench_ics.py [--years N] [--repeat N]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from icalendar import Calendar  # noqa: E402
+from ics_stream import PROPERTIES, project_component, iter_vevents  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+ALARM = 'BEGIN:VALARM\r\nACTION:DISPLAY\r\nDESCRIPTION:Reminder\r\nTRIGGER:-PT15M\r\nEND:VALARM\r\n'
+
+
+def multi_year_feed(years: int) -> bytes:
+    """The fixture feed with its VEVENTs copied into each of the next years"""
+    with open(os.path.join(FIXTURES_DIR, 'department_feed.ics'), encoding='utf-8') as f:
+        text = f.read()
+    head, _, rest = text.partition('BEGIN:VEVENT')
+    vevents = 'BEGIN:VEVENT' + rest[:rest.rindex('END:VCALENDAR')]
+    copies = []
+    for offset in range(years):
+        # Shift the year of every DATE / DATE-TIME value and make UIDs unique
+        shifted = re.sub(r'(:|=)(20\d\d)(\d{4}(?:T\d{6})?)',
+                         lambda m: f'{m.group(1)}{int(m.group(2)) + offset}{m.group(3)}', vevents)
+        shifted = shifted.replace('@events.princeton.edu', f'-{offset}@events.princeton.edu')
+        copies.append(shifted.replace('END:VEVENT\r\n', ALARM + 'END:VEVENT\r\n'))
+    return (head + ''.join(copies) + 'END:VCALENDAR\r\n').encode('utf-8')
+
+
+def read_icalendar(content: bytes):
+    return [project_component(c, PROPERTIES) for c in Calendar.from_ical(content).walk('VEVENT')]
+
+
+def read_stream(content: bytes):
+    return list(iter_vevents(content))
+
+
+def measure(reader, content: bytes, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = reader(content)
+    seconds = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    try:
+        reader(content)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    content = multi_year_feed(args.years)
+    print(f"Feed: {len(content) / 1024:.0f} KiB, {args.years} years")
+
+    ical_events, ical_seconds, ical_peak = measure(read_icalendar, content, args.repeat)
+    stream_events, stream_seconds, stream_peak = measure(read_stream, content, args.repeat)
+
+    identical = ical_events == stream_events
+    print(f"{len(ical_events)} VEVENTs, readers {'identical' if identical else 'DIFFERENT'}\n")
+    for name, seconds, peak in (('icalendar', ical_seconds, ical_peak), ('ics_stream', stream_seconds, stream_peak)):
+        print(f"{name:<11} {seconds * 1000:8.1f} ms  {len(ical_events) / seconds:8.0f} events/sec  "
+              f"{peak / 1024 / 1024:6.1f} MiB peak")
+    print(f"speedup: {ical_seconds / stream_seconds:.1f}x")
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark Localist delta sync (PrincetonLocalistScraper.sync_events) against
+a full scrape, on the fixture server.
+
+  full scrape   scrape_events(): every page of the whole range
+  cold sync     sync_events() with no stored state: one ranged pull,
+                bucketed into date slices
+  warm poll     sync_events() again right away: no slice is due yet
+
+Reports wall time, API requests, and events parsed vs reused, and checks
+that all three return the same events.
+
+Usage (from scrapers/):
+    python benchmarks/bench_localist_sync.py
+"""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixture_server import FixtureServer  # noqa: E402
+
+BENCH_REQUESTS_PER_SECOND = 1000.0
+
+
+def main():
+    work_dir = tempfile.mkdtemp(prefix='localist-sync-bench-')
+    os.environ['SCRAPER_CACHE_DIR'] = os.path.join(work_dir, 'cache')
+
+    from localist_sync import LocalistSyncState
+    from princeton_localist_scraper import PrincetonLocalistScraper
+    from rate_limit import API_RATE_LIMITER
+    API_RATE_LIMITER.requests_per_second = API_RATE_LIMITER.burst = BENCH_REQUESTS_PER_SECOND
+
+    state_path = os.path.join(work_dir, 'sync_state.json')
+    results = {}
+    try:
+        with FixtureServer() as server, server.install():
+            runs = {
+                'full scrape': lambda: (PrincetonLocalistScraper().scrape_events(), None),
+                'cold sync': lambda: sync(LocalistSyncState(state_path)),
+                'warm poll': lambda: sync(LocalistSyncState(state_path)),
+            }
+
+            def sync(state):
+                return PrincetonLocalistScraper().sync_events(state=state), state
+
+            for name, run in runs.items():
+                requests_before = sum(server.hits.values())
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    events, state = run()
+                seconds = time.perf_counter() - start
+                requests = sum(server.hits.values()) - requests_before
+                results[name] = sorted((e['id'], e['start_date']) for e in events)
+                parse_note = f'parsed {state.parsed:4d}  reused {state.reused:5d}' if state else ''
+                print(f"{name:<12} {seconds * 1000:8.1f} ms  {requests:4d} requests  "
+                      f"{len(events):4d} events  {parse_note}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    same = all(result == results['full scrape'] for result in results.values())
+    print(f"\nresults {'identical' if same else 'DIFFERENT'}")
+    return 0 if same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
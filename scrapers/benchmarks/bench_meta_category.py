@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark meta-category resolution (department_catalog) against the
+per-event META_CATEGORY_MAP scan it replaced.
+
+The corpus is a large Localist-like pull: N events whose group names are
+drawn from the catalog's departments, Localist-style 'Department of ...' /
+'Program in ...' spellings, and non-academic offices. Each event's group is
+resolved two ways:
+
+  legacy    lowercase the name and test every META_CATEGORY_MAP keyword
+            (the old PrincetonLocalistScraper._get_meta_category)
+  catalog   DEPARTMENT_CATALOG.meta_category(): exact table, then one
+            automaton scan, memoized per distinct name
+
+The two intentionally differ for some names (catalog entries, and
+'Department of ...' names the legacy scan filed under 'art'); those names
+are listed.
+
+Usage (from scrapers/):
+    python benchmarks/bench_meta_category.py [--events N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from department_catalog import DEPARTMENTS, META_CATEGORY_MAP, DepartmentCatalog  # noqa: E402
+
+OFFICES = ['Office of Campus Life', 'Princeton Athletics', 'Campus Dining', 'Office of Human Resources',
+           'Princeton University Library', 'Lewis Center for the Arts', 'Andlinger Center for Energy']
+
+
+def corpus(count: int) -> List[str]:
+    rng = random.Random(19)
+    names = OFFICES[:]
+    for department in DEPARTMENTS:
+        names.append(department.name)
+        if not department.name.startswith(('Center', 'School', 'University', 'Princeton')):
+            names += [f'Department of {department.name}', f'Program in {department.name}']
+    return [rng.choice(names) for _ in range(count)]
+
+
+def legacy(name: str) -> str:
+    lower = name.lower()
+    for keyword, category in META_CATEGORY_MAP.items():
+        if keyword in lower:
+            return category
+    return 'interdisciplinary'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    names = corpus(args.events)
+    print(f"{len(names)} events ({len(set(names))} distinct group names)\n")
+
+    runs = {
+        'legacy': lambda: [legacy(name) for name in names],
+        # A fresh catalog per run, so the memo starts empty
+        'catalog': lambda: list(map(DepartmentCatalog(DEPARTMENTS, META_CATEGORY_MAP).meta_category, names)),
+    }
+    results, seconds = {}, {}
+    for name, run in runs.items():
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            results[name] = run()
+        seconds[name] = (time.perf_counter() - start) / args.repeat
+
+    for name in runs:
+        print(f"{name:<8} {seconds[name] * 1000:8.1f} ms  {len(names) / seconds[name]:10.0f} events/sec  "
+              f"{seconds['legacy'] / seconds[name]:5.1f}x")
+    changed = sorted({(name, old, new) for name, old, new in zip(names, results['legacy'], results['catalog'])
+                      if old != new})
+    print(f"\n{len(changed)} group names resolve differently:")
+    for name, old, new in changed:
+        print(f"  {name:<45} {old:<20} -> {new}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of the whole scraping pipeline on recorded fixtures.
+
+1. parsers: every parse entry point on its fixture (ICS, calendar.json,
+   Localist API pages, Drupal / CS / SPIA / Economics / Physics HTML)
+2. sources: every registered source (plus the standalone Localist scraper)
+   run one at a time against the local fixture server
+3. combine: combine_all_events() end to end against the fixture server
+
+Reports time, events/sec and peak traced memory (tracemalloc) for each. No
+network access is needed: HTTP_CLIENT is pointed at benchmarks/fixture_server.py.
+Exits non-zero when a parser or source fails or yields no events.
+
+With --baseline, the results are also compared with a stored run (see
+baseline.json): the run fails when an event or payload count differs, or
+when a case is more than --max-slowdown times slower than in the baseline
+(and slower by at least --min-delta seconds, so millisecond-scale cases do
+not fail on timer noise). The Benchmark Scrapers workflow runs this on
+every pull request. To refresh the baseline, run that workflow on master
+(workflow_dispatch) and commit its bench-results artifact, rather than a
+local run, since timings depend on the machine.
+
+Usage (from scrapers/):
+    python benchmarks/bench_pipeline.py [--repeat N] [--pipeline] [--json results.json]
+                                        [--baseline benchmarks/baseline.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+SCRAPERS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPERS_DIR)
+
+from fixture_server import FIXTURES_DIR, FixtureServer  # noqa: E402
+
+# Politeness limits are not what is being measured here
+BENCH_REQUESTS_PER_SECOND = 1000.0
+
+# Counts that must match the baseline exactly, per result row
+EXACT_FIELDS = ('events', 'payloads')
+
+
+def fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def parser_cases() -> List[Tuple[str, Callable[[], Any]]]:
+    """(name, zero-argument parse call) for every parser, bound to its fixture"""
+    from universal_ics_scraper import parse_ics_feed
+    from math_ics_scraper import parse_math_feed
+    from philosophy_ics_scraper import parse_philosophy_feed
+    from geosciences_json_scraper import GeosciencesJSONScraper
+    from princeton_localist_scraper import PrincetonLocalistScraper
+    from cs_cloudscraper import parse_cs_listing, parse_cs_details
+    from economics_cloudscraper_new import parse_economics_listing
+    from spia_cloudscraper_new import parse_spia_listing, parse_spia_details
+    from physics_cloudscraper import parse_physics_listing
+    from universal_drupal_cloudscraper import UniversalDrupalCloudScraper, parse_event_details
+
+    ics = fixture('department_feed.ics')
+    calendar_json = fixture('fullcalendar.json')
+    localist_page = fixture('localist_events_p1.json')
+    cs_listing, cs_event = fixture('cs_listing.html'), fixture('cs_event.html')
+    spia_listing, spia_event = fixture('spia_listing.html'), fixture('spia_event.html')
+    economics_listing = fixture('economics_listing.html')
+    physics_listing = fixture('physics_listing.html')
+    drupal_listing, drupal_event = fixture('drupal_listing_politics_p0.html'), fixture('drupal_detail_politics.html')
+
+    geosciences = GeosciencesJSONScraper()
+    localist = PrincetonLocalistScraper()
+    politics = ('Politics', 'https://politics.princeton.edu', 'https://politics.princeton.edu/events', 'social_sciences')
+    drupal_bs4 = UniversalDrupalCloudScraper(*politics, listing_engine='bs4')
+    drupal_lxml = UniversalDrupalCloudScraper(*politics, listing_engine='lxml')
+
+    return [
+        ('ics: universal', lambda: parse_ics_feed('History', 'history.princeton.edu', 'arts_humanities', ics)),
+        ('ics: math', lambda: parse_math_feed(ics)),
+        ('ics: philosophy', lambda: parse_philosophy_feed(ics)),
+        ('calendar.json: geosciences',
+         lambda: [geosciences._extract_event_from_json(item) for item in json.loads(calendar_json)]),
+        ('localist: events page',
+         lambda: [e for e in (localist._parse_event(raw) for raw in json.loads(localist_page)['events']) if e]),
+        ('cs: listing', lambda: parse_cs_listing(cs_listing)),
+        ('cs: detail', lambda: parse_cs_details(cs_event)),
+        ('economics: listing', lambda: parse_economics_listing(economics_listing, 1)),
+        ('spia: listing', lambda: parse_spia_listing(spia_listing, 0)),
+        ('spia: detail', lambda: parse_spia_details(spia_event)),
+        ('physics: listing', lambda: parse_physics_listing(physics_listing, 'utf-8')),
+        ('drupal: listing (bs4)', lambda: drupal_bs4.parse_listing_page(drupal_listing, 'utf-8', 0)),
+        ('drupal: listing (lxml)', lambda: drupal_lxml.parse_listing_page(drupal_listing, 'utf-8', 0)),
+        ('drupal: detail', lambda: parse_event_details(*politics, {'title': 'Event'}, drupal_event, 'utf-8')),
+    ]
+
+
+def measure(fn: Callable[[], Any], repeat: int = 1) -> Dict[str, Any]:
+    """
+    Time repeat calls of fn and keep the fastest, which is the least
+    disturbed by the rest of the machine, then trace one more call for peak
+    memory (tracemalloc slows allocation-heavy code, so it is kept out of the
+    timing).
+    """
+    from parse_stage import count_events
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            seconds = min(seconds, time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {'seconds': seconds, 'events': count_events(result), 'peak_bytes': peak, 'result': result}
+
+
+def clear_caches():
+    """Drop the feed, detail and snapshot caches so every run starts cold"""
+    shutil.rmtree(os.environ['SCRAPER_CACHE_DIR'], ignore_errors=True)
+
+
+def measure_cold(fn: Callable[[], Any]) -> Dict[str, Any]:
+    """
+    One timed and one traced call of fn, each on cold caches. Returns the
+    timed call's result and parse-stage seconds and the traced call's peak.
+    """
+    from parse_stage import PARSE_STAGE
+    clear_caches()
+    before = PARSE_STAGE.totals()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        after = PARSE_STAGE.totals()
+        clear_caches()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    parse_calls = after['calls'] - before['calls']
+    return {'seconds': seconds, 'parse_calls': parse_calls, 'parse_seconds': after['seconds'] - before['seconds'],
+            'peak_bytes': peak, 'result': result}
+
+
+def events_per_sec(events: int, seconds: float) -> float:
+    return events / seconds if seconds else 0.0
+
+
+def bench_parsers(repeat: int) -> Tuple[List[Dict[str, Any]], bool]:
+    print(f"\nPARSERS (best of {repeat} runs each):")
+    rows, ok = [], True
+    for name, call in parser_cases():
+        try:
+            stats = measure(call, repeat)
+        except Exception as e:
+            print(f"  {name:<28} ERROR: {e}")
+            rows.append({'name': name, 'error': str(e)})
+            ok = False
+            continue
+        result = stats.pop('result')
+        # Detail parsers return one dict per page rather than events
+        empty = not result[0] if isinstance(result, tuple) else not result
+        ok &= not empty
+        rows.append({'name': name, **stats})
+        print(f"  {name:<28} {stats['seconds'] * 1000:8.2f} ms  {stats['events']:4d} events  "
+              f"{events_per_sec(stats['events'], stats['seconds']):8.0f} events/sec  "
+              f"{stats['peak_bytes'] / 1024 / 1024:6.1f} MiB peak{'  EMPTY' if empty else ''}")
+    return rows, ok
+
+
+def bench_sources() -> Tuple[List[Dict[str, Any]], bool]:
+    """Run every source on its own so the timing and peak memory are its alone"""
+    from combine_cloudscraper_events import run_source
+    from sources import Source, select_sources
+
+    class LocalistSource(Source):
+        # Not registered with the combiner, benchmarked standalone
+        key = 'localist'
+        group = 'standalone'
+
+        def fetch(self):
+            from princeton_localist_scraper import PrincetonLocalistScraper
+            return PrincetonLocalistScraper().scrape_events()
+
+    class LocalistAcademicSource(LocalistSource):
+        key = 'localist_academic'
+
+        def fetch(self):
+            from princeton_localist_scraper import PrincetonLocalistScraper
+            return PrincetonLocalistScraper().scrape_academic_events()
+
+    print("\nSOURCES (fixture server, one at a time, cold caches; parse = summed PARSE_STAGE time):")
+    rows, ok = [], True
+    for source in select_sources(use_browser=False) + [LocalistSource(), LocalistAcademicSource()]:
+        stats = measure_cold(lambda: run_source(source))
+        run = stats.pop('result')
+        events = len(run.events)
+        ok &= bool(events) and not run.error
+        rows.append({'name': source.key, 'events': events, 'payloads': run.payloads, 'error': run.error, **stats})
+        # JSON sources parse inline rather than through PARSE_STAGE
+        parse = f"parse {stats['parse_seconds']:6.3f}s" if stats['parse_calls'] else 'parse      -'
+        status = f"ERROR: {run.error}" if run.error else ('' if events else 'EMPTY')
+        print(f"  {source.key:<20} {stats['seconds']:7.2f}s  {events:5d} events  "
+              f"{events_per_sec(events, stats['seconds']):8.0f} events/sec  {parse}  "
+              f"{stats['peak_bytes'] / 1024 / 1024:6.1f} MiB peak  {status}")
+    return rows, ok
+
+
+def bench_combine(pipeline: bool) -> Tuple[Dict[str, Any], bool]:
+    from combine_cloudscraper_events import OUTPUT_FILE, combine_all_events
+
+    print(f"\nCOMBINE (combine_all_events, {'process-pool parse' if pipeline else 'inline parse'}):")
+    stats = measure_cold(lambda: combine_all_events(use_browser=False, pipeline=pipeline))
+    stats.pop('result')
+    with open(OUTPUT_FILE, encoding='utf-8') as f:
+        events = len(json.load(f)['events'])
+    print(f"  {stats['seconds']:7.2f}s  {events:5d} events after dedup  "
+          f"{events_per_sec(events, stats['seconds']):8.0f} events/sec  parse {stats['parse_seconds']:6.3f}s  "
+          f"{stats['peak_bytes'] / 1024 / 1024:6.1f} MiB peak")
+    return {'events': events, **stats}, bool(events)
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                        max_slowdown: float, min_delta: float) -> List[str]:
+    """Differences from the baseline that fail the run, one line each"""
+    def rows(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        flat = {f"parser {row['name']}": row for row in data.get('parsers', [])}
+        flat.update({f"source {row['name']}": row for row in data.get('sources', [])})
+        if 'combine' in data:
+            flat['combine'] = data['combine']
+        return flat
+
+    current, expected = rows(results), rows(baseline)
+    if 'combine' not in results:
+        # --skip-combine
+        expected.pop('combine', None)
+    problems = []
+    for name, base in expected.items():
+        row = current.get(name)
+        if row is None:
+            problems.append(f"{name}: missing from this run")
+            continue
+        if row.get('error'):
+            problems.append(f"{name}: {row['error']}")
+            continue
+        for field in EXACT_FIELDS:
+            if field in base and row.get(field) != base[field]:
+                problems.append(f"{name}: {field} {row.get(field)} (baseline {base[field]})")
+        seconds, base_seconds = row.get('seconds'), base.get('seconds')
+        if seconds is not None and base_seconds and \
+                seconds > base_seconds * max_slowdown and seconds - base_seconds >= min_delta:
+            problems.append(f"{name}: {seconds:.3f}s vs {base_seconds:.3f}s baseline "
+                            f"({seconds / base_seconds:.1f}x, limit {max_slowdown:.1f}x)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10, help='runs per parser benchmark')
+    parser.add_argument('--pipeline', action='store_true', help='parse on a process pool in the combine run')
+    parser.add_argument('--skip-combine', action='store_true')
+    parser.add_argument('--json', metavar='PATH', help='also write the results to PATH as JSON')
+    parser.add_argument('--baseline', metavar='PATH', help='fail on regressions against this results JSON')
+    parser.add_argument('--max-slowdown', type=float, default=2.0,
+                        help='slowdown factor against the baseline that fails the run (default 2.0)')
+    parser.add_argument('--min-delta', type=float, default=0.05,
+                        help='ignore slowdowns smaller than this many seconds (default 0.05)')
+    args = parser.parse_args()
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    # Caches, snapshots and the combined output go to a scratch directory;
+    # http_cache reads SCRAPER_CACHE_DIR at import, so this precedes any
+    # scraper import
+    work_dir = tempfile.mkdtemp(prefix='scraper-bench-')
+    os.environ['SCRAPER_CACHE_DIR'] = os.path.join(work_dir, 'cache')
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+
+    from rate_limit import API_RATE_LIMITER, HOST_RATE_LIMITER
+    for limiter in (HOST_RATE_LIMITER, API_RATE_LIMITER):
+        limiter.requests_per_second = BENCH_REQUESTS_PER_SECOND
+        limiter.burst = BENCH_REQUESTS_PER_SECOND
+
+    results: Dict[str, Any] = {}
+    try:
+        # Installed before the parser cases import the scrapers, which bind
+        # HTTP_CLIENT at import
+        with FixtureServer() as server, server.install():
+            results['parsers'], parsers_ok = bench_parsers(args.repeat)
+            results['sources'], sources_ok = bench_sources()
+            combine_ok = True
+            if not args.skip_combine:
+                results['combine'], combine_ok = bench_combine(args.pipeline)
+        if server.misses:
+            print(f"\nWARNING: {len(server.misses)} requests had no fixture, e.g. {server.misses[0]}")
+        results['unrouted_requests'] = len(server.misses)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {json_path}")
+
+    baseline_ok = True
+    if baseline is not None:
+        problems = compare_to_baseline(results, baseline, args.max_slowdown, args.min_delta)
+        print(f"\nBASELINE ({args.baseline}): {'OK' if not problems else f'{len(problems)} regressions'}")
+        for problem in problems:
+            print(f"  {problem}")
+        baseline_ok = not problems
+    return 0 if parsers_ok and sources_ok and combine_ok and baseline_ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
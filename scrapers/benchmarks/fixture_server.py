@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stand-in for the upstream event sites.
+
+Serves the recorded responses in fixtures/ on 127.0.0.1 so the scrapers can
+run end to end without network access. ROUTES maps upstream URLs to fixture
+files. FixtureServer.install() replaces http_client.HTTP_CLIENT with a
+FixtureHTTPClient whose sessions send every request here, so
+https://politics.princeton.edu/events?page=1 is fetched from
+http://127.0.0.1:<port>/politics.princeton.edu/events?page=1 and answered with
+drupal_listing_politics_p1.html. Scrapers bind HTTP_CLIENT when they are
+imported, so install() has to run before the first scraper import.
+
+To refresh a fixture from the live site (from scrapers/):
+    python benchmarks/fixture_server.py --record URL FIXTURE_NAME
+"""
+import argparse
+import os
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# (upstream URL pattern, fixture file). '*' matches any run of characters;
+# patterns without a '?' ignore the query string. First match wins.
+ROUTES: List[Tuple[str, str]] = [
+    # ICS feeds: every department feed and the math feed share one recording
+    ('https://*.princeton.edu/feeds/events/ical.ics', 'department_feed.ics'),
+    ('https://www.math.princeton.edu/events-feed.ics', 'department_feed.ics'),
+    # FullCalendar calendar.json feeds
+    ('https://phy.princeton.edu/feeds/events/calendar.json', 'fullcalendar.json'),
+    ('https://geosciences.princeton.edu/feeds/events/calendar.json', 'fullcalendar.json'),
+    # Localist API, two pages of 100 events (for every group_id) and the group list
+    ('https://events.princeton.edu/api/2/events?page=2&*', 'localist_events_p2.json'),
+    ('https://events.princeton.edu/api/2/events', 'localist_events_p1.json'),
+    ('https://events.princeton.edu/api/2/groups', 'localist_groups.json'),
+    # HTML listing and detail pages
+    ('https://www.cs.princeton.edu/events', 'cs_listing.html'),
+    ('https://www.cs.princeton.edu/events/*', 'cs_event.html'),
+    ('https://economics.princeton.edu/events/upcoming-seminars/', 'economics_listing.html'),
+    ('https://spia.princeton.edu/events', 'spia_listing.html'),
+    ('https://spia.princeton.edu/events/*', 'spia_event.html'),
+    ('https://politics.princeton.edu/events?page=1', 'drupal_listing_politics_p1.html'),
+    ('https://politics.princeton.edu/events', 'drupal_listing_politics_p0.html'),
+    ('https://politics.princeton.edu/events/*', 'drupal_detail_politics.html'),
+]
+
+CONTENT_TYPES = {
+    '.ics': 'text/calendar; charset=utf-8',
+    '.json': 'application/json',
+    '.html': 'text/html; charset=utf-8',
+}
+
+
+def _compile(pattern: str) -> re.Pattern:
+    regex = '.*'.join(re.escape(part) for part in pattern.split('*'))
+    if '?' not in pattern:
+        # Match the path only, whatever the query string
+        regex += r'(\?.*)?'
+    return re.compile(regex)
+
+
+class FixtureAdapter(HTTPAdapter):
+    """Transport adapter that sends every request to a FixtureServer"""
+
+    def __init__(self, server: 'FixtureServer'):
+        super().__init__()
+        self.server = server
+
+    def send(self, request, **kwargs):
+        request.url = self.server.rewrite(request.url)
+        return super().send(request, **kwargs)
+
+
+class FixtureServer:
+    """ThreadingHTTPServer answering upstream URLs from fixture files"""
+
+    def __init__(self, routes: List[Tuple[str, str]] = ROUTES, fixtures_dir: str = FIXTURES_DIR):
+        self.routes = [(_compile(pattern), name) for pattern, name in routes]
+        self.fixtures_dir = fixtures_dir
+        self.hits: Dict[str, int] = {}
+        self.misses: List[str] = []
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def fixture_for(self, url: str) -> Optional[str]:
+        for regex, name in self.routes:
+            if regex.fullmatch(url):
+                return name
+        return None
+
+    def body(self, name: str) -> bytes:
+        with self._lock:
+            if name not in self._bodies:
+                with open(os.path.join(self.fixtures_dir, name), 'rb') as f:
+                    self._bodies[name] = f.read()
+            return self._bodies[name]
+
+    def rewrite(self, url: str) -> str:
+        """Upstream URL -> the same URL on this server"""
+        parsed = urlparse(url)
+        rewritten = f'{self.base_url}/{parsed.netloc}{parsed.path or "/"}'
+        return f'{rewritten}?{parsed.query}' if parsed.query else rewritten
+
+    @contextmanager
+    def install(self):
+        """
+        Point http_client.HTTP_CLIENT at this server for the duration of the
+        block. Metrics, sessions and payload keys keep the upstream URLs.
+        """
+        import http_client
+
+        server = self
+
+        class FixtureHTTPClient(http_client.HTTPClient):
+            def _new_session(self, browser: bool):
+                session = super()._new_session(browser)
+                adapter = FixtureAdapter(server)
+                for prefix in ('https://', 'http://'):
+                    session.mount(prefix, adapter)
+                return session
+
+        previous = http_client.HTTP_CLIENT
+        http_client.HTTP_CLIENT = FixtureHTTPClient()
+        try:
+            yield http_client.HTTP_CLIENT
+        finally:
+            http_client.HTTP_CLIENT = previous
+
+    def _handle(self, request_path: str) -> Tuple[int, str, bytes]:
+        # request_path is /<host><path>?<query>
+        url = 'https://' + request_path.lstrip('/')
+        name = self.fixture_for(url)
+        with self._lock:
+            if name is None:
+                self.misses.append(url)
+            else:
+                self.hits[name] = self.hits.get(name, 0) + 1
+        if name is None:
+            return 404, 'text/plain', b'no fixture for this URL'
+        content_type = CONTENT_TYPES.get(os.path.splitext(name)[1], 'application/octet-stream')
+        return 200, content_type, self.body(name)
+
+    def start(self) -> 'FixtureServer':
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, content_type, body = server._handle(self.path)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def record_fixture(url: str, name: str, fixtures_dir: str = FIXTURES_DIR) -> int:
+    """Save the live response for url as a fixture. Returns the byte count."""
+    from http_client import HTTP_CLIENT, BROWSER_HEADERS
+    response = HTTP_CLIENT.get(url, headers=BROWSER_HEADERS, browser=True)
+    response.raise_for_status()
+    with open(os.path.join(fixtures_dir, name), 'wb') as f:
+        f.write(response.content)
+    return len(response.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve or record benchmark fixtures')
+    parser.add_argument('--record', nargs=2, metavar=('URL', 'FIXTURE_NAME'),
+                        help='fetch URL from the live site and save it under fixtures/')
+    args = parser.parse_args()
+
+    if args.record:
+        url, name = args.record
+        size = record_fixture(url, name)
+        print(f"Recorded {url} -> {name} ({size / 1024:.0f} KiB)")
+        return 0
+
+    with FixtureServer() as server:
+        print(f"Serving {FIXTURES_DIR} at {server.base_url} (Ctrl-C to stop)")
+        for pattern, name in ROUTES:
+            print(f"  {pattern:<60} {name}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.exit(main())
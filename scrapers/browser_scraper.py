@@ -2,15 +2,37 @@
 """
 Browser-based scraper using Playwright to bypass Cloudflare protection.
 This scraper uses a real browser to render pages and solve JS challenges.
+
+All departments share one browser: scrape_all_browser_departments() launches
+Chromium once and runs the departments as asyncio tasks over a bounded pool
+of pages, at most max_per_host of them on the same site.
+
+In lean mode pages abort requests for images, media, fonts, stylesheets and
+analytics, and get_page() returns as soon as an event container is in the
+DOM instead of waiting for network idle. Render time and bytes transferred
+are recorded per page either way (BrowserScraper.page_stats). Lean mode is
+off unless SCRAPER_BROWSER_LEAN=1, until a --compare-lean run shows it
+returns the same events as a full render for every department.
+
+With capture_json, JSON responses to XHR/fetch requests seen while a page
+loads (FullCalendar feeds, Drupal views AJAX) are kept alongside the HTML.
+BrowserDrupalScraper parses events straight from them and only falls back
+to parsing the rendered DOM when they hold no events.
 """
 
 import asyncio
 import json
+import os
 import re
 import random
+import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
+from date_normalizer import clock, month_number, normalize_range, parse_date
+from department_catalog import DEPARTMENT_CATALOG
+from keyword_classifier import Vocabulary
 
 try:
     from playwright.async_api import async_playwright, Page, Browser
@@ -19,14 +41,91 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     print("WARNING: Playwright not installed. Run: pip install playwright && playwright install chromium")
 
+# Opt-in until lean renders are shown to return the same events (--compare-lean)
+LEAN = os.environ.get('SCRAPER_BROWSER_LEAN') == '1'
+
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('seminar', 'Seminar'), ('colloquium', 'Colloquium'), ('lecture', 'Lecture'),
+        ('workshop', 'Workshop'), ('talk', 'Talk'), ('conference', 'Conference'),
+    ],
+)
+
+# Listing containers, as used by BrowserDrupalScraper._extract_events_from_soup
+EVENT_CONTAINERS = [
+    ('div', 'node--type-event'),
+    ('article', 'node--type-event'),
+    ('div', 'content-list-item'),
+    ('div', 'event-item'),
+    ('article', 'event'),
+    ('div', 'views-row'),
+    ('li', 'event'),
+]
+EVENT_CONTAINER_SELECTOR = ', '.join(f'{tag}.{cls}' for tag, cls in EVENT_CONTAINERS)
+
+# Lean mode: request types and hosts the event listings do not need
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+BLOCKED_HOSTS = ('google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'facebook.net',
+                 'hotjar.com', 'siteimproveanalytics.io', 'newrelic.com', 'nr-data.net')
+
+
+def payload_has_events(data: Any) -> bool:
+    """
+    Whether a captured JSON body looks like it holds listing events: a
+    FullCalendar item with a title and start, or a Drupal views 'insert'
+    command whose HTML mentions an event container class. Only the shape is
+    checked, nothing is parsed; BrowserDrupalScraper extracts the events
+    once the page is rendered.
+    """
+    if isinstance(data, dict):
+        data = data.get('events')
+    if not isinstance(data, list):
+        return False
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        if item.get('title') and item.get('start'):
+            return True
+        html = item.get('data')
+        if item.get('command') == 'insert' and isinstance(html, str) and \
+                any(cls in html for _tag, cls in EVENT_CONTAINERS):
+            return True
+    return False
+
+
+class RenderedPage(NamedTuple):
+    html: str
+    # (url, decoded body) of each JSON XHR/fetch response, in arrival order
+    payloads: List[Tuple[str, Any]]
+
+
+class PageStats(NamedTuple):
+    url: str
+    seconds: float
+    bytes: int
+    requests: int
+    blocked: int
+
 
 class BrowserScraper:
-    """Browser-based scraper that can bypass Cloudflare protection"""
+    """
+    Browser-based scraper that can bypass Cloudflare protection.
+
+    One instance can serve many concurrent get_page() calls: at most
+    max_pages pages are open at once, and at most max_per_host of them on
+    the same host. lean turns on resource blocking and selector waits.
+    """
 
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, max_pages: int = 4, max_per_host: int = 1, lean: bool = False):
         self.headless = headless
+        self.lean = lean
+        self.page_stats: List[PageStats] = []
         self.browser: Optional[Browser] = None
         self.context = None
+        self.max_pages = max_pages
+        self.max_per_host = max_per_host
+        self._page_slots: Optional[asyncio.Semaphore] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
 
     async def __aenter__(self):
         await self.start()
@@ -40,6 +139,10 @@ class BrowserScraper:
         if not PLAYWRIGHT_AVAILABLE:
             raise RuntimeError("Playwright not available")
 
+        # Created here so they belong to the running event loop
+        self._page_slots = asyncio.Semaphore(self.max_pages)
+        self._host_slots = {}
+
         self.playwright = await async_playwright().start()
 
         # Use chromium with stealth settings
@@ -124,12 +227,79 @@ class BrowserScraper:
         if hasattr(self, 'playwright'):
             await self.playwright.stop()
 
-    async def get_page(self, url: str, wait_for: str = 'networkidle', timeout: int = 60000) -> str:
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_slots[host]
+
+    async def get_page(self, url: str, wait_for: str = 'networkidle', timeout: int = 60000,
+                       wait_selector: str = EVENT_CONTAINER_SELECTOR, selector_timeout: int = 15000) -> str:
         """
         Fetch a page and return its HTML content.
         Handles Cloudflare challenges by waiting for them to resolve.
+        Waits for a free slot in the page pool and for the page's host.
+
+        In lean mode the page is returned once wait_selector is attached (or
+        after selector_timeout, for listings with no events) rather than at
+        the wait_for load state.
         """
+        rendered = await self.render(url, wait_for, timeout, wait_selector, selector_timeout)
+        return rendered.html
+
+    async def render(self, url: str, wait_for: str = 'networkidle', timeout: int = 60000,
+                     wait_selector: str = EVENT_CONTAINER_SELECTOR, selector_timeout: int = 15000,
+                     capture_json: bool = False,
+                     json_has_events: Optional[Callable[[Any], bool]] = None) -> RenderedPage:
+        """
+        get_page() that also returns the JSON XHR/fetch responses when
+        capture_json is set. In lean mode a captured response for which
+        json_has_events() is true ends the wait as well as the selector does;
+        other JSON (analytics, config, translations) never ends it early.
+        """
+        async with self._host_slot(url), self._page_slots:
+            return await self._render(url, wait_for, timeout, wait_selector, selector_timeout, capture_json,
+                                      json_has_events)
+
+    @staticmethod
+    async def _capture(response, payloads: List[Tuple[str, Any]], seen: asyncio.Event,
+                       has_events: Optional[Callable[[Any], bool]]):
+        if response.request.resource_type not in ('xhr', 'fetch'):
+            return
+        if 'json' not in response.headers.get('content-type', ''):
+            return
+        try:
+            data = json.loads(await response.text())
+        except Exception:
+            return
+        payloads.append((response.url, data))
+        if has_events is not None and has_events(data):
+            seen.set()
+
+    async def _route(self, route, counts: Dict[str, int]):
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+            counts['blocked'] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _render(self, url: str, wait_for: str, timeout: int, wait_selector: str, selector_timeout: int,
+                      capture_json: bool = False,
+                      json_has_events: Optional[Callable[[Any], bool]] = None) -> RenderedPage:
         page = await self.context.new_page()
+        counts = {'blocked': 0}
+        sizes = []
+        page.on('requestfinished', lambda request: sizes.append(asyncio.ensure_future(request.sizes())))
+        payloads: List[Tuple[str, Any]] = []
+        json_seen = asyncio.Event()
+        captures = []
+        if capture_json:
+            page.on('response', lambda response: captures.append(
+                asyncio.ensure_future(self._capture(response, payloads, json_seen, json_has_events))))
+        if self.lean:
+            await page.route('**/*', lambda route: self._route(route, counts))
+        start = time.perf_counter()
 
         try:
             # Navigate to page
@@ -150,76 +320,185 @@ class BrowserScraper:
                 else:
                     print("    WARNING: Cloudflare challenge may not have resolved")
 
-            # Wait for page to be fully loaded
-            await page.wait_for_load_state(wait_for, timeout=timeout)
-
-            # Small random delay to appear more human
-            await asyncio.sleep(random.uniform(0.5, 1.5))
+            if self.lean:
+                # Return as soon as the listing (or JSON holding its events) is there
+                waits = [asyncio.ensure_future(page.wait_for_selector(wait_selector, state='attached',
+                                                                      timeout=selector_timeout))]
+                if capture_json and json_has_events is not None:
+                    waits.append(asyncio.ensure_future(json_seen.wait()))
+                done, pending = await asyncio.wait(waits, timeout=selector_timeout / 1000,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for task in pending:
+                    task.cancel()
+                if not any(task.exception() is None for task in done):
+                    print("    No event container appeared, using the page as is")
+            else:
+                # Wait for page to be fully loaded
+                await page.wait_for_load_state(wait_for, timeout=timeout)
+
+                # Small random delay to appear more human
+                await asyncio.sleep(random.uniform(0.5, 1.5))
 
             # Get final content
             content = await page.content()
-            return content
+            await asyncio.gather(*captures, return_exceptions=True)
+            await self._record(url, time.perf_counter() - start, sizes, counts['blocked'])
+            return RenderedPage(content, list(payloads))
 
         finally:
+            # Requests still finishing after the content was taken are not counted
+            for pending in sizes + captures:
+                pending.cancel()
             await page.close()
 
+    async def _record(self, url: str, seconds: float, sizes: list, blocked: int):
+        transferred = 0
+        for result in await asyncio.gather(*sizes, return_exceptions=True):
+            if isinstance(result, dict):
+                transferred += result.get('responseBodySize', 0) + result.get('responseHeadersSize', 0)
+        self.page_stats.append(PageStats(url, seconds, transferred, len(sizes), blocked))
+        print(f"    Rendered in {seconds:.2f}s, {transferred / 1024:.0f} KiB over {len(sizes)} requests, "
+              f"{blocked} blocked")
+
+    def stats_summary(self) -> str:
+        """One line over every page rendered so far"""
+        if not self.page_stats:
+            return 'no pages rendered'
+        pages = len(self.page_stats)
+        seconds = sum(stats.seconds for stats in self.page_stats)
+        transferred = sum(stats.bytes for stats in self.page_stats)
+        blocked = sum(stats.blocked for stats in self.page_stats)
+        return (f"{pages} pages, {seconds / pages:.2f}s average render, "
+                f"{transferred / 1024 / 1024:.1f} MiB transferred, {blocked} requests blocked")
+
 
 class BrowserDrupalScraper:
     """Drupal event scraper using browser automation"""
 
-    def __init__(self, department_name: str, base_url: str, events_url: str, meta_category: str):
+    def __init__(self, department_name: str, base_url: str, events_url: str, meta_category: str,
+                 capture_json: bool = True):
         self.department_name = department_name
         self.base_url = base_url
         self.events_url = events_url
         self.meta_category = meta_category
+        self.capture_json = capture_json
 
-    async def scrape_events(self, max_pages: int = 5, headless: bool = True) -> List[Dict[str, Any]]:
-        """Scrape events using browser automation"""
+    async def scrape_events(self, max_pages: int = 5, headless: bool = True,
+                            browser: Optional[BrowserScraper] = None) -> List[Dict[str, Any]]:
+        """Scrape events using browser automation (in browser if given, else a browser of its own)"""
         print(f"BROWSER SCRAPING {self.department_name.upper()} EVENTS")
         print("=" * 60)
 
-        all_events = []
+        if browser is not None:
+            all_events = await self._scrape_pages(browser, max_pages)
+        else:
+            async with BrowserScraper(headless=headless) as own_browser:
+                all_events = await self._scrape_pages(own_browser, max_pages)
 
-        async with BrowserScraper(headless=headless) as browser:
-            page = 0
-            consecutive_empty = 0
+        # Deduplicate
+        unique_events = self._deduplicate_events(all_events)
+        print(f"Total unique events ({self.department_name}): {len(unique_events)}")
+        return unique_events
 
-            while page < max_pages and consecutive_empty < 2:
-                url = self.events_url if page == 0 else f"{self.events_url}?page={page}"
-                print(f"  Page {page}: {url}")
+    async def _scrape_pages(self, browser: BrowserScraper, max_pages: int) -> List[Dict[str, Any]]:
+        all_events = []
+        page = 0
+        consecutive_empty = 0
 
-                try:
-                    html = await browser.get_page(url)
-                    soup = BeautifulSoup(html, 'html.parser')
+        while page < max_pages and consecutive_empty < 2:
+            url = self.events_url if page == 0 else f"{self.events_url}?page={page}"
+            print(f"  {self.department_name} page {page}: {url}")
 
-                    # Check if we got blocked
-                    if 'Access denied' in html or 'Error 403' in html:
-                        print(f"    ERROR: Access denied on page {page}")
-                        break
+            try:
+                rendered = await browser.render(url, capture_json=self.capture_json,
+                                                json_has_events=payload_has_events)
+                html = rendered.html
 
-                    # Extract events
-                    events = self._extract_events_from_soup(soup)
+                # Check if we got blocked
+                if 'Access denied' in html or 'Error 403' in html:
+                    print(f"    ERROR: Access denied on page {page}")
+                    break
+
+                # Extract events: captured JSON first, the rendered DOM otherwise
+                events, from_feed = self._extract_events_from_payloads(rendered.payloads)
+                if events:
+                    print(f"    Found {len(events)} events in {len(rendered.payloads)} JSON responses")
+                else:
+                    events = self._extract_events_from_soup(BeautifulSoup(html, 'html.parser'))
                     print(f"    Found {len(events)} events")
 
-                    if events:
-                        all_events.extend(events)
-                        consecutive_empty = 0
-                    else:
-                        consecutive_empty += 1
+                if from_feed:
+                    # A calendar feed covers the whole range; later listing pages load the same feed
+                    all_events.extend(events)
+                    break
 
-                    page += 1
+                if events:
+                    all_events.extend(events)
+                    consecutive_empty = 0
+                else:
+                    consecutive_empty += 1
 
-                    # Random delay between pages
-                    await asyncio.sleep(random.uniform(2, 4))
+                page += 1
 
-                except Exception as e:
-                    print(f"    ERROR on page {page}: {e}")
-                    break
+                # Random delay between pages of the same site
+                await asyncio.sleep(random.uniform(2, 4))
 
-        # Deduplicate
-        unique_events = self._deduplicate_events(all_events)
-        print(f"Total unique events: {len(unique_events)}")
-        return unique_events
+            except Exception as e:
+                print(f"    ERROR on page {page}: {e}")
+                break
+
+        return all_events
+
+    def _extract_events_from_payloads(self, payloads: List[Tuple[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Events from captured JSON responses, and whether any came from a
+        calendar feed. Understands FullCalendar event lists (bare or under
+        'events') and Drupal views AJAX commands, whose 'insert' commands
+        carry the listing HTML.
+        """
+        events = []
+        from_feed = False
+        for _url, data in payloads:
+            if isinstance(data, dict):
+                data = data.get('events')
+            if not isinstance(data, list):
+                continue
+            for item in data:
+                if not isinstance(item, dict):
+                    continue
+                if item.get('command') == 'insert' and isinstance(item.get('data'), str):
+                    events.extend(self._extract_events_from_soup(BeautifulSoup(item['data'], 'html.parser')))
+                elif item.get('title') and item.get('start'):
+                    event = self._extract_feed_event(item)
+                    if event:
+                        events.append(event)
+                        from_feed = True
+        return events, from_feed
+
+    def _extract_feed_event(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Event from one FullCalendar-style feed item"""
+        title = str(item.get('title', '')).strip()
+        when = normalize_range(str(item.get('start', '')), str(item.get('end', '') or ''))
+        if not title or when is None:
+            return None
+        event = self._new_event()
+        event['title'] = title
+        event['start_date'] = when.date
+        event['end_date'] = when.end_date or None
+        if not when.all_day:
+            # End time only for events that finish the same day
+            event['time'] = when.clock_range() if when.end_date == when.date else clock(when.start)
+        url = item.get('url') or ''
+        if url:
+            event['source_url'] = url if url.startswith('http') else self.base_url + url
+        if item.get('location'):
+            event['location'] = str(item['location']).strip()
+        if item.get('description'):
+            event['description'] = BeautifulSoup(str(item['description']), 'html.parser').get_text(' ', strip=True)[:500]
+        safe_title = re.sub(r'[^a-zA-Z0-9]', '_', title[:30])
+        event['id'] = f"{self.department_name.lower().replace(' ', '_')}_{when.date}_{safe_title}"
+        event['event_type'] = VOCABULARY.event_type(title)
+        return event
 
     def _extract_events_from_soup(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """Extract events from parsed HTML"""
@@ -227,18 +506,8 @@ class BrowserDrupalScraper:
 
         # Try multiple container selectors
         containers = []
-        selectors = [
-            ('div', {'class': 'node--type-event'}),
-            ('article', {'class': 'node--type-event'}),
-            ('div', {'class': 'content-list-item'}),
-            ('div', {'class': 'event-item'}),
-            ('article', {'class': 'event'}),
-            ('div', {'class': 'views-row'}),
-            ('li', {'class': 'event'}),
-        ]
-
-        for tag, attrs in selectors:
-            found = soup.find_all(tag, attrs)
+        for tag, cls in EVENT_CONTAINERS:
+            found = soup.find_all(tag, {'class': cls})
             if found:
                 containers.extend(found)
 
@@ -264,9 +533,8 @@ class BrowserDrupalScraper:
 
         return events
 
-    def _extract_event(self, container) -> Dict[str, Any]:
-        """Extract event data from a container element"""
-        event = {
+    def _new_event(self) -> Dict[str, Any]:
+        return {
             'id': '',
             'title': '',
             'description': '',
@@ -292,6 +560,10 @@ class BrowserDrupalScraper:
             'updated_at': datetime.now().isoformat()
         }
 
+    def _extract_event(self, container) -> Dict[str, Any]:
+        """Extract event data from a container element"""
+        event = self._new_event()
+
         # Extract title and URL
         title_link = None
 
@@ -350,7 +622,7 @@ class BrowserDrupalScraper:
         if not date_extracted:
             date_elem = container.find('div', class_=lambda x: x and 'date' in str(x).lower())
             if date_elem:
-                date_text = date_elem.get_text(strip=True)
+                date_text = date_elem.get_text(' ', strip=True)
                 parsed = self._parse_date(date_text)
                 if parsed:
                     event['start_date'] = parsed
@@ -376,36 +648,17 @@ class BrowserDrupalScraper:
         if desc_elem:
             event['description'] = desc_elem.get_text(strip=True)[:500]
 
-        # Determine event type
-        title_lower = event['title'].lower()
-        for keyword, etype in [('seminar', 'Seminar'), ('colloquium', 'Colloquium'), ('lecture', 'Lecture'),
-                               ('workshop', 'Workshop'), ('talk', 'Talk'), ('conference', 'Conference')]:
-            if keyword in title_lower:
-                event['event_type'] = etype
-                break
-
+        event['event_type'] = VOCABULARY.event_type(event['title'])
         return event
 
     def _month_to_num(self, month: str) -> str:
         """Convert month name to number"""
-        months = {
-            'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04', 'may': '05', 'jun': '06',
-            'jul': '07', 'aug': '08', 'sep': '09', 'oct': '10', 'nov': '11', 'dec': '12',
-            'january': '01', 'february': '02', 'march': '03', 'april': '04', 'june': '06',
-            'july': '07', 'august': '08', 'september': '09', 'october': '10', 'november': '11', 'december': '12'
-        }
-        return months.get(month.lower()[:3], '01')
+        return f"{month_number(month) or 1:02d}"
 
     def _parse_date(self, text: str) -> str:
         """Parse date from text"""
-        # Try "Month Day, Year" format
-        match = re.search(r'(\w+)\s+(\d{1,2}),?\s+(\d{4})', text)
-        if match:
-            month = self._month_to_num(match.group(1))
-            day = match.group(2).zfill(2)
-            year = match.group(3)
-            return f"{year}-{month}-{day}"
-        return ''
+        day = parse_date(text)
+        return day.isoformat() if day else ''
 
     def _deduplicate_events(self, events: List[Dict]) -> List[Dict]:
         """Remove duplicate events"""
@@ -421,45 +674,76 @@ class BrowserDrupalScraper:
 
 # Department configurations
 BROWSER_DEPARTMENTS = [
-    # Previously blocked by Cloudflare
-    ('anthropology', 'https://anthropology.princeton.edu', 'https://anthropology.princeton.edu/events', 'social_sciences'),
-    ('sociology', 'https://sociology.princeton.edu', 'https://sociology.princeton.edu/events', 'social_sciences'),
-    ('psychology', 'https://psychology.princeton.edu', 'https://psychology.princeton.edu/events', 'social_sciences'),
-    ('history', 'https://history.princeton.edu', 'https://history.princeton.edu/news-events/events', 'arts_humanities'),
-    ('english', 'https://english.princeton.edu', 'https://english.princeton.edu/events', 'arts_humanities'),
-    ('classics', 'https://classics.princeton.edu', 'https://classics.princeton.edu/events', 'arts_humanities'),
-    ('music', 'https://music.princeton.edu', 'https://music.princeton.edu/events', 'arts_humanities'),
-    ('art_archaeology', 'https://artandarchaeology.princeton.edu', 'https://artandarchaeology.princeton.edu/events', 'arts_humanities'),
-    ('religion', 'https://religion.princeton.edu', 'https://religion.princeton.edu/events', 'arts_humanities'),
-    ('comparative_literature', 'https://complit.princeton.edu', 'https://complit.princeton.edu/events', 'arts_humanities'),
-    ('near_eastern_studies', 'https://nes.princeton.edu', 'https://nes.princeton.edu/events', 'area_studies'),
-    ('cbe', 'https://cbe.princeton.edu', 'https://cbe.princeton.edu/events', 'sciences_engineering'),
-    ('orfe', 'https://orfe.princeton.edu', 'https://orfe.princeton.edu/events', 'sciences_engineering'),
-    ('ece', 'https://ece.princeton.edu', 'https://ece.princeton.edu/events', 'sciences_engineering'),
-    ('molecular_biology', 'https://molbio.princeton.edu', 'https://molbio.princeton.edu/events', 'sciences_engineering'),
-    ('citp', 'https://citp.princeton.edu', 'https://citp.princeton.edu/events', 'interdisciplinary'),
+    (name, base_url, events_url, DEPARTMENT_CATALOG.meta_category(name))
+    for name, base_url, events_url in [
+        # Previously blocked by Cloudflare
+        ('anthropology', 'https://anthropology.princeton.edu', 'https://anthropology.princeton.edu/events'),
+        ('sociology', 'https://sociology.princeton.edu', 'https://sociology.princeton.edu/events'),
+        ('psychology', 'https://psychology.princeton.edu', 'https://psychology.princeton.edu/events'),
+        ('history', 'https://history.princeton.edu', 'https://history.princeton.edu/news-events/events'),
+        ('english', 'https://english.princeton.edu', 'https://english.princeton.edu/events'),
+        ('classics', 'https://classics.princeton.edu', 'https://classics.princeton.edu/events'),
+        ('music', 'https://music.princeton.edu', 'https://music.princeton.edu/events'),
+        ('art_archaeology', 'https://artandarchaeology.princeton.edu', 'https://artandarchaeology.princeton.edu/events'),
+        ('religion', 'https://religion.princeton.edu', 'https://religion.princeton.edu/events'),
+        ('comparative_literature', 'https://complit.princeton.edu', 'https://complit.princeton.edu/events'),
+        ('near_eastern_studies', 'https://nes.princeton.edu', 'https://nes.princeton.edu/events'),
+        ('cbe', 'https://cbe.princeton.edu', 'https://cbe.princeton.edu/events'),
+        ('orfe', 'https://orfe.princeton.edu', 'https://orfe.princeton.edu/events'),
+        ('ece', 'https://ece.princeton.edu', 'https://ece.princeton.edu/events'),
+        ('molecular_biology', 'https://molbio.princeton.edu', 'https://molbio.princeton.edu/events'),
+        ('citp', 'https://citp.princeton.edu', 'https://citp.princeton.edu/events'),
+    ]
 ]
 
 
-async def scrape_all_browser_departments(headless: bool = True) -> List[Dict[str, Any]]:
-    """Scrape all departments that need browser automation"""
-    all_events = []
-
-    for dept_name, base_url, events_url, meta_category in BROWSER_DEPARTMENTS:
-        print(f"\n{'='*60}")
-        print(f"Scraping {dept_name}...")
+async def scrape_browser_departments_timed(headless: bool = True, max_pages: int = 3, page_pool: int = 4,
+                                          max_per_host: int = 1, lean: bool = LEAN,
+                                          departments: Optional[List[Tuple[str, str, str, str]]] = None
+                                          ) -> List[Tuple[str, List[Dict[str, Any]], float]]:
+    """
+    Scrape every browser department (or just departments) and return
+    (name, events, seconds) per department, in the order given.
+
+    One browser is launched for all of them. Departments run as concurrent
+    tasks sharing a pool of page_pool pages, at most max_per_host per site.
+    Pages are rendered in lean mode only when lean is set (default: LEAN).
+    """
+    async with BrowserScraper(headless=headless, max_pages=page_pool, max_per_host=max_per_host,
+                              lean=lean) as browser:
+
+        async def run(dept_name: str, base_url: str, events_url: str,
+                      meta_category: str) -> Tuple[str, List[Dict[str, Any]], float]:
+            scraper = BrowserDrupalScraper(dept_name, base_url, events_url, meta_category)
+            start = time.perf_counter()
+            try:
+                events = await scraper.scrape_events(max_pages=max_pages, browser=browser)
+                print(f"SUCCESS: {dept_name} - {len(events)} events")
+            except Exception as e:
+                print(f"ERROR: {dept_name} - {e}")
+                events = []
+            return dept_name, events, time.perf_counter() - start
+
+        if departments is None:
+            departments = BROWSER_DEPARTMENTS
+        results = await asyncio.gather(*(run(*dept) for dept in departments))
+        print(f"\nBrowser pages: {browser.stats_summary()}")
+        return results
 
-        scraper = BrowserDrupalScraper(dept_name, base_url, events_url, meta_category)
-        try:
-            events = await scraper.scrape_events(max_pages=3, headless=headless)
-            all_events.extend(events)
-            print(f"SUCCESS: {dept_name} - {len(events)} events")
-        except Exception as e:
-            print(f"ERROR: {dept_name} - {e}")
 
-        # Delay between departments
-        await asyncio.sleep(random.uniform(3, 5))
+async def scrape_all_browser_departments(headless: bool = True) -> List[Dict[str, Any]]:
+    """Scrape all departments that need browser automation"""
+    start = time.perf_counter()
+    results = await scrape_browser_departments_timed(headless=headless)
+    wall = time.perf_counter() - start
 
+    all_events = []
+    print('\nBrowser department timing:')
+    for name, events, elapsed in results:
+        all_events.extend(events)
+        print(f'  {name:<28} {elapsed:6.2f}s  {len(events)} events')
+    total = sum(elapsed for _, _, elapsed in results)
+    print(f'  wall {wall:.2f}s, sum of departments {total:.2f}s, one browser launch')
     return all_events
 
 
@@ -468,6 +752,25 @@ def run_browser_scraper(headless: bool = True) -> List[Dict[str, Any]]:
     return asyncio.run(scrape_all_browser_departments(headless=headless))
 
 
+def compare_lean(headless: bool = True) -> bool:
+    """
+    Render every department in full and in lean mode and report, per
+    department, whether both return the same events. True when all match.
+    """
+    def keyed(results):
+        return {name: sorted((e.get('title'), e.get('start_date'), e.get('time')) for e in events)
+                for name, events, _ in results}
+
+    full = keyed(asyncio.run(scrape_browser_departments_timed(headless=headless, lean=False)))
+    lean = keyed(asyncio.run(scrape_browser_departments_timed(headless=headless, lean=True)))
+    print('\nLean vs full render:')
+    for name in full:
+        same = full[name] == lean.get(name)
+        print(f"  {name:<28} full {len(full[name]):3d}  lean {len(lean.get(name, [])):3d}  "
+              f"{'identical' if same else 'DIFFERENT'}")
+    return full == lean
+
+
 if __name__ == "__main__":
     import sys
 
@@ -478,6 +781,9 @@ if __name__ == "__main__":
         print("Run: pip install playwright && playwright install chromium")
         sys.exit(1)
 
+    if '--compare-lean' in sys.argv:
+        sys.exit(0 if compare_lean(headless=headless) else 1)
+
     events = run_browser_scraper(headless=headless)
 
     # Save results
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+FullCalendar calendar.json feeds of Princeton Drupal department sites.
+
+Sites built on the university Drupal platform serve their events calendar
+from /feeds/events/calendar.json as a JSON array of FullCalendar event
+objects (title, start, end, allDay, url, location, description). Some sites
+need the calendar block's uuid/ei params (FEED_PARAMS); others answer
+without them.
+
+CalendarFeed serves the calendar months that are already over from
+FEED_CACHE without a request, since past events no longer change, and
+fetches everything from the first month it has no entry for through the end
+of the range as a single conditional GET. The past months covered by that
+response are then cached one entry per month, so a cold cache costs one
+request and so does every later run. Each response array is decoded one
+event object at a time, and events outside the run window are dropped
+before they are turned into records.
+
+A scraper with its own event format passes parse_item; everything else
+uses the generic FullCalendar item parser.
+"""
+import json
+import re
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from date_normalizer import clock, normalize_range
+from event_record import Event
+from event_window import EventWindow, RUN_WINDOW, cache_variant, calendar_range
+from http_cache import FEED_CACHE, payload_key, record_payload
+from http_client import HTTP_CLIENT
+from keyword_classifier import Vocabulary
+from rate_limit import API_RATE_LIMITER
+
+FEED_PATH = '/feeds/events/calendar.json'
+
+# Calendar block params of the sites whose feed needs them
+FEED_PARAMS: Dict[str, Dict[str, str]] = {
+    'phy.princeton.edu': {'uuid': '2cea06c3-31b5-478b-b470-477cf35c7a4d', 'et': 'node', 'ei': '7896'},
+    'geosciences.princeton.edu': {'uuid': '6b2dd1c5-55dc-4047-a69a-c478e57244ce', 'et': 'node', 'ei': '2816'},
+}
+
+FEED_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'application/json, text/javascript, */*; q=0.01',
+    'X-Requested-With': 'XMLHttpRequest',
+}
+
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'), ('seminar', 'Seminar'),
+        ('lecture', 'Lecture'), ('workshop', 'Workshop'),
+        ('conference', 'Conference'), ('symposium', 'Symposium'),
+        ('panel', 'Panel'), ('talk', 'Talk'),
+        ('fpo', 'Dissertation Defense'), ('defense', 'Dissertation Defense'),
+        ('meeting', 'Meeting'),
+    ],
+)
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s*')
+_DECODER = json.JSONDecoder()
+_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+class FeedWindow(NamedTuple):
+    """A span of the requested range (one month, or the rest of it), as feed start/end params"""
+    start: str
+    end: str
+
+
+class FeedFetch(NamedTuple):
+    """CalendarFeed.fetch_feed() result, before parsing"""
+    months: List[FeedWindow]
+    # Events of the leading past months, served from the cache
+    cached: List[List[Dict[str, Any]]]
+    # Months covered by the response
+    rest: List[FeedWindow]
+    # None when every month came from the cache
+    response: Any
+    # Cache entry when the response is unchanged
+    entry: Optional[Dict[str, Any]]
+
+
+def month_windows(range_start: str, range_end: str) -> List[FeedWindow]:
+    """Calendar-month windows covering range_start..range_end (inclusive, '%Y-%m-%dT%H:%M:%S')"""
+    start = datetime.strptime(range_start, _FORMAT)
+    end = datetime.strptime(range_end, _FORMAT)
+    windows = []
+    while start <= end:
+        next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0, second=0)
+        window_end = min(next_month - timedelta(seconds=1), end)
+        windows.append(FeedWindow(start.strftime(_FORMAT), window_end.strftime(_FORMAT)))
+        start = next_month
+    return windows
+
+
+def iter_json_array(text: str) -> Iterator[Any]:
+    """
+    Items of a top-level JSON array, decoded one at a time. An object body
+    yields its 'events' list. Raises ValueError on anything else, including
+    missing, doubled or trailing commas.
+    """
+    pos = _WS_RE.match(text).end()
+    if text.startswith('{', pos):
+        events = json.loads(text).get('events')
+        if not isinstance(events, list):
+            raise ValueError('JSON object without an events list')
+        yield from events
+        return
+    if not text.startswith('[', pos):
+        raise ValueError('not a JSON array')
+    pos = _WS_RE.match(text, pos + 1).end()
+    if not text.startswith(']', pos):
+        while True:
+            item, pos = _DECODER.raw_decode(text, pos)
+            yield item
+            pos = _WS_RE.match(text, pos).end()
+            if text.startswith(']', pos):
+                break
+            if not text.startswith(',', pos):
+                raise ValueError(f"expected ',' or ']' at char {pos}")
+            pos = _WS_RE.match(text, pos + 1).end()
+    if _WS_RE.match(text, pos + 1).end() != len(text):
+        raise ValueError(f'extra data after the JSON array at char {pos + 1}')
+
+
+class CalendarFeed:
+    """One department's calendar.json feed"""
+
+    def __init__(self, department_name: str, domain: str, meta_category: str,
+                 params: Optional[Dict[str, str]] = None, window: Optional[EventWindow] = None,
+                 parse_item: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None,
+                 getter: Optional[Callable] = None, headers: Optional[Dict[str, str]] = None):
+        self.department_name = department_name
+        self.domain = domain
+        self.base_url = f'https://{domain}'
+        self.json_url = f'https://{domain}{FEED_PATH}'
+        self.meta_category = meta_category
+        self.params = dict(params if params is not None else FEED_PARAMS.get(domain, {}))
+        self.window = window if window is not None else RUN_WINDOW.get()
+        self.parse_item = parse_item or self._parse_item
+        self.getter = getter or HTTP_CLIENT.get
+        self.headers = dict(FEED_HEADERS if headers is None else headers)
+        self.feed_cache = FEED_CACHE
+        self.rate_limiter = API_RATE_LIMITER
+
+    def fetch_events(self) -> List[Dict[str, Any]]:
+        """
+        Events of the whole range, in date order of the months. Raises when
+        the request errors or is not a FullCalendar event list, so callers
+        can fall back to another way of fetching the site.
+        """
+        return self.parse_fetched(self.fetch_feed())
+
+    def fetch_feed(self) -> FeedFetch:
+        """The request half of fetch_events(): cached past months plus the raw response for the rest"""
+        range_start, range_end = calendar_range(self.window, datetime.now().year)
+        months = month_windows(range_start, range_end)
+        variant = cache_variant(self.window)
+        today = datetime.now().date().isoformat()
+
+        cached = []
+        for i, month in enumerate(months):
+            entry = self.feed_cache.load(self.json_url, self._params(month), variant) if month.end[:10] < today else None
+            if entry is None:
+                break
+            # Recorded as a 304 would be, so the source fingerprint stays the same
+            record_payload(payload_key(self.json_url, self._params(month)), entry.get('sha256', ''))
+            cached.append(entry['events'])
+        rest = months[len(cached):]
+        if not rest:
+            return FeedFetch(months, cached, rest, None, None)
+
+        params = self._params(FeedWindow(rest[0].start, range_end))
+        self.rate_limiter.acquire(self.json_url)
+        response, entry = self.feed_cache.conditional_get(
+            self.getter, self.json_url, params=params, headers=self.headers, timeout=30, variant=variant
+        )
+        if entry is None:
+            response.raise_for_status()
+        return FeedFetch(months, cached, rest, response, entry)
+
+    def parse_fetched(self, fetched: FeedFetch) -> List[Dict[str, Any]]:
+        """
+        The parse half: events of a fetch_feed() result. An unchanged response
+        is not parsed again; a new one is cached, and so are the months in it
+        that are already over.
+        """
+        per_window = list(fetched.cached)
+        if fetched.entry is not None:
+            per_window.append(fetched.entry['events'])
+        elif fetched.response is not None:
+            per_window.append(self._parse_response(fetched))
+
+        events = []
+        seen = set()
+        for window_events in per_window:
+            for event in window_events:
+                # Events spanning a month boundary are returned for both months
+                key = (event.get('title'), event.get('start_date'), event.get('time'))
+                if key not in seen:
+                    seen.add(key)
+                    events.append(event)
+        rest = 'none' if not fetched.rest else (
+            'unchanged' if fetched.entry is not None else f'{len(fetched.rest)} fetched')
+        print(f'  {self.department_name} calendar.json: {len(events)} events from {len(fetched.months)} months '
+              f'({len(fetched.cached)} past months cached, {rest})')
+        return events
+
+    def _params(self, window: FeedWindow) -> Dict[str, str]:
+        return dict(self.params, start=window.start, end=window.end, timeZone='America/New_York')
+
+    def _parse_response(self, fetched: FeedFetch) -> List[Dict[str, Any]]:
+        response = fetched.response
+        variant = cache_variant(self.window)
+        # JSON is UTF-8 unless the server says otherwise; no charset sniffing
+        text = response.content.decode(response.encoding or 'utf-8', errors='replace')
+        events = self.parse(iter_json_array(text))
+        span = FeedWindow(fetched.rest[0].start, fetched.months[-1].end)
+        self.feed_cache.store(self.json_url, response, events, params=self._params(span), variant=variant)
+        today = datetime.now().date().isoformat()
+        for month in fetched.rest:
+            if month.end[:10] < today:
+                in_month = [e for e in events if month.start[:10] <= (e.get('start_date') or '') <= month.end[:10]]
+                self.feed_cache.store_events(self.json_url, in_month, params=self._params(month), variant=variant)
+        return events
+
+    def parse(self, items) -> List[Dict[str, Any]]:
+        events = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            # Feeds may return events outside the requested range
+            if self.window and not self.window.contains_iso(str(item.get('start') or '')):
+                continue
+            event = self.parse_item(item)
+            if event and event.get('title'):
+                events.append(event)
+        return events
+
+    def _parse_item(self, item: Dict[str, Any]) -> Optional[Event]:
+        title = str(item.get('title') or '').strip()
+        when = normalize_range(str(item.get('start') or ''), str(item.get('end') or ''))
+        if not title or when is None:
+            return None
+        time_text = ''
+        if not when.all_day:
+            # End time only for events that finish the same day
+            time_text = when.clock_range() if when.end_date == when.date else clock(when.start)
+        url = str(item.get('url') or '')
+        if url and not url.startswith('http'):
+            url = self.base_url + url
+        description = _TAG_RE.sub(' ', str(item.get('description') or ''))
+        department = self.department_name.lower().replace(' ', '_')
+        safe_title = re.sub(r'[^a-zA-Z0-9]', '_', title[:30])
+        return Event(
+            id=f'{department}_{when.date}_{safe_title}',
+            title=title,
+            description=' '.join(description.split())[:500],
+            start_date=when.date,
+            end_date=when.end_date or None,
+            time=time_text,
+            location=str(item.get('location') or '').strip() or 'Princeton University',
+            event_type=VOCABULARY.event_type(title),
+            department=self.department_name,
+            meta_category=self.meta_category,
+            source_url=url or f'{self.base_url}/events',
+            source_name=f'{self.department_name} Events',
+        )
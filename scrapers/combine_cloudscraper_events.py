@@ -1,141 +1,270 @@
 #!/usr/bin/env python3
+import argparse
+import contextvars
 import json
-import importlib
+import multiprocessing
 import os
-import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
-from universal_drupal_cloudscraper import UniversalDrupalCloudScraper
-from universal_ics_scraper import scrape_all_ics_departments
-
-# Check if browser scraper is available
-BROWSER_SCRAPER_AVAILABLE = False
-try:
-    from browser_scraper import run_browser_scraper, BROWSER_DEPARTMENTS
-    BROWSER_SCRAPER_AVAILABLE = True
-except ImportError:
-    print("NOTE: Browser scraper not available (playwright not installed)")
-
-# Working individual scrapers (these have their own modules)
-INDIVIDUAL_SCRAPERS = [
-    ('math_ics_scraper', 'MathICSScraper', 'scrape_math_events'),
-    ('philosophy_ics_scraper', 'PhilosophyICSScraper', 'scrape_philosophy_events'),
-    ('physics_cloudscraper', 'PhysicsCloudScraper', 'scrape_physics_events'),
-    ('geosciences_json_scraper', 'GeosciencesJSONScraper', 'scrape_geosciences_events'),
-    ('cs_cloudscraper', 'CSCloudScraper', 'scrape_cs_events'),
-    ('economics_cloudscraper_new', 'EconomicsCloudScraperNew', 'scrape_economics_events'),
-    ('spia_cloudscraper_new', 'SPIACloudScraperNew', 'scrape_spia_events'),
-]
-
-# Departments to scrape with universal Drupal scraper
-UNIVERSAL_DRUPAL_DEPARTMENTS = [
-    ('politics', 'https://politics.princeton.edu', 'https://politics.princeton.edu/events', 'social_sciences'),
-]
-
-def run_individual_scraper(scraper_name: str, class_name: str, method_name: str) -> List[Dict[str, Any]]:
-    """Run a single individual scraper and return its events"""
-    try:
-        print(f"Running {scraper_name}...")
-        scraper_module = importlib.import_module(scraper_name)
-        scraper_class = getattr(scraper_module, class_name)
-        scraper = scraper_class()
-        scrape_method = getattr(scraper, method_name)
-        events = scrape_method()
-        print(f"SUCCESS: {scraper_name}: {len(events)} events found")
-        return events
-    except Exception as e:
-        print(f"ERROR: {scraper_name}: {e}")
-        return []
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
+from event_record import Event, as_event, json_default
+from event_window import EventWindow, RUN_WINDOW, cache_variant
+from http_cache import PayloadRecorder
+from source_snapshots import SnapshotStore
+from parse_stage import PARSE_STAGE
+from sources import SOURCES, Source, select_sources
+
+OUTPUT_FILE = "all_princeton_academic_events.json"
+
+# Per-source payload hash + parsed events from the previous run
+SNAPSHOTS = SnapshotStore()
+
+GROUP_HEADINGS = {
+    'ics': 'UNIVERSAL ICS SCRAPER',
+    'individual': 'INDIVIDUAL SCRAPERS',
+    'drupal': 'UNIVERSAL DRUPAL SCRAPER',
+    'browser': 'BROWSER SCRAPER (Cloudflare bypass)',
+}
+
+
+class SourceRun(NamedTuple):
+    source: Source
+    events: List[Dict[str, Any]]
+    changed: bool
+    seconds: float
+    payloads: int
+    error: str = ''
+
+
+def source_payload_hash(recorder: PayloadRecorder) -> str:
+    """Recorder fingerprint, tied to the run window the events were parsed for"""
+    payload_hash = recorder.fingerprint()
+    if payload_hash and RUN_WINDOW.get():
+        # Snapshot events depend on the window as well as the payloads
+        payload_hash = f"{payload_hash}#{cache_variant(RUN_WINDOW.get())}"
+    return payload_hash
 
-def run_universal_drupal_scraper(dept_name: str, base_url: str, events_url: str, meta_category: str) -> List[Dict[str, Any]]:
-    """Run the universal Drupal scraper for a department"""
+
+def snapshot_events(source_key: str, window: Optional[EventWindow] = None) -> Optional[List[Dict[str, Any]]]:
+    """A source's last snapshot events inside window, or None without a snapshot"""
+    snapshot = SNAPSHOTS.load(source_key)
+    if snapshot is None:
+        return None
+    events = snapshot.get('events') or []
+    if window:
+        events = [e for e in events if window.contains_iso(e.get('start_date') or '')]
+    return events
+
+
+def run_source(source: Source, incremental: bool = False) -> SourceRun:
+    """
+    Run one source while recording the upstream payloads it fetches.
+
+    In incremental mode the payload hash of fetch() is checked before
+    parse(): when every payload came back unchanged (304s, identical bodies,
+    cached past months) the snapshot events are reused and parse() is skipped.
+    That only saves work for sources whose fetch() returns raw responses
+    (see sources.py); the others have already parsed by then. A source that
+    fails is spliced in from its snapshot instead of dropping out of the
+    combined output. Sources that record no payloads always count as changed.
+
+    Events starting outside the run window are dropped here, for the sources
+    whose parsers do not skip them already.
+    """
+    print(f"Running {source.key}...")
+    start = time.perf_counter()
+    previous = SNAPSHOTS.load(source.key) if incremental else None
     try:
-        print(f"Running universal Drupal scraper for {dept_name}...")
-        scraper = UniversalDrupalCloudScraper(dept_name, base_url, events_url, meta_category)
-        # Increased max_pages to 10 to get more events, fetch_details=True for full info
-        events = scraper.scrape_events(max_pages=10, fetch_details=True)
-        print(f"SUCCESS: {dept_name}: {len(events)} events found")
-        return events
+        with PayloadRecorder() as recorder:
+            payload = source.fetch()
+            payload_hash = source_payload_hash(recorder)
+            if payload_hash and previous and previous.get('payload_hash') == payload_hash:
+                events = previous['events']
+                print(f"UNCHANGED: {source.key}: reusing {len(events)} snapshot events")
+                return SourceRun(source, events, False, time.perf_counter() - start, len(recorder.digests))
+            # parse() may fetch too (tier escalation, fallbacks); its payloads count
+            events = source.parse(payload)
+        payload_hash = source_payload_hash(recorder)
     except Exception as e:
-        print(f"ERROR: {dept_name}: {e}")
-        import traceback
+        print(f"ERROR: {source.key}: {e}")
         traceback.print_exc()
+        seconds = time.perf_counter() - start
+        if previous is not None:
+            events = snapshot_events(source.key, RUN_WINDOW.get())
+            print(f"SNAPSHOT: {source.key}: {len(events)} events from {previous.get('updated_at', '?')}")
+            return SourceRun(source, events, False, seconds, 0, str(e))
+        return SourceRun(source, [], True, seconds, 0, str(e))
+    seconds = time.perf_counter() - start
+
+    window = RUN_WINDOW.get()
+    if window:
+        events = [e for e in events if window.contains_iso(e.get('start_date') or '')]
+    SNAPSHOTS.save(source.key, payload_hash, events)
+    print(f"SUCCESS: {source.key}: {len(events)} events found in {seconds:.1f}s")
+    return SourceRun(source, events, True, seconds, len(recorder.digests))
+
+
+def run_sources(sources: List[Source], incremental: bool = False,
+                max_workers: Optional[int] = None) -> List[SourceRun]:
+    """
+    Run sources on a thread pool. Results come back in registration order
+    regardless of which source finishes first.
+    """
+    if not sources:
         return []
+    with ThreadPoolExecutor(max_workers=max_workers or len(sources)) as pool:
+        # copy_context so each source's PayloadRecorder is per-thread
+        futures = [pool.submit(contextvars.copy_context().run, run_source, source, incremental)
+                   for source in sources]
+        return [future.result() for future in futures]
+
 
-def combine_all_events(use_browser: bool = True):
-    """Combine events from all working scrapers"""
+def print_source_costs(runs: List[SourceRun], wall_seconds: float):
+    print("\nPER-SOURCE COST:")
+    for run in sorted(runs, key=lambda r: r.seconds, reverse=True):
+        status = 'ERROR' if run.error else ('changed' if run.changed else 'unchanged')
+        print(f"  {run.source.key:<20} {run.seconds:7.2f}s  {len(run.events):5d} events  "
+              f"{run.payloads:3d} payloads  {status}")
+    total = sum(r.seconds for r in runs)
+    print(f"  Wall-clock: {wall_seconds:.2f}s (sum of sources: {total:.2f}s)")
+
+
+def print_stage_throughput(runs: List[SourceRun], wall_seconds: float, pipeline: bool):
+    """Events/sec for the fetch and parse stages and end to end"""
+    from http_client import HTTP_CLIENT
+    events = sum(len(r.events) for r in runs)
+    http = HTTP_CLIENT.summary()
+    fetch_requests = sum(s['requests'] for s in http.values())
+    fetch_seconds = sum(s['seconds'] for s in http.values())
+    parse = PARSE_STAGE.totals()
+
+    print("\nSTAGE THROUGHPUT:")
+    if fetch_seconds:
+        print(f"  fetch: {fetch_requests} requests, {fetch_seconds:.1f}s summed, "
+              f"{events / fetch_seconds:.0f} events/sec")
+    if parse['seconds']:
+        where = 'process pool' if pipeline else 'inline'
+        print(f"  parse ({where}): {parse['calls']} parses, {parse['seconds']:.2f}s summed, "
+              f"{parse['events'] / parse['seconds']:.0f} events/sec")
+    if wall_seconds:
+        print(f"  end to end: {events} events in {wall_seconds:.1f}s, {events / wall_seconds:.0f} events/sec")
+    PARSE_STAGE.print_summary()
+
+
+def combine_all_events(use_browser: bool = True, incremental: bool = False,
+                       only: Optional[List[str]] = None, max_workers: Optional[int] = None,
+                       pipeline: bool = False, parse_workers: Optional[int] = None,
+                       window: Optional[EventWindow] = None):
+    """
+    Combine events from all registered sources (or just the ones named in only).
+
+    With incremental=True, sources whose upstream payload hash is unchanged
+    are spliced in from their snapshots without being parsed again, sources
+    that fail fall back to their snapshots, and if no source changed at all the
+    previous combined output is kept untouched. Sources not selected by only
+    are spliced in from their last snapshot, so a partial run still writes a
+    complete combined file.
+
+    With pipeline=True the fetch threads hand raw response bytes to a
+    ProcessPoolExecutor of parse_workers processes (default: one per core)
+    for HTML and ICS parsing.
+
+    With a window, only events starting inside it are kept; the feed parsers
+    skip the others from their start date alone (event_window.RUN_WINDOW).
+    """
     print("COMBINING ALL PRINCETON ACADEMIC EVENTS")
     print("=" * 60)
+    if window:
+        print(f"Event window: {window}")
+
+    sources = []
+    for source in select_sources(only, use_browser):
+        if source.available():
+            sources.append(source)
+        elif source.group == 'browser':
+            print("\nWARNING: Browser scraper requested but not available")
+            print("Install with: pip install playwright && playwright install chromium")
+        else:
+            print(f"WARNING: {source.key} is not available, skipping")
+
+    start = time.perf_counter()
+    with RUN_WINDOW.using(window):
+        if pipeline:
+            # spawn, not fork: the fetch threads are already running when workers start
+            with ProcessPoolExecutor(max_workers=parse_workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as parse_pool:
+                with PARSE_STAGE.using(parse_pool):
+                    runs = run_sources(sources, incremental, max_workers)
+        else:
+            runs = run_sources(sources, incremental, max_workers)
+    wall_seconds = time.perf_counter() - start
 
-    all_events = []
+    all_events: List[Event] = []
     successful_scrapers = 0
     total_events = 0
     browser_events = 0
+    changed_sources = []
+    total_scrapers = 0
 
-    # Run universal ICS scraper for all departments with ICS feeds
-    print("\n--- UNIVERSAL ICS SCRAPER (25 departments) ---")
-    try:
-        ics_events = scrape_all_ics_departments()
-        if ics_events:
-            all_events.extend(ics_events)
-            successful_scrapers += 1
-            total_events += len(ics_events)
-            print(f"SUCCESS: ICS scraper: {len(ics_events)} events from {len(set(e['department'] for e in ics_events))} departments")
-    except Exception as e:
-        print(f"ERROR: ICS scraper: {e}")
-
-    # Run individual scrapers
-    print("\n--- INDIVIDUAL SCRAPERS ---")
-    for scraper_name, class_name, method_name in INDIVIDUAL_SCRAPERS:
-        events = run_individual_scraper(scraper_name, class_name, method_name)
-        if events:
-            all_events.extend(events)
-            successful_scrapers += 1
-            total_events += len(events)
-
-    # Run universal Drupal scraper for non-Cloudflare departments
-    print("\n--- UNIVERSAL DRUPAL SCRAPER ---")
-    for dept_name, base_url, events_url, meta_category in UNIVERSAL_DRUPAL_DEPARTMENTS:
-        events = run_universal_drupal_scraper(dept_name, base_url, events_url, meta_category)
-        if events:
-            all_events.extend(events)
-            successful_scrapers += 1
-            total_events += len(events)
-
-    # Run browser scraper for Cloudflare-protected departments
-    if use_browser and BROWSER_SCRAPER_AVAILABLE:
-        print("\n--- BROWSER SCRAPER (Cloudflare bypass) ---")
-        try:
-            browser_scraped = run_browser_scraper(headless=True)
-            if browser_scraped:
-                all_events.extend(browser_scraped)
-                browser_events = len(browser_scraped)
-                total_events += browser_events
-                # Count successful browser departments
-                browser_depts = set(e.get('department', '') for e in browser_scraped)
-                successful_scrapers += len(browser_depts)
-                print(f"SUCCESS: Browser scraper found {browser_events} events from {len(browser_depts)} departments")
-        except Exception as e:
-            print(f"ERROR: Browser scraper failed: {e}")
-    elif use_browser and not BROWSER_SCRAPER_AVAILABLE:
-        print("\nWARNING: Browser scraper requested but not available")
-        print("Install with: pip install playwright && playwright install chromium")
+    current_group = None
+    for run in runs:
+        source = run.source
+        if source.group != current_group:
+            current_group = source.group
+            print(f"\n--- {GROUP_HEADINGS.get(current_group, current_group.upper())} ---")
+        total_scrapers += source.scrapers
+        if run.changed:
+            changed_sources.append(source.key)
+        if run.error:
+            print(f"  {source.key}: failed ({run.error})")
+            if not run.events:
+                continue
+            print(f"  {source.key}: {len(run.events)} events from its last snapshot")
+        else:
+            print(f"  {source.key}: {len(run.events)} events")
+        if run.events:
+            all_events.extend(as_event(event) for event in run.events)
+            if not run.error:
+                successful_scrapers += source.successes(run.events)
+            total_events += len(run.events)
+            if source.group == 'browser':
+                browser_events += len(run.events)
+
+    # Splice in unselected sources from their snapshots
+    if only:
+        run_keys = {run.source.key for run in runs}
+        for key in SOURCES:
+            if key in run_keys:
+                continue
+            snapshot = SNAPSHOTS.load(key)
+            if snapshot and snapshot.get('events'):
+                events = snapshot['events']
+                if window:
+                    events = [e for e in events if window.contains_iso(e.get('start_date') or '')]
+                print(f"SNAPSHOT: {key}: {len(events)} events from {snapshot.get('updated_at', '?')}")
+                all_events.extend(as_event(event) for event in events)
+                total_events += len(events)
+
+    print_source_costs(runs, wall_seconds)
+    print_stage_throughput(runs, wall_seconds, pipeline)
+
+    if incremental and not changed_sources and os.path.exists(OUTPUT_FILE):
+        print("\nNo upstream changes since the last run, keeping", OUTPUT_FILE)
+        with open(OUTPUT_FILE, encoding='utf-8') as f:
+            return json.load(f)
 
     # Deduplicate across all sources
     seen_keys = set()
-    deduped_events = []
+    deduped_events: List[Event] = []
     for event in all_events:
-        key = f"{event.get('title', '').strip().lower()}|{event.get('start_date', '')}"
+        key = (event.title.strip().lower(), event.start_date)
         if key not in seen_keys:
             seen_keys.add(key)
             deduped_events.append(event)
     all_events = deduped_events
 
-    # Calculate totals
-    total_scrapers = len(INDIVIDUAL_SCRAPERS) + len(UNIVERSAL_DRUPAL_DEPARTMENTS)
-    if BROWSER_SCRAPER_AVAILABLE:
-        total_scrapers += len(BROWSER_DEPARTMENTS)
-
     # Add metadata
     combined_data = {
         "metadata": {
@@ -143,17 +272,22 @@ def combine_all_events(use_browser: bool = True):
             "successful_scrapers": successful_scrapers,
             "total_scrapers": total_scrapers,
             "combined_at": datetime.now().isoformat(),
-            "individual_scrapers_used": len(INDIVIDUAL_SCRAPERS),
-            "universal_drupal_departments_used": len(UNIVERSAL_DRUPAL_DEPARTMENTS),
-            "browser_scraped_events": browser_events
+            "individual_scrapers_used": sum(1 for r in runs if r.source.group == 'individual'),
+            "universal_drupal_departments_used": sum(1 for r in runs if r.source.group == 'drupal'),
+            "sources_run": [r.source.key for r in runs],
+            "browser_scraped_events": browser_events,
+            "incremental": incremental,
+            "changed_sources": changed_sources,
+            "window": {"start": window.start.isoformat() if window and window.start else None,
+                       "end": window.end.isoformat() if window and window.end else None}
         },
         "events": all_events
     }
 
     # Save combined data
-    output_file = "all_princeton_academic_events.json"
+    output_file = OUTPUT_FILE
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(combined_data, f, indent=2, ensure_ascii=False)
+        json.dump(combined_data, f, indent=2, ensure_ascii=False, default=json_default)
 
     print("\n" + "=" * 60)
     print("COMBINATION RESULTS")
@@ -163,11 +297,17 @@ def combine_all_events(use_browser: bool = True):
     print(f"  - From individual/Drupal scrapers: {total_events - browser_events}")
     print(f"  - From browser scraper: {browser_events}")
     print(f"Saved to: {output_file}")
+    # Imported here, not at the top: the sources import what they use, so
+    # e.g. --only ics never loads the Drupal detail cache
+    from detail_cache import DETAIL_CACHE
+    from http_client import HTTP_CLIENT
+    print(f"Detail pages: {DETAIL_CACHE.hits} reused from cache, {DETAIL_CACHE.misses} fetched")
+    HTTP_CLIENT.print_summary()
 
     # Show breakdown by department
     department_counts = {}
     for event in all_events:
-        dept = event.get('department', 'Unknown')
+        dept = event.department or 'Unknown'
         department_counts[dept] = department_counts.get(dept, 0) + 1
 
     print("\nEVENTS BY DEPARTMENT:")
@@ -177,5 +317,30 @@ def combine_all_events(use_browser: bool = True):
     return combined_data
 
 if __name__ == "__main__":
-    # Browser scraper disabled - ICS feeds cover all those departments
-    combine_all_events(use_browser=False)
+    parser = argparse.ArgumentParser(description="Combine events from all Princeton event sources")
+    parser.add_argument('--only', help="Comma-separated source keys or groups to run, e.g. ics,math,drupal")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Reuse snapshots of sources whose upstream payloads are unchanged")
+    parser.add_argument('--browser', action='store_true', help="Include the Playwright browser tier")
+    parser.add_argument('--workers', type=int, help="Number of sources to run at once (default: all)")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="Parse HTML/ICS responses on a process pool while fetch threads keep downloading")
+    parser.add_argument('--parse-workers', type=int, help="Parse processes for --pipeline (default: one per core)")
+    parser.add_argument('--since', help="Only keep events starting on or after this date (YYYY-MM-DD or -N days)")
+    parser.add_argument('--until', help="Only keep events starting on or before this date (YYYY-MM-DD or +N days)")
+    parser.add_argument('--list', action='store_true', help="List registered sources and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for source in SOURCES.values():
+            print(f"{source.key:<20} {source.group}")
+    else:
+        only = [name.strip() for name in args.only.split(',') if name.strip()] if args.only else None
+        try:
+            window = EventWindow.parse(args.since, args.until) if args.since or args.until else None
+        except ValueError as e:
+            parser.error(str(e))
+        # Browser scraper off by default - ICS feeds cover all those departments
+        combine_all_events(use_browser=args.browser, incremental=args.incremental,
+                           only=only, max_workers=args.workers,
+                           pipeline=args.pipeline, parse_workers=args.parse_workers, window=window)
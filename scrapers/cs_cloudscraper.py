@@ -1,31 +1,87 @@
 #!/usr/bin/env python3
-import cloudscraper
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime
 import re
 import time
 from typing import List, Dict, Any
+from http_client import create_session, BROWSER_HEADERS
+from detail_cache import DETAIL_CACHE
+from parse_stage import PARSE_STAGE
+from keyword_classifier import Vocabulary
+from department_catalog import DEPARTMENT_CATALOG
+
+# Event types by priority, then tags in the order they are reported
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'),
+        ('seminar', 'Seminar'),
+        ('workshop', 'Workshop'),
+        ('talk', 'Talk'),
+        ('lecture', 'Lecture'),
+        ('conference', 'Conference'),
+        ('panel', 'Panel'),
+        ('discussion', 'Discussion'),
+        ('symposium', 'Symposium'),
+        ('meeting', 'Meeting'),
+        ('exam', 'Exam'),
+        ('office hours', 'Office Hours'),
+        ('lab', 'Lab Session'),
+        ('tutorial', 'Tutorial'),
+        ('recitation', 'Recitation'),
+        ('research', 'Research Presentation'),
+        ('hackathon', 'Hackathon'),
+        ('competition', 'Competition'),
+    ],
+    tags=[
+        # Department-specific
+        'computer science', 'cs', 'computing', 'programming', 'software',
+        'algorithm', 'data structure', 'machine learning', 'ai', 'artificial intelligence',
+        'computer vision', 'natural language processing', 'nlp', 'robotics',
+        'systems', 'networks', 'security', 'cryptography', 'databases',
+        'operating systems', 'compilers', 'theory', 'complexity', 'optimization',
+        'human-computer interaction', 'hci', 'user interface', 'ui', 'ux',
+        'web development', 'mobile development', 'game development', 'virtual reality',
+        'augmented reality', 'blockchain', 'distributed systems', 'parallel computing',
+        # General
+        'princeton', 'university', 'academic', 'event', 'seminar', 'lecture',
+    ],
+)
+
+# The event's category, checked before its title
+CATEGORY_VOCABULARY = Vocabulary(
+    event_types=[
+        ('seminar', 'Seminar'),
+        ('lecture', 'Lecture'),
+        ('colloquium', 'Colloquium'),
+    ],
+    default_type='',
+)
+
+# Tags read from the event page text
+CONTENT_VOCABULARY = Vocabulary(
+    tags=[
+        'computer science', 'cs', 'computing', 'programming', 'software',
+        'algorithm', 'data structure', 'machine learning', 'ai', 'artificial intelligence',
+        'computer vision', 'natural language processing', 'nlp', 'robotics',
+        'systems', 'networks', 'security', 'cryptography', 'databases',
+        'operating systems', 'compilers', 'theory', 'complexity', 'optimization',
+        'human-computer interaction', 'hci', 'user interface', 'ui', 'ux',
+        'web development', 'mobile development', 'game development', 'virtual reality',
+        'augmented reality', 'blockchain', 'distributed systems', 'parallel computing',
+        'python', 'java', 'javascript', 'c++', 'c#', 'go', 'rust', 'swift',
+    ],
+)
+
 
 class CSCloudScraper:
     def __init__(self):
-        self.scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'windows', 'desktop': True},
-            delay=10
-        )
-        self.scraper.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        self.scraper = create_session(BROWSER_HEADERS, browser=True)
         self.base_url = "https://www.cs.princeton.edu"
         self.events_url = "https://www.cs.princeton.edu/events"
         self.department_name = "Computer Science"
-        self.meta_category = "sciences_engineering"
+        self.meta_category = DEPARTMENT_CATALOG.meta_category(self.department_name)
+        self.detail_cache = DETAIL_CACHE
         
     def scrape_cs_events(self) -> List[Dict[str, Any]]:
         """Scrape events from the Computer Science department"""
@@ -40,27 +96,18 @@ class CSCloudScraper:
             response = self.scraper.get(self.events_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find event containers - CS department uses custom_card class
-            event_containers = soup.find_all('li', class_='custom_card')
-            print(f"    🔍 Found {len(event_containers)} events")
-            
-            if not event_containers:
-                print("    ⚠️  No events found")
+            page_events = PARSE_STAGE.run(self.department_name, parse_cs_listing, response.content)
+            if not page_events:
                 return []
             
-            # Extract events from containers
-            for container in event_containers:
-                event = self._extract_event_from_container(container)
-                if event and event.get('title'):
-                    # Get additional details from individual event page
-                    if event.get('source_url'):
-                        detailed_event = self._fetch_event_details(event['source_url'])
-                        if detailed_event:
-                            event.update(detailed_event)
-                    
-                    all_events.append(event)
+            for event in page_events:
+                # Get additional details from individual event page
+                if event.get('source_url'):
+                    detailed_event = self.detail_cache.lookup(event, lambda: self._fetch_event_details(event['source_url']))
+                    if detailed_event:
+                        event.update(detailed_event)
+                
+                all_events.append(event)
             
             # Remove duplicates and sort by date
             unique_events = self._deduplicate_events(all_events)
@@ -73,6 +120,25 @@ class CSCloudScraper:
             print(f"❌ Error scraping CS events: {e}")
             return []
     
+    def parse_listing(self, content: bytes) -> List[Dict[str, Any]]:
+        """Extract the events on the listing page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Find event containers - CS department uses custom_card class
+        event_containers = soup.find_all('li', class_='custom_card')
+        print(f"    🔍 Found {len(event_containers)} events")
+        
+        if not event_containers:
+            print("    ⚠️  No events found")
+            return []
+        
+        events = []
+        for container in event_containers:
+            event = self._extract_event_from_container(container)
+            if event and event.get('title'):
+                events.append(event)
+        return events
+    
     def _extract_event_from_container(self, container) -> Dict[str, Any]:
         """Extract event information from a container"""
         event = {
@@ -184,143 +250,66 @@ class CSCloudScraper:
         try:
             print(f"    🔍 Fetching details from: {event_url}")
             response = self.scraper.get(event_url, timeout=30)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            details = {}
-            
-            # Extract description from the specific field
-            desc_elem = soup.find('div', class_='field--name-field-event-description')
-            if desc_elem:
-                # Get the text content and clean it up
-                description = desc_elem.get_text(strip=True)
-                if description:
-                    # Clean up the description
-                    description = re.sub(r'\s+', ' ', description).strip()
-                    # Remove common footer text
-                    description = re.sub(r'(privacy policy|cookie policy|copyright|all rights reserved).*$', '', description, flags=re.IGNORECASE)
-                    details['description'] = description
-            
-            # If no description found, try meta description as fallback
-            if not details.get('description'):
-                meta_desc = soup.find('meta', {'name': 'description'})
-                if meta_desc and meta_desc.get('content'):
-                    details['description'] = meta_desc.get('content')
-            
-            # Extract speaker information
-            speaker_elem = soup.find('div', class_='field--name-field-speaker')
-            if speaker_elem:
-                speaker_text = speaker_elem.get_text(strip=True)
-                if speaker_text and 'speaker' not in speaker_text.lower():
-                    details['speaker'] = speaker_text
-            
-            # Extract additional content for tags
-            if details.get('description'):
-                content_text = details['description'].lower()
-                additional_tags = self._extract_content_tags(content_text)
-                if additional_tags:
-                    details['tags'] = additional_tags
-            
-            return details
+            return PARSE_STAGE.run(self.department_name, parse_cs_details, response.content)
             
         except Exception as e:
             print(f"    ⚠️  Error fetching event details: {e}")
             return {}
     
+    def parse_event_details(self, content: bytes) -> Dict[str, Any]:
+        """Extract the detail fields from an event page"""
+        soup = BeautifulSoup(content, 'html.parser')
+
+        details = {}
+
+        # Extract description from the specific field
+        desc_elem = soup.find('div', class_='field--name-field-event-description')
+        if desc_elem:
+            # Get the text content and clean it up
+            description = desc_elem.get_text(strip=True)
+            if description:
+                # Clean up the description
+                description = re.sub(r'\s+', ' ', description).strip()
+                # Remove common footer text
+                description = re.sub(r'(privacy policy|cookie policy|copyright|all rights reserved).*$', '', description, flags=re.IGNORECASE)
+                details['description'] = description
+
+        # If no description found, try meta description as fallback
+        if not details.get('description'):
+            meta_desc = soup.find('meta', {'name': 'description'})
+            if meta_desc and meta_desc.get('content'):
+                details['description'] = meta_desc.get('content')
+
+        # Extract speaker information
+        speaker_elem = soup.find('div', class_='field--name-field-speaker')
+        if speaker_elem:
+            speaker_text = speaker_elem.get_text(strip=True)
+            if speaker_text and 'speaker' not in speaker_text.lower():
+                details['speaker'] = speaker_text
+
+        # Extract additional content for tags
+        if details.get('description'):
+            content_text = details['description'].lower()
+            additional_tags = self._extract_content_tags(content_text)
+            if additional_tags:
+                details['tags'] = additional_tags
+
+        return details
+    
     def _determine_event_type(self, title: str, category: str) -> str:
         """Determine event type based on title and category"""
         if not title:
             return 'Event'
-            
-        title_lower = title.lower()
-        category_lower = category.lower()
-        
-        # Check category first
-        if 'seminar' in category_lower:
-            return 'Seminar'
-        elif 'lecture' in category_lower:
-            return 'Lecture'
-        elif 'colloquium' in category_lower:
-            return 'Colloquium'
-        
-        # Check title keywords
-        type_keywords = {
-            'colloquium': 'Colloquium',
-            'seminar': 'Seminar',
-            'workshop': 'Workshop',
-            'talk': 'Talk',
-            'lecture': 'Lecture',
-            'conference': 'Conference',
-            'panel': 'Panel',
-            'discussion': 'Discussion',
-            'symposium': 'Symposium',
-            'meeting': 'Meeting',
-            'exam': 'Exam',
-            'office hours': 'Office Hours',
-            'lab': 'Lab Session',
-            'tutorial': 'Tutorial',
-            'recitation': 'Recitation',
-            'research': 'Research Presentation',
-            'hackathon': 'Hackathon',
-            'competition': 'Competition'
-        }
-        
-        for keyword, event_type in type_keywords.items():
-            if keyword in title_lower:
-                return event_type
-        
-        return 'Event'
+        # Category first, then title keywords
+        return CATEGORY_VOCABULARY.event_type(category) or VOCABULARY.event_type(title)
     
     def _extract_tags(self, title: str, description: str, category: str) -> List[str]:
         """Extract relevant tags from title, description, and category"""
-        text = (title + ' ' + (description or '') + ' ' + (category or '')).lower()
-        tags = []
-        
-        # Add department-specific tags
-        cs_tags = [
-            'computer science', 'cs', 'computing', 'programming', 'software',
-            'algorithm', 'data structure', 'machine learning', 'ai', 'artificial intelligence',
-            'computer vision', 'natural language processing', 'nlp', 'robotics',
-            'systems', 'networks', 'security', 'cryptography', 'databases',
-            'operating systems', 'compilers', 'theory', 'complexity', 'optimization',
-            'human-computer interaction', 'hci', 'user interface', 'ui', 'ux',
-            'web development', 'mobile development', 'game development', 'virtual reality',
-            'augmented reality', 'blockchain', 'distributed systems', 'parallel computing'
-        ]
-        
-        for tag in cs_tags:
-            if tag in text:
-                tags.append(tag)
-        
-        # Add general tags
-        general_tags = ['princeton', 'university', 'academic', 'event', 'seminar', 'lecture']
-        for tag in general_tags:
-            if tag in text and tag not in tags:
-                tags.append(tag)
-        
-        return tags
+        return VOCABULARY.extract_tags(title, description or '', category or '')
     
     def _extract_content_tags(self, content_text: str) -> List[str]:
         """Extract additional tags from event content"""
-        tags = []
-        
-        # Look for specific content indicators
-        content_keywords = [
-            'computer science', 'cs', 'computing', 'programming', 'software',
-            'algorithm', 'data structure', 'machine learning', 'ai', 'artificial intelligence',
-            'computer vision', 'natural language processing', 'nlp', 'robotics',
-            'systems', 'networks', 'security', 'cryptography', 'databases',
-            'operating systems', 'compilers', 'theory', 'complexity', 'optimization',
-            'human-computer interaction', 'hci', 'user interface', 'ui', 'ux',
-            'web development', 'mobile development', 'game development', 'virtual reality',
-            'augmented reality', 'blockchain', 'distributed systems', 'parallel computing',
-            'python', 'java', 'javascript', 'c++', 'c#', 'go', 'rust', 'swift'
-        ]
-        
-        for keyword in content_keywords:
-            if keyword in content_text:
-                tags.append(keyword)
-        
-        return tags
+        return CONTENT_VOCABULARY.extract_tags(content_text)
     
     def _deduplicate_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate events"""
@@ -357,6 +346,17 @@ class CSCloudScraper:
         
         print(f"💾 Saved {len(events)} events to {filename}")
 
+
+def parse_cs_listing(content: bytes) -> List[Dict[str, Any]]:
+    """Picklable entry point for PARSE_STAGE"""
+    return CSCloudScraper().parse_listing(content)
+
+
+def parse_cs_details(content: bytes) -> Dict[str, Any]:
+    """Picklable entry point for PARSE_STAGE"""
+    return CSCloudScraper().parse_event_details(content)
+
+
 if __name__ == "__main__":
     scraper = CSCloudScraper()
     events = scraper.scrape_cs_events()
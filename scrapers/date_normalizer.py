@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Date and time normalization shared by the scrapers.
+
+The department pages write dates and times in a dozen shapes ('Monday,
+November 10, 2025', 'Wed, Sep 24, 2025', '10/20/2025', 'Tue, 9/9 · 4:30 pm',
+'Sep 8, 2025, 12:30 p.m. – 1:30 p.m.', '2025-09-24T16:30:00-04:00'). Each
+scraper used to run its own uncompiled re.search / strptime chain and
+rebuild a month dict per call. normalize() recognizes all of them with a
+few precompiled patterns and returns a When: timezone-aware start/end
+datetimes in Princeton time.
+
+Results are memoized in a bounded LRU; listing pages repeat the same date
+strings for every event on a day and every instance of a series.
+normalize_many() handles a whole event list, parsing each distinct string
+once.
+"""
+import re
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from event_window import PRINCETON_TZ
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+_MONTH = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+          r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+
+# 'Monday, November 10, 2025' / 'Wed, Sep 24, 2025' / 'Sep. 8 2025' / '2025-10-20' / '10/20/2025' / '9/9'
+_DATE_RE = re.compile(
+    rf'\b(?P<month>{_MONTH})\.?\s+(?P<day>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<year>\d{{4}})\b'
+    r'|\b(?P<iso_year>\d{4})-(?P<iso_month>\d{2})-(?P<iso_day>\d{2})'
+    r'|\b(?P<us_month>\d{1,2})/(?P<us_day>\d{1,2})(?:/(?P<us_year>\d{4}))?\b',
+    re.IGNORECASE,
+)
+
+_MERIDIEM = r'\.?\s*m\b\.?'
+# '4:30 pm – 6:00 pm' / '12:30 p.m. – 1:30 p.m.' / '4:30 – 6:00 pm'
+_TIME_RANGE_RE = re.compile(
+    rf'\b(?P<sh>\d{{1,2}})(?::(?P<sm>\d{{2}}))?\s*(?:(?P<sap>[ap]){_MERIDIEM})?'
+    rf'\s*(?:–|—|-|to)\s*'
+    rf'(?P<eh>\d{{1,2}})(?::(?P<em>\d{{2}}))?\s*(?P<eap>[ap]){_MERIDIEM}',
+    re.IGNORECASE,
+)
+# '4:30 pm' / '3pm'
+_TIME_RE = re.compile(rf'\b(?P<sh>\d{{1,2}})(?::(?P<sm>\d{{2}}))?\s*(?P<sap>[ap]){_MERIDIEM}', re.IGNORECASE)
+_ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?(?:Z|[+-]\d{2}:?\d{2})?$')
+
+
+class When(NamedTuple):
+    """Canonical event time: aware datetimes in Princeton time"""
+    start: datetime
+    end: Optional[datetime] = None
+    all_day: bool = False
+
+    @property
+    def date(self) -> str:
+        """Start date as YYYY-MM-DD"""
+        return self.start.date().isoformat()
+
+    @property
+    def end_date(self) -> str:
+        return self.end.date().isoformat() if self.end else ''
+
+    def start_time(self, fmt: str = '%H:%M') -> str:
+        return '' if self.all_day else _format(self.start, fmt)
+
+    def end_time(self, fmt: str = '%H:%M') -> str:
+        return '' if self.all_day or not self.end else _format(self.end, fmt)
+
+    def time_range(self, fmt: str = '%H:%M', separator: str = ' - ') -> str:
+        """'16:30 - 18:00', or just the start time when there is no end"""
+        start, end = self.start_time(fmt), self.end_time(fmt)
+        return f"{start}{separator}{end}" if start and end else start
+
+    def clock_range(self, separator: str = ' - ') -> str:
+        """'4:30 PM - 6:00 PM', or just the start when there is no end"""
+        if self.all_day:
+            return ''
+        return separator.join(clock(value) for value in (self.start, self.end) if value)
+
+
+def _format(value: datetime, fmt: str) -> str:
+    # strftime is slow; the default format is most of the calls
+    return f"{value.hour:02d}:{value.minute:02d}" if fmt == '%H:%M' else value.strftime(fmt)
+
+
+def clock(value: Union[datetime, time]) -> str:
+    """12-hour display time without a leading zero: '4:30 PM'"""
+    return f"{value.hour % 12 or 12}:{value.minute:02d} {'AM' if value.hour < 12 else 'PM'}"
+
+
+def to_local(value: datetime) -> datetime:
+    """Aware datetimes converted to Princeton time; naive ones are returned as is"""
+    return value.astimezone(PRINCETON_TZ) if value.tzinfo else value
+
+
+def month_number(name: str) -> Optional[int]:
+    """1-12 for a month name or abbreviation ('Sep', 'Sept.', 'September'), else None"""
+    return MONTHS.get(name.strip().lower()[:3])
+
+
+def _hour(hour: str, minute: Optional[str], meridiem: Optional[str]) -> Optional[time]:
+    hour_int, minute_int = int(hour), int(minute or 0)
+    if meridiem:
+        if not 1 <= hour_int <= 12:
+            return None
+        hour_int = hour_int % 12 + (12 if meridiem.lower() == 'p' else 0)
+    if hour_int > 23 or minute_int > 59:
+        return None
+    return time(hour_int, minute_int)
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str, default_year: Optional[int] = None) -> Optional[date]:
+    """
+    First calendar date in text. Month/day without a year ('9/9') is only
+    read when default_year is given.
+    """
+    for match in _DATE_RE.finditer(text):
+        groups = match.groupdict()
+        try:
+            if groups['month']:
+                return date(int(groups['year']), month_number(groups['month']), int(groups['day']))
+            if groups['iso_year']:
+                return date(int(groups['iso_year']), int(groups['iso_month']), int(groups['iso_day']))
+            year = groups['us_year'] or default_year
+            if year:
+                return date(int(year), int(groups['us_month']), int(groups['us_day']))
+        except ValueError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=4096)
+def parse_time_range(text: str) -> Tuple[Optional[time], Optional[time]]:
+    """
+    (start, end) clock times in text; a range shares its meridiem when only
+    the end has one ('4:30 – 6:00 pm'). Either side may be None.
+    """
+    match = _TIME_RANGE_RE.search(text)
+    if match:
+        end = _hour(match['eh'], match['em'], match['eap'])
+        start = _hour(match['sh'], match['sm'], match['sap'] or match['eap'])
+        if start and end and not match['sap'] and start > end:
+            # '11:30 – 12:30 pm': the start is still in the morning
+            start = _hour(match['sh'], match['sm'], 'a')
+        if start:
+            return start, end
+    match = _TIME_RE.search(text)
+    if match:
+        return _hour(match['sh'], match['sm'], match['sap']), None
+    return None, None
+
+
+@lru_cache(maxsize=4096)
+def parse_iso(text: str) -> Optional[datetime]:
+    """
+    ISO 8601 date or datetime ('2025-09-24', '2025-09-24T16:30:00Z',
+    '2025-09-24T16:30:00-04:00') as an aware Princeton datetime. Naive
+    values are taken as Princeton time.
+    """
+    text = text.strip()
+    if not _ISO_RE.match(text):
+        return None
+    try:
+        value = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=PRINCETON_TZ)
+    return value.astimezone(PRINCETON_TZ)
+
+
+def _combine(day: date, clock: time) -> datetime:
+    return datetime.combine(day, clock, tzinfo=PRINCETON_TZ)
+
+
+@lru_cache(maxsize=4096)
+def normalize(text: str, default_year: Optional[int] = None) -> Optional[When]:
+    """When for a date/time string in any of the shapes above, or None without a date"""
+    if not text:
+        return None
+    text = ' '.join(text.split())
+    iso = parse_iso(text)
+    if iso is not None:
+        return When(iso, None, len(text) == 10)
+    day = parse_date(text, default_year)
+    if day is None:
+        return None
+    start_clock, end_clock = parse_time_range(text)
+    if start_clock is None:
+        return When(_combine(day, time()), None, True)
+    start = _combine(day, start_clock)
+    end = None
+    if end_clock is not None:
+        end = _combine(day, end_clock)
+        if end < start:
+            # Runs past midnight
+            end = _combine(day + timedelta(days=1), end_clock)
+    return When(start, end)
+
+
+def normalize_range(start_text: str, end_text: str = '') -> Optional[When]:
+    """When from separate start/end strings (JSON feeds with 'start' and 'end' fields)"""
+    start = normalize(start_text)
+    if start is None:
+        return None
+    end = normalize(end_text) if end_text else None
+    if end is None:
+        return start
+    return When(start.start, end.start, start.all_day and end.all_day)
+
+
+def normalize_many(texts: Iterable[str], default_year: Optional[int] = None) -> List[Optional[When]]:
+    """normalize() for a whole event list; each distinct string is parsed once"""
+    seen = {}
+    out = []
+    for text in texts:
+        if text not in seen:
+            seen[text] = normalize(text, default_year)
+        out.append(seen[text])
+    return out
+
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Canonical department catalog and meta-category resolution.
+
+Every scraper used to carry its own meta_category string, and the Localist
+scraper scanned all META_CATEGORY_MAP keywords with substring tests for
+every event. DEPARTMENT_CATALOG is now the one place a department's
+meta-category is defined; the ICS, Drupal, browser and individual scrapers
+look theirs up by name.
+
+meta_category() resolves a name in three steps:
+
+  exact       the normalized name (or an alias: 'SPIA', 'art_archaeology',
+              'Department of Politics') is in the catalog
+  keywords    otherwise the first META_CATEGORY_MAP keyword, in map order,
+              occurring in the normalized name, found with one scan of a
+              KeywordAutomaton
+  default     'interdisciplinary'
+
+Results are memoized per distinct name, so a large Localist pull costs one
+resolution per group rather than one keyword scan per event.
+
+KeywordAutomaton is a trie-shaped regular expression that finds every
+keyword of the map in a single scan of the name. Matching keeps substring
+semantics: keywords inside a longer match come from a precomputed
+containment table, and keywords that could start inside a match and run
+past it (which a non-overlapping scan skips) are checked directly.
+"""
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation shaped like a trie; greedy, so the longest keyword at a position wins"""
+    root: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = root
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(root)
+
+
+class _Compiled(NamedTuple):
+    pattern: Optional['re.Pattern']
+    # matched keyword -> every keyword it contains (itself included)
+    contains: Dict[str, FrozenSet[str]]
+    # matched keyword -> keywords that may start inside it and run past its end
+    overlaps: Dict[str, Tuple[str, ...]]
+
+
+class KeywordAutomaton:
+    """Finds which of a growing set of keywords occur in a text, in one pass"""
+
+    def __init__(self):
+        self.keywords: set = set()
+        self._compiled: Optional[_Compiled] = None
+        self._lock = threading.Lock()
+
+    def add(self, keywords: Iterable[str]):
+        new = {keyword.lower() for keyword in keywords if keyword} - self.keywords
+        if new:
+            with self._lock:
+                self.keywords |= new
+                self._compiled = None
+
+    def _compile(self) -> _Compiled:
+        with self._lock:
+            if self._compiled is None:
+                keywords = sorted(self.keywords)
+                contains = {kw: frozenset(other for other in keywords if other in kw) for kw in keywords}
+                # other overlaps kw when a tail of kw is a proper prefix of other
+                starting: Dict[str, List[str]] = {}
+                for other in keywords:
+                    for i in range(1, len(other)):
+                        starting.setdefault(other[:i], []).append(other)
+                overlaps = {}
+                for kw in keywords:
+                    tails = {other for i in range(1, len(kw)) for other in starting.get(kw[i:], ())}
+                    if tails:
+                        overlaps[kw] = tuple(sorted(tails))
+                pattern = re.compile(_trie_pattern(keywords)) if keywords else None
+                self._compiled = _Compiled(pattern, contains, overlaps)
+            return self._compiled
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Keywords occurring in text (already lowercased) as substrings"""
+        compiled = self._compiled or self._compile()
+        if not text or compiled.pattern is None:
+            return _EMPTY
+        matched = set(compiled.pattern.findall(text))
+        if not matched:
+            return _EMPTY
+        contains = compiled.contains
+        found = set().union(*[contains[keyword] for keyword in matched])
+        # findall does not report matches that overlap an earlier one; only
+        # the keywords that can start inside a match need a second look
+        for keyword in matched:
+            for other in compiled.overlaps.get(keyword, ()):
+                if other not in found and other in text:
+                    found |= contains[other]
+        return frozenset(found)
+
+
+DEFAULT_META_CATEGORY = 'interdisciplinary'
+
+# Keyword fallback for names not in the catalog (Localist groups, centers),
+# in priority order: the first keyword occurring in the name wins
+META_CATEGORY_MAP = {
+    'mathematics': 'sciences_engineering',
+    'physics': 'sciences_engineering',
+    'chemistry': 'sciences_engineering',
+    'biology': 'sciences_engineering',
+    'molecular biology': 'sciences_engineering',
+    'geosciences': 'sciences_engineering',
+    'astrophysical': 'sciences_engineering',
+    'computer science': 'sciences_engineering',
+    'electrical': 'sciences_engineering',
+    'mechanical': 'sciences_engineering',
+    'chemical': 'sciences_engineering',
+    'civil': 'sciences_engineering',
+    'operations research': 'sciences_engineering',
+    'neuroscience': 'sciences_engineering',
+    'ecology': 'sciences_engineering',
+    'environmental': 'sciences_engineering',
+    'pacm': 'sciences_engineering',
+    'andlinger': 'sciences_engineering',
+    'economics': 'social_sciences',
+    'politics': 'social_sciences',
+    'sociology': 'social_sciences',
+    'psychology': 'social_sciences',
+    'anthropology': 'social_sciences',
+    'public affairs': 'social_sciences',
+    'spia': 'social_sciences',
+    'finance': 'social_sciences',
+    'piirs': 'social_sciences',
+    'history': 'arts_humanities',
+    'english': 'arts_humanities',
+    'philosophy': 'arts_humanities',
+    'art': 'arts_humanities',
+    'music': 'arts_humanities',
+    'religion': 'arts_humanities',
+    'classics': 'arts_humanities',
+    'slavic': 'arts_humanities',
+    'comparative literature': 'arts_humanities',
+    'humanities': 'arts_humanities',
+    'medieval': 'arts_humanities',
+    'french': 'arts_humanities',
+    'italian': 'arts_humanities',
+    'spanish': 'arts_humanities',
+    'portuguese': 'arts_humanities',
+    'linguistics': 'arts_humanities',
+    'near eastern': 'area_studies',
+    'east asian': 'area_studies',
+    'latin american': 'area_studies',
+    'hellenic': 'area_studies',
+    'african': 'area_studies',
+    'gender': 'interdisciplinary',
+    'citp': 'interdisciplinary',
+}
+
+# Prefixes dropped before the exact lookup ('Department of Physics' -> 'physics')
+_PREFIX_RE = re.compile(r'^(?:the |department of |program in |princeton )')
+
+
+class Department(NamedTuple):
+    name: str
+    meta_category: str
+    aliases: Tuple[str, ...] = ()
+
+
+DEPARTMENTS = [
+    # Sciences and engineering
+    Department('Computer Science', 'sciences_engineering', ('cs',)),
+    Department('Mathematics', 'sciences_engineering', ('math',)),
+    Department('Physics', 'sciences_engineering'),
+    Department('Geosciences', 'sciences_engineering'),
+    Department('Chemistry', 'sciences_engineering'),
+    Department('Astrophysical Sciences', 'sciences_engineering'),
+    Department('Molecular Biology', 'sciences_engineering', ('molbio',)),
+    Department('Ecology and Evolutionary Biology', 'sciences_engineering', ('eeb',)),
+    Department('Chemical and Biological Engineering', 'sciences_engineering', ('cbe',)),
+    Department('Operations Research and Financial Engineering', 'sciences_engineering', ('orfe',)),
+    Department('Electrical and Computer Engineering', 'sciences_engineering', ('ece',)),
+    Department('Civil and Environmental Engineering', 'sciences_engineering', ('cee',)),
+    Department('Mechanical and Aerospace Engineering', 'sciences_engineering', ('mae',)),
+    Department('Princeton Neuroscience Institute', 'sciences_engineering',
+               ('neuroscience', 'neuroscience (pni)', 'pni')),
+    # Social sciences
+    Department('Economics', 'social_sciences'),
+    Department('Politics', 'social_sciences'),
+    Department('Sociology', 'social_sciences'),
+    Department('Psychology', 'social_sciences'),
+    Department('Anthropology', 'social_sciences'),
+    Department('School of Public and International Affairs', 'social_sciences', ('spia',)),
+    # Arts and humanities
+    Department('History', 'arts_humanities'),
+    Department('English', 'arts_humanities'),
+    Department('Philosophy', 'arts_humanities'),
+    Department('Classics', 'arts_humanities'),
+    Department('Comparative Literature', 'arts_humanities', ('complit',)),
+    Department('Music', 'arts_humanities'),
+    Department('Art and Archaeology', 'arts_humanities', ('art archaeology',)),
+    Department('Religion', 'arts_humanities'),
+    Department('Slavic Languages and Literatures', 'arts_humanities', ('slavic languages',)),
+    Department('French and Italian', 'arts_humanities', ('french italian',)),
+    Department('Medieval Studies', 'arts_humanities'),
+    # Area studies
+    Department('Near Eastern Studies', 'area_studies', ('nes',)),
+    Department('East Asian Studies', 'area_studies', ('eas',)),
+    Department('Hellenic Studies', 'area_studies'),
+    Department('African American Studies', 'area_studies', ('aas',)),
+    Department('African Studies', 'area_studies'),
+    # Interdisciplinary centers and programs
+    Department('Gender and Sexuality Studies', 'interdisciplinary', ('gss',)),
+    Department('Center for Information Technology Policy', 'interdisciplinary', ('citp',)),
+    Department('University Center for Human Values', 'interdisciplinary', ('uchv',)),
+]
+
+
+def normalize_name(name: str) -> str:
+    """'Art & Archaeology' / 'art_archaeology' -> 'art and archaeology' / 'art archaeology'"""
+    name = ' '.join(name.lower().replace('&', ' and ').replace('_', ' ').split())
+    return _PREFIX_RE.sub('', name)
+
+
+class DepartmentCatalog:
+    """Department lookup by name or alias, with meta-category resolution"""
+
+    def __init__(self, departments: Sequence[Department] = (),
+                 keyword_map: Optional[Dict[str, str]] = None, default: str = DEFAULT_META_CATEGORY):
+        self.default = default
+        self.keyword_map = dict(keyword_map or {})
+        self._rank = {keyword: i for i, keyword in enumerate(self.keyword_map)}
+        self._automaton = KeywordAutomaton()
+        self._automaton.add(self.keyword_map)
+        self._by_name: Dict[str, Department] = {}
+        self._resolved: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        for department in departments:
+            self.add(department)
+
+    def add(self, department: Department):
+        with self._lock:
+            for name in (department.name,) + department.aliases:
+                self._by_name[normalize_name(name)] = department
+            self._resolved.clear()
+
+    def department(self, name: str) -> Optional[Department]:
+        """Catalog entry for a name or alias, if any"""
+        return self._by_name.get(normalize_name(name or ''))
+
+    def meta_category(self, name: str) -> str:
+        """Meta-category for a department or group name (memoized per distinct name)"""
+        category = self._resolved.get(name)
+        if category is None:
+            category = self._resolve(name or '')
+            with self._lock:
+                self._resolved[name] = category
+        return category
+
+    def _resolve(self, name: str) -> str:
+        normalized = normalize_name(name)
+        department = self._by_name.get(normalized)
+        if department is not None:
+            return department.meta_category
+        # Without the prefix, 'Department of ...' no longer matches 'art'
+        found = self._automaton.find(normalized)
+        if not found:
+            return self.default
+        first = min((keyword for keyword in found if keyword in self._rank), key=self._rank.get, default=None)
+        return self.keyword_map[first] if first else self.default
+
+
+# Shared by all scrapers
+DEPARTMENT_CATALOG = DepartmentCatalog(DEPARTMENTS, META_CATEGORY_MAP)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of event detail-page results.
+
+Entries are keyed by the event's source_url and tagged with a fingerprint of
+the listing fields (title, date, time, location). A detail page is only
+fetched again when that listing fingerprint changes or the entry is older
+than the TTL.
+
+Entries also keep the digest of the detail page they were parsed from. A
+cache hit reports that digest to the active PayloadRecorder, as a fetch of
+the page would, so a source's payload fingerprint is the same whether its
+detail pages came from the cache or from upstream.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Callable, Optional
+
+from http_cache import CACHE_DIR, PayloadRecorder, payload_key, record_payload
+
+FINGERPRINT_FIELDS = ('title', 'start_date', 'time', 'location')
+
+
+class DetailCache:
+    """On-disk detail cache, one JSON file per source_url"""
+
+    def __init__(self, cache_dir: str = os.path.join(CACHE_DIR, 'details'), ttl_days: int = 30):
+        self.cache_dir = cache_dir
+        self.ttl = timedelta(days=ttl_days)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(event: Dict[str, Any]) -> str:
+        """Hash of the listing fields a detail page depends on"""
+        joined = '|'.join(str(event.get(field) or '') for field in FINGERPRINT_FIELDS)
+        return hashlib.sha256(joined.encode('utf-8')).hexdigest()
+
+    def _path(self, source_url: str) -> str:
+        digest = hashlib.sha1(source_url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'{digest}.json')
+
+    def get(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return cached details if the listing fingerprint matches and the entry is fresh"""
+        entry = self._entry(event)
+        return entry.get('details') if entry else None
+
+    def cached(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        get() that also counts the hit or miss and records the stored page
+        digest, for callers that fetch and parse the page themselves.
+        """
+        entry = self._entry(event)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if entry is None:
+            return None
+        if entry.get('sha256'):
+            record_payload(payload_key(event['source_url']), entry['sha256'])
+        return entry.get('details')
+
+    def _entry(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        source_url = event.get('source_url')
+        if not source_url:
+            return None
+        try:
+            with open(self._path(source_url), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('fingerprint') != self.fingerprint(event):
+            return None
+        try:
+            fetched_at = datetime.fromisoformat(entry['fetched_at'])
+        except (KeyError, ValueError):
+            return None
+        if datetime.now() - fetched_at > self.ttl:
+            return None
+        return entry
+
+    def put(self, event: Dict[str, Any], details: Dict[str, Any], sha256: str = ''):
+        source_url = event.get('source_url')
+        if not source_url:
+            return
+        entry = {
+            'source_url': source_url,
+            'fingerprint': self.fingerprint(event),
+            'fetched_at': datetime.now().isoformat(),
+            'details': details,
+            'sha256': sha256,
+        }
+        path = self._path(source_url)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f'    WARNING: could not write detail cache entry for {source_url}: {e}')
+
+    def lookup(self, event: Dict[str, Any],
+               fetch_details: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Return cached details for event, or call fetch_details() and cache a
+        non-empty result. Must be called before the details are merged into
+        event, since the fingerprint is taken from the listing fields.
+        """
+        fingerprint_event = dict(event)
+        cached = self.cached(fingerprint_event)
+        if cached is not None:
+            return cached
+        # Catch the page digest the fetch records, then pass it on to the run's recorder
+        with PayloadRecorder() as page:
+            details = fetch_details()
+        for url, digest in page.digests.items():
+            record_payload(url, digest)
+        if details:
+            self.put(fingerprint_event, details, page.digests.get(payload_key(event['source_url']), ''))
+        return details
+
+
+# Shared by all scrapers that fetch detail pages
+DETAIL_CACHE = DetailCache()
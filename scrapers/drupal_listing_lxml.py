@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+lxml extraction engine for Drupal listing pages.
+
+UniversalDrupalCloudScraper's BeautifulSoup path runs up to nine find_all()
+scans over the whole page to pick the event containers and then a dozen
+find() scans per container. Here the container selectors and the pagination
+lookup are evaluated in a single walk over the lxml tree, and each container's
+fields are collected in one walk over its subtree.
+
+The matching rules mirror BeautifulSoup's so both engines return the same
+fields: class selectors match any whitespace-separated class token, find()
+returns the first matching descendant in document order, and get_text()
+skips comments and script/style/template/rt/rp text.
+"""
+import codecs
+import re
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Strings BeautifulSoup's html.parser builder keeps out of get_text()
+_NON_TEXT_TAGS = {'script', 'style', 'template', 'rt', 'rp'}
+
+_NEXT_RE = re.compile(r'Next', re.I)
+
+# libxml2 normalises \r\n and \r to \n while html.parser keeps them, so carriage
+# returns are swapped for a private-use placeholder before parsing and
+# restored in every string handed back
+_CR = '\ue000'
+_CR_UTF8 = _CR.encode('utf-8')
+
+
+def _restore(value: Optional[str]) -> Optional[str]:
+    return value.replace(_CR, '\r') if value else value
+
+
+def _classes(element) -> List[str]:
+    value = element.get('class')
+    return value.replace(_CR, ' ').split() if value else []
+
+
+def get_attribute(element, name: str) -> Optional[str]:
+    return _restore(element.get(name))
+
+
+def _is_element(node) -> bool:
+    # Comments and processing instructions have a non-string tag
+    return isinstance(node.tag, str)
+
+
+def _div_selectors(classes: List[str]) -> List[int]:
+    """All container selectors a div matches (a div can match several)"""
+    matched = []
+    for index, name in ((0, 'node--type-event'), (2, 'content-list-item'), (3, 'event-item'), (5, 'views-row')):
+        if name in classes:
+            matched.append(index)
+    if any('event' in c.lower() for c in classes):
+        matched.append(8)
+    return matched
+
+
+def parse_html(content: bytes, encoding: str):
+    """Parse the decoded page exactly as the BeautifulSoup path sees it"""
+    if codecs.lookup(encoding).name == 'utf-8':
+        # libxml2 decodes UTF-8 itself; skip the decoded str copy
+        if b'\r' in content:
+            content = content.replace(b'\r', _CR_UTF8)
+        return lxml_html.document_fromstring(content, parser=lxml_html.HTMLParser(encoding='utf-8'))
+    text = content.decode(encoding, errors='replace').replace('\r', _CR)
+    try:
+        return lxml_html.document_fromstring(text)
+    except ValueError:
+        # Unicode strings with an XML encoding declaration are rejected
+        return lxml_html.document_fromstring(text.encode('utf-8'), parser=lxml_html.HTMLParser(encoding='utf-8'))
+
+
+def scan_listing(root) -> Tuple[List[Any], Optional[Any]]:
+    """
+    One pass over the page: returns (event containers, pagination element).
+
+    Containers come from the first selector with any match, like the chained
+    find_all() calls in UniversalDrupalCloudScraper.parse_listing_page().
+    """
+    buckets: List[List[Any]] = [[] for _ in range(9)]
+    nav_pager = None
+    div_pagination = None
+
+    for element in root.iter():
+        if not _is_element(element):
+            continue
+        tag = element.tag
+        if tag not in ('div', 'article', 'li', 'nav'):
+            continue
+        classes = _classes(element)
+        if not classes:
+            continue
+        if tag == 'div':
+            for index in _div_selectors(classes):
+                buckets[index].append(element)
+            if div_pagination is None and 'pagination' in classes:
+                div_pagination = element
+        elif tag == 'nav':
+            if nav_pager is None and 'pager' in classes:
+                nav_pager = element
+        else:
+            # article and li match their selectors independently too
+            if tag == 'article':
+                if 'node--type-event' in classes:
+                    buckets[1].append(element)
+                if 'event' in classes:
+                    buckets[4].append(element)
+                if any('node' in c for c in classes):
+                    buckets[7].append(element)
+            elif 'event' in classes:
+                buckets[6].append(element)
+
+    containers = next((bucket for bucket in buckets if bucket), [])
+    return containers, nav_pager if nav_pager is not None else div_pagination
+
+
+def get_text(element) -> str:
+    """BeautifulSoup get_text(strip=True)"""
+    parts: List[str] = []
+    _collect_text(element, parts)
+    return ''.join(parts)
+
+
+def _collect_text(element, parts: List[str]):
+    text = element.text
+    if text:
+        text = _restore(text).strip()
+        if text:
+            parts.append(text)
+    for child in element:
+        if _is_element(child) and child.tag not in _NON_TEXT_TAGS:
+            _collect_text(child, parts)
+        tail = child.tail
+        if tail:
+            tail = _restore(tail).strip()
+            if tail:
+                parts.append(tail)
+
+
+def _soup_string(element) -> Optional[str]:
+    """BeautifulSoup's Tag.string: the only child string, looking through single-child tags"""
+    children: List[Any] = []
+    if element.text:
+        children.append(element.text)
+    for child in element:
+        children.append(child)
+        if child.tail:
+            children.append(child.tail)
+        if len(children) > 1:
+            return None
+    if len(children) != 1:
+        return None
+    only = children[0]
+    if isinstance(only, str):
+        return _restore(only)
+    if not _is_element(only):
+        return _restore(only.text)
+    return _soup_string(only)
+
+
+def _find(element, tag: str, cls: Optional[str] = None, contains: Optional[str] = None):
+    """First descendant with this tag (and class token / class substring)"""
+    for node in element.iterdescendants(tag):
+        if cls is None and contains is None:
+            return node
+        classes = _classes(node)
+        if cls is not None and cls in classes:
+            return node
+        if contains is not None and any(contains in c for c in classes):
+            return node
+    return None
+
+
+def has_next_page(pagination) -> bool:
+    """UniversalDrupalCloudScraper._has_next_page() on the scanned pagination element"""
+    if pagination is None:
+        return False
+    for link in pagination.iterdescendants('a'):
+        string = _soup_string(link)
+        if string is not None and _NEXT_RE.search(string):
+            return True
+    return False
+
+
+# Class tokens of the per-container field wrappers collected in one subtree walk
+_FIELD_DIVS = {
+    'date-badge': 'date_badge',
+    'date-wrapper': 'date_wrapper',
+    'field--name-field-ps-events-date': 'date_elem',
+    'field--name-field-ps-events-location-name': 'location_elem',
+    'field--name-field-ps-events-audience': 'audience_elem',
+    'field--name-field-ps-events-category': 'category_elem',
+    'field--name-field-ps-summary': 'summary_elem',
+}
+
+
+def container_fields(container) -> Dict[str, Any]:
+    """lxml equivalent of UniversalDrupalCloudScraper._container_fields()"""
+    found: Dict[str, Any] = {}
+    links = []
+
+    for node in container.iterdescendants():
+        if not _is_element(node):
+            continue
+        tag = node.tag
+        if tag == 'div':
+            for cls in _classes(node):
+                key = _FIELD_DIVS.get(cls)
+                if key and key not in found:
+                    found[key] = node
+        elif tag == 'span':
+            if 'title_elem' not in found and 'field--name-title' in _classes(node):
+                found['title_elem'] = node
+        elif tag == 'a':
+            links.append(node)
+        elif tag == 'h3':
+            found.setdefault('h3_elem', node)
+        elif tag == 'img':
+            found.setdefault('img_elem', node)
+
+    fields: Dict[str, Any] = {}
+
+    # Title and URL
+    title_link = None
+    if 'title_elem' in found:
+        title_link = _find(found['title_elem'], 'a')
+    elif 'h3_elem' in found:
+        title_link = _find(found['h3_elem'], 'a')
+    else:
+        for link in links:
+            text = get_text(link)
+            if len(text) > 10 and not text.startswith('http'):
+                title_link = link
+                break
+    if title_link is not None:
+        fields['title'] = get_text(title_link)
+        fields['href'] = get_attribute(title_link, 'href')
+
+    date_badge = found.get('date_badge')
+    if date_badge is not None:
+        month_elem = _find(date_badge, 'div', 'month')
+        day_elem = _find(date_badge, 'div', 'day')
+        if month_elem is not None and day_elem is not None:
+            fields['badge'] = (get_text(month_elem), get_text(day_elem))
+
+    date_wrapper = found.get('date_wrapper')
+    if date_wrapper is not None:
+        month_field = _find(date_wrapper, 'div', contains='event-month')
+        day_field = _find(date_wrapper, 'div', contains='event-day')
+        if month_field is not None and day_field is not None:
+            fields['wrapper'] = (get_text(month_field), get_text(day_field))
+
+    date_elem = found.get('date_elem')
+    if date_elem is not None:
+        day_span = None
+        time_spans = []
+        for span in date_elem.iterdescendants('span'):
+            classes = _classes(span)
+            if day_span is None and 'day' in classes:
+                day_span = span
+            if 'time' in classes:
+                time_spans.append(get_text(span))
+        if day_span is not None:
+            fields['date_day'] = get_text(day_span)
+        fields['time_spans'] = time_spans
+        if not time_spans:
+            fields['date_text'] = get_text(date_elem)
+
+    location_elem = found.get('location_elem')
+    if location_elem is not None:
+        location_item = _find(location_elem, 'div', 'field__item')
+        if location_item is not None:
+            fields['location'] = get_text(location_item)
+
+    if 'audience_elem' in found:
+        fields['audience'] = get_text(found['audience_elem'])
+
+    category_elem = found.get('category_elem')
+    if category_elem is not None:
+        category_item = _find(category_elem, 'div', 'field__item')
+        if category_item is not None:
+            fields['series'] = get_text(category_item)
+
+    if 'summary_elem' in found:
+        fields['summary'] = get_text(found['summary_elem'])
+
+    if 'img_elem' in found:
+        fields['image_src'] = get_attribute(found['img_elem'], 'src')
+
+    return fields
@@ -1,26 +1,28 @@
 #!/usr/bin/env python3
-import cloudscraper
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime
-import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from http_client import create_session, BROWSER_HEADERS
+from parse_stage import PARSE_STAGE
+from keyword_classifier import Vocabulary
+from date_normalizer import normalize
+from department_catalog import DEPARTMENT_CATALOG
+
+# Tags in the order they are reported
+VOCABULARY = Vocabulary(
+    tags=[
+        'economics', 'economic', 'seminar', 'colloquium', 'workshop', 'lecture', 'econometrics',
+        'microeconomic', 'macroeconomic', 'international trade', 'development economics',
+        'behavioral economics', 'experimental economics', 'finance', 'industrial organization',
+        'applied econometrics', 'political economy',
+    ],
+)
+
 
 class EconomicsCloudScraperNew:
     def __init__(self):
-        self.scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'windows', 'desktop': True},
-            delay=10
-        )
-        self.scraper.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        self.scraper = create_session(BROWSER_HEADERS, browser=True)
         self.base_url = "https://economics.princeton.edu"
         
     def scrape_economics_events(self) -> List[Dict[str, Any]]:
@@ -45,63 +47,9 @@ class EconomicsCloudScraperNew:
                 response = self.scraper.get(url, timeout=30)
                 response.raise_for_status()
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for the main event list container
-                event_list_container = soup.find('div', class_='posts event-list')
-                if not event_list_container:
-                    print(f"    ⚠️  No event list container found on page {page}")
-                    break
-                
-                # Find individual events - they are divs with no class inside the event-list
-                event_divs = []
-                for div in event_list_container.find_all('div', recursive=False):
-                    # Check if this div contains event elements
-                    if div.find('div', class_='interior'):
-                        event_divs.append(div)
-                
-                print(f"    🔍 Found {len(event_divs)} events on page {page}")
-                
-                if not event_divs:
-                    print(f"    ⚠️  No events found on page {page}")
-                    break
-                
-                # Extract events from this page
-                for i, event_div in enumerate(event_divs):
-                    try:
-                        event = self._extract_event_from_container(event_div)
-                        if event and event.get('title') and len(event['title']) > 5:
-                            all_events.append(event)
-                            print(f"      ✅ Added: {event['title'][:50]}... on {event.get('start_date', 'No date')}")
-                        else:
-                            print(f"      ⚠️  Skipped event {i+1}: insufficient data")
-                    except Exception as e:
-                        print(f"      ❌ Error extracting event {i+1}: {e}")
-                        continue
-                
-                # Check if we've reached the end by looking for pagination controls
-                pagination = soup.find('div', class_='pagination')
-                if pagination:
-                    # Check if there's a next page
-                    next_page_link = pagination.find('a', class_='next-page')
-                    if not next_page_link or 'hidden' in next_page_link.get('class', []):
-                        print(f"    📄 No more pages found, stopping at page {page}")
-                        break
-                    
-                    # Check if we're on the last page by looking at page numbers
-                    page_links = pagination.find_all('a', class_='page')
-                    if page_links:
-                        page_numbers = []
-                        for link in page_links:
-                            text = link.get_text(strip=True)
-                            if text.isdigit():
-                                page_numbers.append(int(text))
-                        
-                        if page_numbers and page >= max(page_numbers):
-                            print(f"    📄 Reached last page {page}, stopping")
-                            break
-                else:
-                    print(f"    ⚠️  No pagination controls found, stopping at page {page}")
+                page_events, has_next = PARSE_STAGE.run('Economics', parse_economics_listing, response.content, page)
+                all_events.extend(page_events)
+                if not has_next:
                     break
                 
                 page += 1
@@ -119,6 +67,70 @@ class EconomicsCloudScraperNew:
             print(f"❌ Error scraping Economics events: {e}")
             return []
     
+    def parse_listing_page(self, content: bytes, page: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Extract the events on one listing page. Returns (events, has_next_page)."""
+        soup = BeautifulSoup(content, 'html.parser')
+
+        # Look for the main event list container
+        event_list_container = soup.find('div', class_='posts event-list')
+        if not event_list_container:
+            print(f"    ⚠️  No event list container found on page {page}")
+            return [], False
+
+        # Find individual events - they are divs with no class inside the event-list
+        event_divs = []
+        for div in event_list_container.find_all('div', recursive=False):
+            # Check if this div contains event elements
+            if div.find('div', class_='interior'):
+                event_divs.append(div)
+
+        print(f"    🔍 Found {len(event_divs)} events on page {page}")
+
+        if not event_divs:
+            print(f"    ⚠️  No events found on page {page}")
+            return [], False
+
+        # Extract events from this page
+        page_events = []
+        for i, event_div in enumerate(event_divs):
+            try:
+                event = self._extract_event_from_container(event_div)
+                if event and event.get('title') and len(event['title']) > 5:
+                    page_events.append(event)
+                    print(f"      ✅ Added: {event['title'][:50]}... on {event.get('start_date', 'No date')}")
+                else:
+                    print(f"      ⚠️  Skipped event {i+1}: insufficient data")
+            except Exception as e:
+                print(f"      ❌ Error extracting event {i+1}: {e}")
+                continue
+
+        # Check if we've reached the end by looking for pagination controls
+        pagination = soup.find('div', class_='pagination')
+        if pagination:
+            # Check if there's a next page
+            next_page_link = pagination.find('a', class_='next-page')
+            if not next_page_link or 'hidden' in next_page_link.get('class', []):
+                print(f"    📄 No more pages found, stopping at page {page}")
+                return page_events, False
+
+            # Check if we're on the last page by looking at page numbers
+            page_links = pagination.find_all('a', class_='page')
+            if page_links:
+                page_numbers = []
+                for link in page_links:
+                    text = link.get_text(strip=True)
+                    if text.isdigit():
+                        page_numbers.append(int(text))
+
+                if page_numbers and page >= max(page_numbers):
+                    print(f"    📄 Reached last page {page}, stopping")
+                    return page_events, False
+        else:
+            print(f"    ⚠️  No pagination controls found, stopping at page {page}")
+            return page_events, False
+        
+        return page_events, True
+    
     def _extract_event_from_container(self, container) -> Dict[str, Any]:
         """Extract event information from a container element using the specific HTML structure"""
         event = {
@@ -131,7 +143,7 @@ class EconomicsCloudScraperNew:
             'location': 'Princeton University',
             'event_type': 'Seminar',
             'department': 'Economics',
-            'meta_category': 'social_sciences',
+            'meta_category': DEPARTMENT_CATALOG.meta_category('Economics'),
             'source_url': f"{self.base_url}/events/upcoming-seminars/",
             'source_name': 'Economics Department Events',
             'audience': '',
@@ -165,7 +177,7 @@ class EconomicsCloudScraperNew:
         # Extract date and time from the specific HTML structure
         date_elem = interior_div.find('div', class_='event-date')
         if date_elem:
-            date_text = date_elem.get_text(strip=True)
+            date_text = date_elem.get_text(' ', strip=True)
             if date_text:
                 # Parse date and time
                 date_time_info = self._parse_date_time(date_text)
@@ -244,56 +256,15 @@ class EconomicsCloudScraperNew:
     
     def _parse_date_time(self, date_time_text: str) -> Dict[str, str]:
         """Parse date and time text to separate date and time fields"""
-        try:
-            # Remove <br> tags and clean up
-            clean_text = re.sub(r'<br\s*/?>', ' ', date_time_text)
-            clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-            
-            # Look for date pattern
-            date_match = re.search(r'([A-Z][a-z]+ \d{1,2}, \d{4})', clean_text)
-            date_str = date_match.group(1) if date_match else ""
-            
-            # Look for time pattern
-            time_match = re.search(r'(\d{1,2}:\d{2}\s*[ap]m(?:\s*-\s*\d{1,2}:\d{2}\s*[ap]m)?)', clean_text)
-            time_str = time_match.group(1) if time_match else ""
-            
-            # Parse date to YYYY-MM-DD format
-            parsed_date = ""
-            if date_str:
-                try:
-                    parsed_date = datetime.strptime(date_str, '%B %d, %Y').strftime('%Y-%m-%d')
-                except:
-                    try:
-                        parsed_date = datetime.strptime(date_str, '%b %d, %Y').strftime('%Y-%m-%d')
-                    except:
-                        parsed_date = ""
-            
-            return {
-                'date': parsed_date,
-                'time': time_str
-            }
-            
-        except Exception as e:
-            print(f"      ⚠️  Error parsing date/time: {e}")
-            return {'date': '', 'time': ''}
+        when = normalize(date_time_text)
+        return {
+            'date': when.date if when else '',
+            'time': when.clock_range().lower() if when else ''
+        }
     
     def _extract_tags(self, title: str, description: str, series: str) -> List[str]:
         """Extract relevant tags"""
-        text = (title + ' ' + description + ' ' + series).lower()
-        tags = []
-        
-        economics_tags = [
-            'economics', 'economic', 'seminar', 'colloquium', 'workshop', 'lecture',
-            'econometrics', 'microeconomic', 'macroeconomic', 'international trade',
-            'development economics', 'behavioral economics', 'experimental economics',
-            'finance', 'industrial organization', 'applied econometrics', 'political economy'
-        ]
-        
-        for tag in economics_tags:
-            if tag in text:
-                tags.append(tag)
-        
-        return tags
+        return VOCABULARY.extract_tags(title, description, series)
     
     def _deduplicate_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate events"""
@@ -327,6 +298,12 @@ class EconomicsCloudScraperNew:
         
         print(f"💾 Saved {len(events)} Economics events to {filename}")
 
+
+def parse_economics_listing(content: bytes, page: int) -> Tuple[List[Dict[str, Any]], bool]:
+    """Picklable entry point for PARSE_STAGE"""
+    return EconomicsCloudScraperNew().parse_listing_page(content, page)
+
+
 if __name__ == "__main__":
     scraper = EconomicsCloudScraperNew()
     events = scraper.scrape_economics_events()
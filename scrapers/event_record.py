@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Compact record for one scraped event.
+
+Scrapers used to build a fresh 23-key dict per event and two
+datetime.now().isoformat() calls. Event stores the same fields in __slots__,
+interns the few values that repeat across thousands of events (department,
+meta_category, event_type, source_name) and stamps created_at/updated_at from a
+per-second cached timestamp. topics/departments/tags are always lists of the
+event's own, so event['tags'].append(...) works as it did on the dicts.
+
+Event keeps the dict read/write API the combiner and scrapers already use
+(event['title'], event.get('tags'), event.update(...)), so dict events from
+scrapers not yet converted mix freely with Event records. Keys outside
+FIELDS go to extra. Pass json_default as json.dump(default=...) to write
+Events directly; the output is the same JSON the dicts produced.
+"""
+import sys
+import time
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# In the order they are written to the combined JSON
+FIELDS: Tuple[str, ...] = (
+    'id', 'title', 'description', 'start_date', 'end_date', 'time', 'location',
+    'event_type', 'department', 'meta_category', 'source_url', 'source_name',
+    'speaker', 'audience', 'topics', 'departments', 'tags', 'series',
+    'speaker_affiliation', 'speaker_url', 'image_url', 'created_at', 'updated_at',
+)
+_FIELD_SET = frozenset(FIELDS)
+_LIST_FIELDS = ('topics', 'departments', 'tags')
+_INTERNED_FIELDS = ('event_type', 'department', 'meta_category', 'source_name')
+_row = attrgetter(*FIELDS)
+
+_stamp: Tuple[int, str] = (0, '')
+
+
+def now_iso() -> str:
+    """datetime.now().isoformat() to the second, formatted once per second"""
+    global _stamp
+    second = int(time.time())
+    if _stamp[0] != second:
+        _stamp = (second, datetime.fromtimestamp(second).isoformat())
+    return _stamp[1]
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _list(value: Optional[Iterable[str]]) -> List[str]:
+    """Own list for a list field; lists passed in are kept, not copied"""
+    if value is None:
+        return []
+    return value if type(value) is list else list(value)
+
+
+class Event:
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, id: str = '', title: str = '', description: str = '', start_date: str = '',
+                 end_date: Optional[str] = None, time: str = '', location: str = 'Princeton University',
+                 event_type: str = 'Event', department: str = '', meta_category: str = '',
+                 source_url: str = '', source_name: str = '', speaker: str = '', audience: str = '',
+                 topics: Optional[Iterable[str]] = None, departments: Optional[Iterable[str]] = None,
+                 tags: Optional[Iterable[str]] = None,
+                 series: str = '', speaker_affiliation: str = '', speaker_url: str = '', image_url: str = '',
+                 created_at: Optional[str] = None, updated_at: Optional[str] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.start_date = start_date
+        self.end_date = end_date
+        self.time = time
+        self.location = location
+        self.event_type = _intern(event_type)
+        self.department = _intern(department)
+        self.meta_category = _intern(meta_category)
+        self.source_url = source_url
+        self.source_name = _intern(source_name)
+        self.speaker = speaker
+        self.audience = audience
+        self.topics = _list(topics)
+        self.departments = _list(departments)
+        self.tags = _list(tags)
+        self.series = series
+        self.speaker_affiliation = speaker_affiliation
+        self.speaker_url = speaker_url
+        self.image_url = image_url
+        self.created_at = created_at or now_iso()
+        self.updated_at = updated_at or self.created_at
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Event':
+        """Event from a scraper / cache / snapshot dict; unknown keys go to extra"""
+        known = {key: value for key, value in data.items() if key in _FIELD_SET}
+        extra = {key: value for key, value in data.items() if key not in _FIELD_SET}
+        return cls(**known, extra=extra or None)
+
+    def to_json(self) -> Dict[str, Any]:
+        """Dict for json.dump; shares the list fields with the event"""
+        data = dict(zip(FIELDS, _row(self)))
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the event, as the scrapers used to return it"""
+        data = self.to_json()
+        for key in _LIST_FIELDS:
+            data[key] = list(data[key])
+        return data
+
+    # --- dict compatibility ---
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key in _LIST_FIELDS:
+            setattr(self, key, _list(value))
+        elif key in _FIELD_SET:
+            setattr(self, key, _intern(value) if key in _INTERNED_FIELDS else value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in _FIELD_SET or bool(self.extra and key in self.extra)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, other: Dict[str, Any]):
+        for key, value in other.items():
+            self[key] = value
+
+    def keys(self) -> List[str]:
+        return list(FIELDS) + list(self.extra or ())
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return iter(self.to_dict().items())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Event):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Compact pickles for PARSE_STAGE worker processes
+        return _restore, (_row(self), self.extra)
+
+    def __repr__(self):
+        return f"Event({self.id!r}, {self.title!r}, {self.start_date!r})"
+
+
+def _restore(row: Tuple[Any, ...], extra: Optional[Dict[str, Any]]) -> Event:
+    event = Event.__new__(Event)
+    for key, value in zip(FIELDS, row):
+        setattr(event, key, value)
+    event.extra = extra
+    # Unpickled strings are fresh copies
+    for key in _INTERNED_FIELDS:
+        setattr(event, key, _intern(getattr(event, key)))
+    return event
+
+
+def as_event(event: Union[Event, Dict[str, Any]]) -> Event:
+    return event if isinstance(event, Event) else Event.from_dict(event)
+
+
+def json_default(obj: Any) -> Any:
+    """json.dump(default=...) hook that writes Events as their dict"""
+    if isinstance(obj, Event):
+        return obj.to_json()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Run-wide event date window.
+
+The combiner's --since/--until set RUN_WINDOW for the duration of a run
+(in the run's context, see RunWindow).
+Feed scrapers read it when they are constructed and push it down to their
+parsers, which reject out-of-window events from the start date alone,
+before decoding any other field. The window is a plain NamedTuple so it can
+be passed to PARSE_STAGE parse functions running in other processes.
+"""
+import contextvars
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import NamedTuple, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+PRINCETON_TZ = ZoneInfo('America/New_York')
+
+
+class EventWindow(NamedTuple):
+    """Inclusive range of event start dates; None leaves that side open"""
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+    @classmethod
+    def parse(cls, since: Optional[str] = None, until: Optional[str] = None,
+              today: Optional[date] = None) -> 'EventWindow':
+        """
+        Build a window from CLI values: an ISO date (2025-09-01) or a day
+        offset from today (-30, +365).
+        """
+        today = today or date.today()
+
+        def bound(value: Optional[str]) -> Optional[date]:
+            if not value:
+                return None
+            if value.lstrip('+-').isdigit():
+                return today + timedelta(days=int(value))
+            return date.fromisoformat(value)
+
+        window = cls(bound(since), bound(until))
+        if window.start and window.end and window.start > window.end:
+            raise ValueError(f"Empty event window: {window.start} is after {window.end}")
+        return window
+
+    def contains(self, value: Union[date, datetime]) -> bool:
+        """value is a DTSTART: aware datetimes are compared by their Princeton date"""
+        if isinstance(value, datetime):
+            if value.tzinfo:
+                value = value.astimezone(PRINCETON_TZ)
+            value = value.date()
+        if self.start and value < self.start:
+            return False
+        return not (self.end and value > self.end)
+
+    def contains_iso(self, text: str) -> bool:
+        """Same check on an ISO 'YYYY-MM-DD...' string; undated events are kept"""
+        day = text[:10]
+        if len(day) < 10:
+            return True
+        if self.start and day < self.start.isoformat():
+            return False
+        return not (self.end and day > self.end.isoformat())
+
+    def key(self) -> str:
+        """Cache key suffix, so results parsed under one window are not reused for another"""
+        return f"window={self.start or ''}..{self.end or ''}"
+
+    def __str__(self):
+        return f"{self.start or 'any'} to {self.end or 'any'}"
+
+
+class RunWindow:
+    """
+    The window for the current combiner run (None means unbounded).
+
+    Held in a contextvars.ContextVar, like http_cache's PayloadRecorder, so
+    concurrent runs in one process do not see each other's window. Worker
+    threads only see it if they are started through
+    contextvars.copy_context().run(...).
+    """
+
+    def __init__(self):
+        self._window: contextvars.ContextVar = contextvars.ContextVar('run_window', default=None)
+
+    @contextmanager
+    def using(self, window: Optional[EventWindow]):
+        token = self._window.set(window)
+        try:
+            yield window
+        finally:
+            self._window.reset(token)
+
+    def get(self) -> Optional[EventWindow]:
+        return self._window.get()
+
+
+# Shared by all scrapers in the process
+RUN_WINDOW = RunWindow()
+
+
+def cache_variant(window: Optional[EventWindow]) -> str:
+    return window.key() if window else ''
+
+
+def calendar_range(window: Optional[EventWindow], year: int) -> Tuple[str, str]:
+    """
+    start/end query values for a FullCalendar calendar.json feed: this year
+    through the end of next year, narrowed to the window where it is bounded.
+    """
+    start = f'{year}-01-01T00:00:00'
+    end = f'{year + 1}-12-31T23:59:59'
+    if window and window.start:
+        start = f'{window.start.isoformat()}T00:00:00'
+    if window and window.end:
+        end = f'{window.end.isoformat()}T23:59:59'
+    return start, end
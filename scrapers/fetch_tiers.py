@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Tiered fetching with a per-domain capability cache.
+
+A Princeton department site can usually be read several ways, from cheap to
+expensive:
+
+  ics             /feeds/events/ical.ics
+  calendar_json   the FullCalendar /feeds/events/calendar.json feed
+  html            the events listing through a cloudscraper session
+  browser         the listing rendered in Playwright
+
+The tiers do not return the same events: the feeds carry no speaker or
+tags and cut descriptions short, which only the HTML tier's detail pages
+fill in (TIER_FIELDS). A target that needs those fields lists them in
+FetchTarget.fields, and tiers that cannot fill them are not used for it,
+however cheap; the browser tier stays as the last resort either way.
+
+FETCH_TIERS remembers, per domain, the cheapest tier that worked
+(DomainCapabilities, on disk with a TTL). A run starts at that tier and only
+moves to a more expensive one when it fails; a tier that answers with no
+events is not a failure once it is known to work. Domains with no fresh
+capability are probed cheapest first, and the browser tier is only probed
+when every cheaper tier failed outright. Once the TTL runs out the domain is
+probed again, so a site that gains a feed is moved back down. Tiers that
+failed outright are remembered for the longer FAILED_TIER_TTL and skipped by
+those probes, so a browser-only site does not retry its feeds and listing
+every week.
+"""
+import asyncio
+import contextvars
+import json
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+from http_cache import CACHE_DIR
+
+ICS_TIER = 'ics'
+CALENDAR_JSON_TIER = 'calendar_json'
+HTML_TIER = 'html'
+BROWSER_TIER = 'browser'
+
+# Cheapest first
+TIERS = (ICS_TIER, CALENDAR_JSON_TIER, HTML_TIER, BROWSER_TIER)
+
+# Event fields only some tiers fill ('description' meaning the full text)
+DETAIL_FIELDS = ('speaker', 'description', 'tags')
+TIER_FIELDS: Dict[str, Tuple[str, ...]] = {
+    ICS_TIER: (),
+    CALENDAR_JSON_TIER: (),
+    HTML_TIER: DETAIL_FIELDS,
+    BROWSER_TIER: (),
+}
+
+CAPABILITIES_PATH = os.path.join(CACHE_DIR, 'fetch_tiers.json')
+CAPABILITY_TTL = timedelta(days=7)
+# How long a tier that failed outright is skipped when the domain is probed
+FAILED_TIER_TTL = timedelta(days=30)
+
+
+class FetchTarget(NamedTuple):
+    """A department site the resolver can fetch"""
+    name: str
+    base_url: str
+    events_url: str
+    meta_category: str
+    tiers: Tuple[str, ...] = TIERS
+    # calendar.json params (uuid, et, ei) for sites whose feed needs them
+    calendar_params: Optional[Dict[str, str]] = None
+    # DETAIL_FIELDS the events need; tiers that cannot fill them are skipped
+    fields: Tuple[str, ...] = ()
+
+    @property
+    def domain(self) -> str:
+        return urlparse(self.base_url).netloc
+
+    @property
+    def usable_tiers(self) -> Tuple[str, ...]:
+        """tiers that fill every field in fields, plus the browser tier as a last resort"""
+        return tuple(tier for tier in self.tiers
+                     if tier == BROWSER_TIER or set(self.fields) <= set(TIER_FIELDS.get(tier, ())))
+
+
+class TierResult(NamedTuple):
+    target: FetchTarget
+    # Tier the events came from; None when every tier failed
+    tier: Optional[str]
+    # None when the target still needs the browser tier (scrape(browser=False))
+    events: Optional[List[Dict[str, Any]]]
+    failed: Tuple[str, ...] = ()
+
+
+class DomainCapabilities:
+    """
+    On-disk map of domain -> cheapest working tier and when it was probed,
+    plus when each tier that failed for the domain last failed
+    """
+
+    def __init__(self, path: str = CAPABILITIES_PATH, failed_ttl: timedelta = FAILED_TIER_TTL):
+        self.path = path
+        self.failed_ttl = failed_ttl
+        self.domains: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.domains = json.load(f).get('domains', {})
+        except (OSError, ValueError):
+            return
+
+    def tier(self, domain: str, ttl: timedelta, now: Optional[datetime] = None) -> Optional[str]:
+        """Cached tier for domain, or None when unknown or older than ttl"""
+        entry = self.domains.get(domain)
+        if not entry:
+            return None
+        try:
+            probed_at = datetime.fromisoformat(entry['probed_at'])
+        except (KeyError, ValueError):
+            return None
+        if (now or datetime.now()) - probed_at > ttl:
+            return None
+        return entry.get('tier')
+
+    def failed(self, domain: str, now: Optional[datetime] = None) -> Dict[str, str]:
+        """Tiers that failed for domain within failed_ttl -> when they failed"""
+        failures = self.domains.get(domain, {}).get('failed')
+        if not isinstance(failures, dict):
+            # Entries written before failure times were kept
+            return {}
+        cutoff = ((now or datetime.now()) - self.failed_ttl).isoformat()
+        return {tier: failed_at for tier, failed_at in failures.items() if failed_at >= cutoff}
+
+    def record(self, domain: str, tier: str, failed: Tuple[str, ...] = (), probed: bool = True):
+        """
+        Remember tier for domain. probed=False (an escalation from a cached
+        tier) keeps the original probe time, so the TTL still brings the
+        domain back to a full probe.
+        """
+        with self._lock:
+            previous = self.domains.get(domain, {})
+            self.domains[domain] = {
+                'tier': tier,
+                'probed_at': datetime.now().isoformat() if probed or 'probed_at' not in previous
+                else previous['probed_at'],
+                'failed': self._failures(domain, failed, tier),
+            }
+            self._save()
+
+    def forget(self, domain: str, failed: Tuple[str, ...] = ()):
+        """Drop domain's tier, so it is probed again; failed tiers are still remembered"""
+        with self._lock:
+            if domain not in self.domains:
+                return
+            failures = self._failures(domain, failed)
+            if failures:
+                self.domains[domain] = {'failed': failures}
+            else:
+                del self.domains[domain]
+            self._save()
+
+    def _failures(self, domain: str, failed: Tuple[str, ...], working: Optional[str] = None) -> Dict[str, str]:
+        # Recent failures carry over with their time, so they still expire;
+        # a tier that just worked is dropped
+        failures = self.failed(domain)
+        now = datetime.now().isoformat()
+        failures.update((tier, failures.get(tier, now)) for tier in failed)
+        failures.pop(working, None)
+        return failures
+
+    def _save(self):
+        data = {'saved_at': datetime.now().isoformat(), 'domains': self.domains}
+        tmp_path = f'{self.path}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f'  WARNING: could not write fetch tier cache {self.path}: {e}')
+
+
+class Tier(NamedTuple):
+    """
+    How to read a site one way. fetch() downloads the raw payload and
+    parse() turns it into events; either raises when the tier does not work.
+    """
+    fetch: Callable[[FetchTarget], Any]
+    parse: Callable[[FetchTarget, Any], List[Dict[str, Any]]]
+
+
+class TierPayload(NamedTuple):
+    """TieredFetcher.fetch() result, to hand to TieredFetcher.parse()"""
+    target: FetchTarget
+    # Tier the raw payload came from; None when result is already set
+    tier: Optional[str]
+    raw: Any
+    browser: bool = True
+    # Set when the target had to be probed, which parses as it goes
+    result: Optional[TierResult] = None
+
+
+# --- Tiers; scraper modules are imported on use, as in sources.py ---
+
+def _ics_scraper(target: FetchTarget):
+    from universal_ics_scraper import UniversalICSScraper
+    return UniversalICSScraper(target.name, target.domain, target.meta_category)
+
+
+def _calendar_feed(target: FetchTarget):
+    from calendar_feed import CalendarFeed
+    return CalendarFeed(target.name, target.domain, target.meta_category, target.calendar_params)
+
+
+def _drupal_scraper(target: FetchTarget):
+    from universal_drupal_cloudscraper import UniversalDrupalCloudScraper
+    return UniversalDrupalCloudScraper(target.name, target.base_url, target.events_url, target.meta_category)
+
+
+def fetch_browser(target: FetchTarget) -> List[Dict[str, Any]]:
+    from browser_scraper import LEAN, BrowserDrupalScraper, BrowserScraper
+
+    async def render():
+        async with BrowserScraper(lean=LEAN) as browser:
+            scraper = BrowserDrupalScraper(target.name, target.base_url, target.events_url, target.meta_category)
+            return await scraper.scrape_events(max_pages=3, browser=browser)
+
+    return asyncio.run(render())
+
+
+TIER_FETCHERS: Dict[str, Tier] = {
+    ICS_TIER: Tier(lambda target: _ics_scraper(target).fetch_feed(),
+                   lambda target, raw: _ics_scraper(target).parse_fetched(raw)),
+    CALENDAR_JSON_TIER: Tier(lambda target: _calendar_feed(target).fetch_feed(),
+                             lambda target, raw: _calendar_feed(target).parse_fetched(raw)),
+    HTML_TIER: Tier(lambda target: _drupal_scraper(target).fetch_pages(max_pages=10, fetch_details=True),
+                    lambda target, raw: _drupal_scraper(target).parse_fetched(raw)),
+    # The render extracts events as it goes
+    BROWSER_TIER: Tier(fetch_browser, lambda target, events: events),
+}
+
+
+class TieredFetcher:
+    """Fetch targets through the cheapest tier known to work for their domain"""
+
+    def __init__(self, capabilities: Optional[DomainCapabilities] = None, ttl: timedelta = CAPABILITY_TTL,
+                 fetchers: Optional[Dict[str, Tier]] = None):
+        self.capabilities = capabilities if capabilities is not None else DomainCapabilities()
+        self.ttl = ttl
+        self.fetchers = dict(fetchers or TIER_FETCHERS)
+
+    def scrape(self, target: FetchTarget, browser: bool = True) -> TierResult:
+        """
+        Events for target, from its cached tier or the first tier that works.
+
+        With browser=False a target that needs the browser tier comes back
+        with events=None, so the caller can render all such targets in one
+        shared browser and report back with record().
+        """
+        tiers = target.usable_tiers
+        cached = self.capabilities.tier(target.domain, self.ttl)
+        if cached not in tiers:
+            return self._probe(target, tiers, browser)
+        return self._resolve(target, tiers[tiers.index(cached):], [], False, browser)
+
+    def fetch(self, target: FetchTarget, browser: bool = True) -> TierPayload:
+        """
+        scrape() split in two for callers that may not need to parse: the raw
+        payload of the cached tier, for parse(). A target without a fresh
+        cached tier is probed, and a cached tier whose fetch fails escalates;
+        both parse as they go, since they need the events to pick a tier.
+        """
+        tiers = target.usable_tiers
+        cached = self.capabilities.tier(target.domain, self.ttl)
+        if cached not in tiers or cached == BROWSER_TIER:
+            return TierPayload(target, None, None, browser, self.scrape(target, browser))
+        try:
+            return TierPayload(target, cached, self.fetchers[cached].fetch(target), browser)
+        except Exception as e:
+            print(f'  {target.name}: {cached} tier failed ({e})')
+            rest = tiers[tiers.index(cached) + 1:]
+            return TierPayload(target, None, None, browser, self._resolve(target, rest, [cached], False, browser))
+
+    def parse(self, payload: TierPayload) -> TierResult:
+        """Events of a fetch() result; a parse failure escalates to the next tier"""
+        if payload.result is not None:
+            return payload.result
+        target, tier = payload.target, payload.tier
+        try:
+            events = self.fetchers[tier].parse(target, payload.raw)
+        except Exception as e:
+            print(f'  {target.name}: {tier} tier failed ({e})')
+            tiers = target.usable_tiers
+            rest = tiers[tiers.index(tier) + 1:]
+            return self._resolve(target, rest, [tier], False, payload.browser)
+        self.capabilities.record(target.domain, tier, probed=False)
+        print(f'  {target.name}: {len(events)} events via {tier}')
+        return TierResult(target, tier, events)
+
+    def _probe(self, target: FetchTarget, tiers: Tuple[str, ...], browser: bool) -> TierResult:
+        """Resolve from the cheapest tier, skipping tiers that failed recently"""
+        recent = self.capabilities.failed(target.domain)
+        skipped = [tier for tier in tiers if tier in recent and tier != BROWSER_TIER]
+        if skipped:
+            print(f'  {target.name}: skipping {", ".join(skipped)} (failed recently)')
+        return self._resolve(target, tuple(t for t in tiers if t not in skipped), skipped, True, browser)
+
+    def _resolve(self, target: FetchTarget, tiers: Tuple[str, ...], failed: List[str], probing: bool,
+                 browser: bool) -> TierResult:
+        """Fetch and parse through tiers in order until one works"""
+        domain = target.domain
+        # First tier that worked but found no events, while probing
+        empty: Optional[str] = None
+
+        for tier in tiers:
+            if tier == BROWSER_TIER:
+                if empty is not None:
+                    # A cheaper tier works, the site just has no events
+                    break
+                if not browser:
+                    self.capabilities.record(domain, BROWSER_TIER, tuple(failed), probed=probing)
+                    return TierResult(target, BROWSER_TIER, None, tuple(failed))
+            try:
+                fetcher = self.fetchers[tier]
+                events = fetcher.parse(target, fetcher.fetch(target))
+            except Exception as e:
+                print(f'  {target.name}: {tier} tier failed ({e})')
+                failed.append(tier)
+                continue
+            if events or not probing:
+                self.capabilities.record(domain, tier, tuple(failed), probed=probing)
+                print(f'  {target.name}: {len(events)} events via {tier}')
+                return TierResult(target, tier, events, tuple(failed))
+            if empty is None:
+                empty = tier
+
+        if empty is not None:
+            self.capabilities.record(domain, empty, tuple(failed), probed=probing)
+            return TierResult(target, empty, [], tuple(failed))
+        # Nothing worked; probe again next run
+        self.capabilities.forget(domain, tuple(failed))
+        print(f'  {target.name}: every tier failed ({", ".join(failed)})')
+        return TierResult(target, None, [], tuple(failed))
+
+    def record(self, result: TierResult, events: List[Dict[str, Any]]) -> TierResult:
+        """
+        Outcome of a deferred browser-tier fetch. A render with no events
+        counts as a failure, so the domain is probed again next run.
+        """
+        if events:
+            self.capabilities.record(result.target.domain, BROWSER_TIER, result.failed, probed=False)
+            return result._replace(events=events)
+        self.capabilities.forget(result.target.domain, result.failed)
+        return result._replace(tier=None, events=[], failed=result.failed + (BROWSER_TIER,))
+
+
+# Shared by all sources in the process
+FETCH_TIERS = TieredFetcher()
+
+
+def scrape_targets(targets: List[FetchTarget], max_workers: int = 8, headless: bool = True,
+                   fetcher: Optional[TieredFetcher] = None) -> List[TierResult]:
+    """
+    Resolve many targets at once. The cheap tiers run on a thread pool; the
+    targets that end up needing the browser are rendered together in one
+    shared browser afterwards. Results come back in target order.
+    """
+    fetcher = fetcher or FETCH_TIERS
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Copy the context per task so payload recorders see the worker fetches
+        futures = [pool.submit(contextvars.copy_context().run, fetcher.scrape, target, False) for target in targets]
+        results = [future.result() for future in futures]
+
+    deferred = [i for i, result in enumerate(results) if result.events is None]
+    if deferred:
+        from browser_scraper import scrape_browser_departments_timed
+        departments = [results[i].target[:4] for i in deferred]
+        try:
+            rendered = asyncio.run(scrape_browser_departments_timed(headless=headless, departments=departments))
+        except Exception as e:
+            print(f'  browser tier failed ({e})')
+            rendered = [(name, [], 0.0) for name, *_ in departments]
+        for i, (_, events, _) in zip(deferred, rendered):
+            results[i] = fetcher.record(results[i], events)
+
+    tiers = Counter(result.tier or 'failed' for result in results)
+    print('  fetch tiers: ' + ', '.join(f'{tier} {tiers[tier]}' for tier in TIERS + ('failed',) if tiers[tier]))
+    return results
@@ -1,17 +1,68 @@
 #!/usr/bin/env python3
-import requests
 import json
 from datetime import datetime
 import re
-from typing import List, Dict, Any
-import pytz
+from typing import List, Dict, Any, Optional
+from event_record import Event, json_default
+from event_window import EventWindow, RUN_WINDOW
+from calendar_feed import CalendarFeed, FeedFetch
+from keyword_classifier import Vocabulary
+from date_normalizer import parse_iso
+from department_catalog import DEPARTMENT_CATALOG
+
+# Event types by priority, then tags in the order they are reported
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'),
+        ('seminar', 'Seminar'),
+        ('workshop', 'Workshop'),
+        ('talk', 'Talk'),
+        ('lecture', 'Lecture'),
+        ('conference', 'Conference'),
+        ('panel', 'Panel'),
+        ('discussion', 'Discussion'),
+        ('symposium', 'Symposium'),
+        ('meeting', 'Meeting'),
+        ('exam', 'Exam'),
+        ('office hours', 'Office Hours'),
+        ('lab', 'Lab Session'),
+        ('tutorial', 'Tutorial'),
+        ('recitation', 'Recitation'),
+        ('field trip', 'Field Trip'),
+        ('research', 'Research Presentation'),
+    ],
+    tags=[
+        # Department-specific
+        'geosciences', 'geology', 'geological', 'geophysics', 'geophysical', 'geochemistry',
+        'geochemical', 'paleontology', 'paleontological', 'seismology', 'seismological',
+        'volcanology', 'volcanological', 'mineralogy', 'mineralogical', 'petrology', 'petrological',
+        'sedimentology', 'sedimentological', 'stratigraphy', 'stratigraphic', 'tectonics',
+        'tectonic', 'climate', 'climatic', 'environmental', 'atmospheric', 'oceanography',
+        'oceanographic', 'hydrology', 'hydrological', 'geomorphology', 'geomorphological',
+        'earth science', 'earth sciences', 'planetary science', 'planetary sciences',
+        # General
+        'princeton', 'university', 'academic', 'event', 'colloquium', 'seminar',
+    ],
+)
+
+
+FEED_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
+    'Accept': '*/*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://geosciences.princeton.edu/',
+    'Cache-Control': 'no-cache',
+    'Pragma': 'no-cache'
+}
+
 
 class GeosciencesJSONScraper:
-    def __init__(self):
+    def __init__(self, window: Optional[EventWindow] = None):
         self.base_url = "https://geosciences.princeton.edu"
         self.json_url = "https://geosciences.princeton.edu/feeds/events/calendar.json"
         self.department_name = "Geosciences"
-        self.meta_category = "sciences_engineering"
+        self.meta_category = DEPARTMENT_CATALOG.meta_category(self.department_name)
+        self.window = window if window is not None else RUN_WINDOW.get()
         
     def scrape_geosciences_events(self) -> List[Dict[str, Any]]:
         """Scrape events from the Geosciences department using their JSON calendar feed"""
@@ -19,82 +70,39 @@ class GeosciencesJSONScraper:
         print("=" * 60)
         
         try:
-            print(f"🔍 Fetching JSON feed from: {self.json_url}")
-            
-            # Set up parameters for the JSON request
-            current_year = datetime.now().year
-            params = {
-                'uuid': '6b2dd1c5-55dc-4047-a69a-c478e57244ce',
-                'et': 'node',
-                'ei': '2816',
-                'start': f'{current_year}-01-01T00:00:00',
-                'end': f'{current_year + 1}-12-31T23:59:59',
-                'timeZone': 'America/New_York'
-            }
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
-                'Accept': '*/*',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Referer': 'https://geosciences.princeton.edu/',
-                'Cache-Control': 'no-cache',
-                'Pragma': 'no-cache'
-            }
-            
-            response = requests.get(self.json_url, params=params, headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            # Parse the JSON content
-            data = response.json()
-            
-            all_events = []
-            
-            # Extract events from the JSON response
-            if isinstance(data, list):
-                for event_data in data:
-                    event = self._extract_event_from_json(event_data)
-                    if event and event.get('title'):
-                        all_events.append(event)
-            elif isinstance(data, dict) and 'events' in data:
-                for event_data in data['events']:
-                    event = self._extract_event_from_json(event_data)
-                    if event and event.get('title'):
-                        all_events.append(event)
-            
-            # Remove duplicates and sort by date
-            unique_events = self._deduplicate_events(all_events)
-            unique_events.sort(key=lambda x: x.get('start_date', ''))
-            
-            print(f"🎯 Total events found: {len(unique_events)}")
-            return unique_events
-            
+            return self.parse_fetched(self.fetch_feed())
         except Exception as e:
             print(f"❌ Error scraping Geosciences events: {e}")
             return []
+
+    def _feed(self) -> CalendarFeed:
+        return CalendarFeed(self.department_name, 'geosciences.princeton.edu', self.meta_category,
+                            window=self.window, parse_item=self._extract_event_from_json, headers=FEED_HEADERS)
+
+    def fetch_feed(self) -> FeedFetch:
+        """Past months from the cache, the rest in one conditional GET, not yet parsed (calendar_feed)"""
+        print(f"🔍 Fetching JSON feed from: {self.json_url}")
+        return self._feed().fetch_feed()
+
+    def parse_fetched(self, fetched: FeedFetch) -> List[Dict[str, Any]]:
+        """Events of a fetch_feed() result, deduplicated and sorted by date"""
+        all_events = self._feed().parse_fetched(fetched)
+
+        # Remove duplicates and sort by date
+        unique_events = self._deduplicate_events(all_events)
+        unique_events.sort(key=lambda x: x.get('start_date', ''))
+
+        print(f"🎯 Total events found: {len(unique_events)}")
+        return unique_events
     
-    def _extract_event_from_json(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_event_from_json(self, event_data: Dict[str, Any]) -> Event:
         """Extract event information from JSON data"""
-        event = {
-            'id': '',
-            'title': '',
-            'description': '',
-            'start_date': '',
-            'end_date': None,
-            'time': '',
-            'location': 'Princeton University',
-            'event_type': 'Event',
-            'department': self.department_name,
-            'meta_category': self.meta_category,
-            'source_url': f"{self.base_url}/events",
-            'source_name': f'{self.department_name} Department Events',
-            'speaker': '',
-            'audience': '',
-            'topics': [],
-            'departments': [],
-            'tags': [],
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
-        }
+        event = Event(
+            department=self.department_name,
+            meta_category=self.meta_category,
+            source_url=f"{self.base_url}/events",
+            source_name=f'{self.department_name} Department Events',
+        )
         
         # Extract title
         if event_data.get('title'):
@@ -140,112 +148,25 @@ class GeosciencesJSONScraper:
         if event_data.get('speaker'):
             event['speaker'] = str(event_data['speaker'])
         
-        if event_data.get('category'):
-            event['tags'].append(str(event_data['category']))
+        tags = [str(event_data['category'])] if event_data.get('category') else []
         
         # Determine event type and tags
         event['event_type'] = self._determine_event_type(event['title'])
-        event['tags'].extend(self._extract_tags(event['title'], event.get('description', '')))
+        event['tags'] = tags + self._extract_tags(event['title'], event.get('description', ''))
         
         return event
     
     def _parse_datetime(self, datetime_str: str) -> datetime:
-        """Parse datetime string from Geosciences JSON feed"""
-        try:
-            # Handle timezone-aware datetime strings (e.g., "2025-01-01T00:00:00-05:00")
-            if 'T' in datetime_str and ('+' in datetime_str or datetime_str.count('-') > 2):
-                # Parse ISO format with timezone
-                dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-                # Convert to Princeton timezone
-                princeton_tz = pytz.timezone('America/New_York')
-                dt = dt.astimezone(princeton_tz)
-                return dt
-            
-            # Try different datetime formats for non-timezone strings
-            formats = [
-                '%Y-%m-%dT%H:%M:%S',
-                '%Y-%m-%dT%H:%M:%S.%f',
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%d'
-            ]
-            
-            for fmt in formats:
-                try:
-                    dt = datetime.strptime(datetime_str, fmt)
-                    # Convert to Princeton timezone if it's timezone-aware
-                    if dt.tzinfo:
-                        princeton_tz = pytz.timezone('America/New_York')
-                        dt = dt.astimezone(princeton_tz)
-                    return dt
-                except ValueError:
-                    continue
-            
-            return None
-        except Exception:
-            return None
+        """Parse datetime string from Geosciences JSON feed into Princeton time"""
+        return parse_iso(datetime_str)
     
     def _determine_event_type(self, title: str) -> str:
         """Determine event type based on title"""
-        if not title:
-            return 'Event'
-            
-        title_lower = title.lower()
-        
-        type_keywords = {
-            'colloquium': 'Colloquium',
-            'seminar': 'Seminar',
-            'workshop': 'Workshop',
-            'talk': 'Talk',
-            'lecture': 'Lecture',
-            'conference': 'Conference',
-            'panel': 'Panel',
-            'discussion': 'Discussion',
-            'symposium': 'Symposium',
-            'meeting': 'Meeting',
-            'exam': 'Exam',
-            'office hours': 'Office Hours',
-            'lab': 'Lab Session',
-            'tutorial': 'Tutorial',
-            'recitation': 'Recitation',
-            'field trip': 'Field Trip',
-            'research': 'Research Presentation'
-        }
-        
-        for keyword, event_type in type_keywords.items():
-            if keyword in title_lower:
-                return event_type
-        
-        return 'Event'
+        return VOCABULARY.event_type(title or '')
     
     def _extract_tags(self, title: str, description: str) -> List[str]:
         """Extract relevant tags from title and description"""
-        text = (title + ' ' + (description or '')).lower()
-        tags = []
-        
-        # Add department-specific tags
-        geosciences_tags = [
-            'geosciences', 'geology', 'geological', 'geophysics', 'geophysical',
-            'geochemistry', 'geochemical', 'paleontology', 'paleontological',
-            'seismology', 'seismological', 'volcanology', 'volcanological',
-            'mineralogy', 'mineralogical', 'petrology', 'petrological',
-            'sedimentology', 'sedimentological', 'stratigraphy', 'stratigraphic',
-            'tectonics', 'tectonic', 'climate', 'climatic', 'environmental',
-            'atmospheric', 'oceanography', 'oceanographic', 'hydrology',
-            'hydrological', 'geomorphology', 'geomorphological', 'earth science',
-            'earth sciences', 'planetary science', 'planetary sciences'
-        ]
-        
-        for tag in geosciences_tags:
-            if tag in text:
-                tags.append(tag)
-        
-        # Add general tags
-        general_tags = ['princeton', 'university', 'academic', 'event', 'colloquium', 'seminar']
-        for tag in general_tags:
-            if tag in text and tag not in tags:
-                tags.append(tag)
-        
-        return tags
+        return VOCABULARY.extract_tags(title, description or '')
     
     def _deduplicate_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate events"""
@@ -278,7 +199,7 @@ class GeosciencesJSONScraper:
         }
         
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+            json.dump(output, f, indent=2, ensure_ascii=False, default=json_default)
         
         print(f"💾 Saved {len(events)} events to {filename}")
 
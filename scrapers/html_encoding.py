@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Character encoding of fetched HTML pages, without whole-body sniffing.
+
+requests' apparent_encoding runs charset detection over the entire body of
+every page. resolve_encoding() trusts, in order:
+
+  bom       a UTF-8/UTF-16 byte order mark
+  header    the charset of the Content-Type header
+  meta      <meta charset> or <meta http-equiv="Content-Type"> within the
+            first META_SCAN_BYTES
+  sniff     only when none of those is present: UTF-8 if the first
+            SNIFF_BYTES decode as UTF-8, else charset_normalizer's guess for
+            that prefix (windows-1252 when it is not installed)
+
+Labels are normalized to Python codec names, with latin-1 and ascii read as
+windows-1252 as browsers do.
+"""
+import codecs
+import re
+from typing import Optional
+
+try:
+    from charset_normalizer import from_bytes
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+META_SCAN_BYTES = 4096
+SNIFF_BYTES = 64 * 1024
+FALLBACK_ENCODING = 'cp1252'
+
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([^"\';\s]+)', re.I)
+# Matches both <meta charset="utf-8"> and <meta http-equiv=... content="text/html; charset=utf-8">
+_META_CHARSET_RE = re.compile(rb'<meta\b[^>]*?charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:\-]+)', re.I)
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def normalize_label(label: Optional[str]) -> Optional[str]:
+    """Python codec name for a charset label, or None when it is unknown"""
+    if not label:
+        return None
+    try:
+        name = codecs.lookup(label.strip().strip('"\'')).name
+    except LookupError:
+        return None
+    return 'cp1252' if name in ('iso8859-1', 'latin-1', 'ascii') else name
+
+
+def header_encoding(content_type: Optional[str]) -> Optional[str]:
+    match = _HEADER_CHARSET_RE.search(content_type or '')
+    return normalize_label(match.group(1)) if match else None
+
+
+def meta_encoding(content: bytes) -> Optional[str]:
+    match = _META_CHARSET_RE.search(content, 0, META_SCAN_BYTES)
+    if not match:
+        return None
+    encoding = normalize_label(match.group(1).decode('ascii'))
+    # A byte-oriented page cannot declare itself UTF-16 from inside the markup
+    return 'utf-8' if encoding and encoding.startswith('utf-16') else encoding
+
+
+def sniff_encoding(content: bytes) -> str:
+    prefix = content[:SNIFF_BYTES]
+    try:
+        prefix.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # The prefix may end inside a multi-byte character
+        if e.reason == 'unexpected end of data' and len(content) > SNIFF_BYTES:
+            return 'utf-8'
+    if CHARSET_NORMALIZER_AVAILABLE:
+        best = from_bytes(prefix).best()
+        if best is not None:
+            return normalize_label(best.encoding) or FALLBACK_ENCODING
+    return FALLBACK_ENCODING
+
+
+def resolve_encoding(content: bytes, content_type: Optional[str] = None) -> str:
+    """Encoding to decode an HTML body with (BOM, header, meta, then a bounded sniff)"""
+    for bom, bom_encoding in _BOMS:
+        if content.startswith(bom):
+            return bom_encoding
+    return header_encoding(content_type) or meta_encoding(content) or sniff_encoding(content)
+
+
+def response_encoding(response) -> str:
+    """resolve_encoding() for a requests response"""
+    return resolve_encoding(response.content, response.headers.get('Content-Type'))
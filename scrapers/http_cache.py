@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Persistent conditional-GET cache for calendar feed fetches.
+
+Each cached request stores the ETag / Last-Modified validators and a hash of
+the last response body together with the events parsed from it. The next
+fetch sends If-None-Match / If-Modified-Since; on a 304 (or a 200 whose body
+hashes the same) the scraper gets its previously parsed events back and can
+skip both the download and the parse.
+
+Every fetch also reports its payload hash to the active PayloadRecorder, which
+the combiner uses to tell whether a source's upstream changed. A request made
+through FeedCache is recorded by FeedCache alone, under payload_key(url,
+params), with the same digest whether it came back 304 or 200.
+"""
+import contextvars
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlencode
+
+from event_record import json_default
+
+CACHE_DIR = os.environ.get(
+    'SCRAPER_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'),
+)
+
+_current_recorder: contextvars.ContextVar = contextvars.ContextVar('payload_recorder', default=None)
+# Set while FeedCache issues a request; it records that payload itself
+_cache_request: contextvars.ContextVar = contextvars.ContextVar('cache_request', default=False)
+
+
+def active_recorder() -> Optional['PayloadRecorder']:
+    return _current_recorder.get()
+
+
+def recorded_by_cache() -> bool:
+    """True inside a FeedCache request, whose payload the cache records"""
+    return _cache_request.get()
+
+
+def record_payload(url: str, digest: str):
+    """Record a fetched payload against the active recorder, if any"""
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        recorder.add(url, digest)
+
+
+def payload_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Stable key for a request: the URL plus its sorted query params"""
+    if not params:
+        return url
+    return f'{url}?{urlencode(sorted(params.items()))}'
+
+
+class PayloadRecorder:
+    """
+    Collects the payload digests fetched while it is active.
+
+    Worker threads only see the recorder if they are started through
+    contextvars.copy_context().run(...).
+    """
+
+    def __init__(self):
+        self.digests: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current_recorder.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _current_recorder.reset(self._token)
+
+    def add(self, url: str, digest: str):
+        with self._lock:
+            self.digests[url] = digest
+
+    def fingerprint(self) -> str:
+        """Hash of all recorded payloads, or '' when nothing was recorded"""
+        if not self.digests:
+            return ''
+        joined = '\n'.join(f'{url} {digest}' for url, digest in sorted(self.digests.items()))
+        return hashlib.sha256(joined.encode('utf-8')).hexdigest()
+
+
+class FeedCache:
+    """
+    On-disk validator cache, one JSON file per (url, params) key.
+
+    variant separates entries whose parsed events depend on more than the
+    request, e.g. the run's event window (event_window.cache_variant()).
+    """
+
+    def __init__(self, cache_dir: str = os.path.join(CACHE_DIR, 'http')):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None, variant: str = '') -> str:
+        key = payload_key(url, params)
+        return f'{key}#{variant}' if variant else key
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'{digest}.json')
+
+    def load(self, url: str, params: Optional[Dict[str, Any]] = None,
+             variant: str = '') -> Optional[Dict[str, Any]]:
+        """Return the stored entry for a request, or None. Nothing is recorded."""
+        try:
+            with open(self._path(self.key(url, params, variant)), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def conditional_get(self, getter, url: str, params: Optional[Dict[str, Any]] = None,
+                        headers: Optional[Dict[str, str]] = None, variant: str = '',
+                        **kwargs) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """
+        Issue a GET through getter (requests.get or a session's .get) with the
+        stored validators attached.
+
+        Returns (response, entry). entry is the cached entry when the upstream
+        content is unchanged, otherwise None and the caller should parse the
+        response and call store().
+        """
+        entry = self.load(url, params, variant)
+        headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        token = _cache_request.set(True)
+        try:
+            response = getter(url, params=params, headers=headers, **kwargs)
+        finally:
+            _cache_request.reset(token)
+
+        # The variant is left out: a 304 and a byte-identical 200 record the same entry
+        if response.status_code == 304 and entry is not None:
+            record_payload(payload_key(url, params), entry.get('sha256', ''))
+            return response, entry
+        digest = self.content_hash(response.content)
+        record_payload(payload_key(url, params), digest)
+        if entry is None:
+            return response, None
+        if response.status_code == 200 and entry.get('sha256') == digest:
+            # Server ignores validators but the body is byte-identical
+            self._write(url, params, response, entry['events'], entry.get('meta'), variant)
+            return response, entry
+        return response, None
+
+    def store(self, url: str, response, events: List[Dict[str, Any]],
+              params: Optional[Dict[str, Any]] = None, meta: Optional[Dict[str, Any]] = None,
+              variant: str = ''):
+        """Remember the validators and parsed events for a 200 response"""
+        if response.status_code != 200:
+            return
+        self._write(url, params, response, events, meta, variant)
+
+    def store_events(self, url: str, events: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None,
+                     variant: str = ''):
+        """
+        Remember events for a request that was not itself made (e.g. one
+        month cut out of a longer range). The entry has no validators, so
+        conditional_get() treats it as a miss; load() returns it as usual.
+        """
+        self._write(url, params, None, events, None, variant)
+
+    def _write(self, url: str, params: Optional[Dict[str, Any]], response,
+               events: List[Dict[str, Any]], meta: Optional[Dict[str, Any]], variant: str = ''):
+        key = self.key(url, params, variant)
+        entry = {
+            'key': key,
+            'etag': response.headers.get('ETag', '') if response is not None else '',
+            'last_modified': response.headers.get('Last-Modified', '') if response is not None else '',
+            'sha256': self.content_hash(response.content) if response is not None else '',
+            'stored_at': datetime.now().isoformat(),
+            'meta': meta or {},
+            'events': events,
+        }
+        path = self._path(key)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            with self._lock:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False, default=json_default)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f'  WARNING: could not write HTTP cache entry for {key}: {e}')
+
+    @staticmethod
+    def content_hash(body: bytes) -> str:
+        return hashlib.sha256(body or b'').hexdigest()
+
+
+# Shared by all feed scrapers
+FEED_CACHE = FeedCache()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Shared connection-pooled HTTP client for all scrapers.
+
+One keep-alive session per (host, kind) is shared by every scraper, so
+scrapers that hit the same *.princeton.edu host reuse its TLS connections.
+Requests get a default timeout, retries with jittered exponential backoff on
+connection errors and 429/5xx responses, gzip/brotli decoding (brotli when
+the brotli package is installed) and per-request timing metrics.
+
+Scrapers use create_session() as a drop-in for their old
+cloudscraper.create_scraper() / requests.Session() objects, or HTTP_CLIENT.get()
+in place of requests.get().
+"""
+import hashlib
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Any, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import active_recorder, payload_key, recorded_by_cache
+
+try:
+    import brotli  # noqa: F401 - urllib3 decodes 'br' bodies when this is importable
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# Headers the HTML scrapers send to look like a desktop Chrome
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'DNT': '1',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Per-request timings kept for inspection; the per-host totals cover every request
+RECENT_METRICS = 1000
+
+
+def _cloudscraper():
+    """
+    The cloudscraper module, or None when it is not installed. Imported on
+    the first browser=True session only, so runs that never need the
+    Cloudflare bypass (e.g. --only ics) do not pay for loading it.
+    """
+    try:
+        import cloudscraper
+    except ImportError:
+        return None
+    return cloudscraper
+
+
+class RequestTiming(NamedTuple):
+    url: str
+    host: str
+    status: int
+    seconds: float
+    bytes: int
+    attempts: int
+
+
+class HTTPClient:
+    """Pooled sessions per host with retries, timeouts and timing metrics"""
+
+    def __init__(self, retries: int = 3, backoff: float = 0.5, max_backoff: float = 10.0,
+                 timeout: float = 30, pool_maxsize: int = 10, recent_metrics: int = RECENT_METRICS):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        # The latest recent_metrics requests; older ones only count in the totals
+        self.metrics: Deque[RequestTiming] = deque(maxlen=recent_metrics)
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._sessions: Dict[Tuple[str, bool], requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session(self, url: str, browser: bool = False) -> requests.Session:
+        """Return the shared session for url's host, creating it on first use"""
+        key = (urlparse(url).netloc, browser)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._new_session(browser)
+                self._sessions[key] = session
+            return session
+
+    def _new_session(self, browser: bool) -> requests.Session:
+        cloudscraper = _cloudscraper() if browser else None
+        if cloudscraper is not None:
+            session = cloudscraper.create_scraper(
+                browser={'browser': 'chrome', 'platform': 'windows', 'desktop': True},
+                delay=10
+            )
+        else:
+            session = requests.Session()
+        for prefix in ('https://', 'http://'):
+            session.mount(prefix, self._pooled_adapter(session.get_adapter(prefix), cloudscraper))
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        return session
+
+    def _pooled_adapter(self, mounted: HTTPAdapter, cloudscraper=None) -> HTTPAdapter:
+        """
+        A replacement for the mounted adapter with this client's pool size.
+        cloudscraper's CipherSuiteAdapter is replaced by another one on the
+        same SSL context, so the TLS setup that gets the HTML scrapers past
+        Cloudflare is kept.
+        """
+        pool = dict(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=mounted.max_retries)
+        if cloudscraper is not None and isinstance(mounted, cloudscraper.CipherSuiteAdapter):
+            return cloudscraper.CipherSuiteAdapter(
+                cipherSuite=mounted.cipherSuite, ecdhCurve=mounted.ecdhCurve,
+                server_hostname=mounted.server_hostname, source_address=mounted.source_address,
+                ssl_context=mounted.ssl_context, **pool
+            )
+        return HTTPAdapter(**pool)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+            browser: bool = False, **kwargs) -> requests.Response:
+        """
+        GET url through the pooled session for its host.
+
+        Connection errors, timeouts and 429/5xx responses are retried up to
+        self.retries times. The last response is returned as-is, so callers
+        still call raise_for_status().
+        """
+        session = self.session(url, browser)
+        headers = dict(headers or {})
+        # Only advertise encodings we can actually decode
+        headers['Accept-Encoding'] = ACCEPT_ENCODING
+        timeout = timeout or self.timeout
+
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = session.get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt > self.retries:
+                    self._record(url, 0, start, 0, attempt)
+                    raise
+                self._sleep_before_retry(attempt, None)
+                continue
+            if response.status_code in RETRY_STATUSES and attempt <= self.retries:
+                self._sleep_before_retry(attempt, response.headers.get('Retry-After'))
+                continue
+            break
+
+        self._record(url, response.status_code, start, len(response.content), attempt)
+        recorder = active_recorder()
+        if recorder is not None and response.status_code == 200 and not recorded_by_cache():
+            recorder.add(payload_key(url, params), hashlib.sha256(response.content).hexdigest())
+        return response
+
+    def _sleep_before_retry(self, attempt: int, retry_after: Optional[str]):
+        if retry_after and retry_after.isdigit():
+            delay = min(float(retry_after), self.max_backoff)
+        else:
+            # Full jitter: uniform over the exponential backoff window
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+        time.sleep(delay)
+
+    def _record(self, url: str, status: int, start: float, size: int, attempts: int):
+        timing = RequestTiming(url, urlparse(url).netloc, status, time.perf_counter() - start, size, attempts)
+        with self._lock:
+            self.metrics.append(timing)
+            stats = self._totals.setdefault(timing.host, {'requests': 0, 'bytes': 0, 'seconds': 0.0, 'retries': 0})
+            stats['requests'] += 1
+            stats['bytes'] += timing.bytes
+            stats['seconds'] += timing.seconds
+            stats['retries'] += timing.attempts - 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Requests, bytes, seconds and retries per host, over every request made"""
+        with self._lock:
+            return {host: dict(stats) for host, stats in self._totals.items()}
+
+    def print_summary(self):
+        per_host = self.summary()
+        if not per_host:
+            return
+        print("\nHTTP REQUESTS BY HOST:")
+        for host, stats in sorted(per_host.items(), key=lambda x: x[1]['seconds'], reverse=True):
+            print(f"  - {host}: {stats['requests']} requests, {stats['bytes'] / 1024:.0f} KiB, "
+                  f"{stats['seconds']:.1f}s, {stats['retries']} retries")
+
+
+class ScraperSession:
+    """
+    Per-scraper view of the shared client with its own default headers.
+    Supports the .headers / .get() subset of requests.Session the scrapers use.
+    """
+
+    def __init__(self, client: HTTPClient, headers: Optional[Dict[str, str]] = None, browser: bool = False):
+        self.client = client
+        self.headers = dict(headers or {})
+        self.browser = browser
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        merged = dict(self.headers)
+        merged.update(headers or {})
+        return self.client.get(url, params=params, headers=merged, browser=self.browser, **kwargs)
+
+
+# Shared by every scraper in the process
+HTTP_CLIENT = HTTPClient()
+
+
+def create_session(headers: Optional[Dict[str, str]] = None, browser: bool = False) -> ScraperSession:
+    """
+    Session backed by the shared pools. browser=True uses cloudscraper sessions
+    (Cloudflare JS challenge support) when cloudscraper is installed.
+    """
+    return ScraperSession(HTTP_CLIENT, headers, browser)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Streaming VEVENT reader for the ICS scrapers.
+
+icalendar's Calendar.from_ical() builds the whole component tree (VTIMEZONE,
+VALARM and every property, each decoded into a typed value) before the
+scrapers walk it for VEVENTs and read a handful of properties. This reader
+jumps from one BEGIN:VEVENT to the next, unfolds only those blocks, skips
+nested components and decodes only the properties in PROPERTIES.
+
+Events come out as plain dicts keyed by lower-case property name:
+    summary, location, url, uid, description   str (text unescaped)
+    dtstart, dtend                             date or datetime
+    categories                                 list of str
+Absent or undecodable properties are left out; when a property repeats,
+the first occurrence wins (CATEGORIES values accumulate).
+
+DTSTART/DTEND with a TZID come back timezone-aware (zoneinfo), UTC values
+with a trailing Z in UTC, floating times naive. Feeds that use a TZID
+zoneinfo does not know (Windows zone names, VTIMEZONE-only ids) are read
+with icalendar instead, projected to the same dicts.
+
+With a window (event_window.EventWindow) only the DTSTART line of each
+VEVENT is decoded until the event is known to start inside the window;
+events without a DTSTART are kept.
+"""
+import re
+from datetime import date, datetime, timezone
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from event_window import EventWindow
+
+PROPERTIES = frozenset({'SUMMARY', 'DTSTART', 'DTEND', 'LOCATION', 'URL', 'UID', 'DESCRIPTION', 'CATEGORIES'})
+
+_DATE_PROPERTIES = frozenset({'DTSTART', 'DTEND'})
+
+_TEXT_ESCAPES = {'\\n': '\n', '\\N': '\n', '\\,': ',', '\\;': ';', '\\\\': '\\'}
+_TEXT_ESCAPE_RE = re.compile(r'\\[nN,;\\]')
+# Commas not preceded by a backslash separate CATEGORIES values
+_LIST_SEPARATOR_RE = re.compile(r'(?<!\\),')
+_TZID_RE = re.compile(r'TZID[=:]"?([^";:\r\n]+)')
+_DTSTART_RE = re.compile(r'^DTSTART[;:].*(?:\r?\n[ \t].*)*', re.MULTILINE)
+
+_ZONES: Dict[str, Optional[ZoneInfo]] = {}
+
+
+def _zone(tzid: str) -> Optional[ZoneInfo]:
+    if tzid not in _ZONES:
+        try:
+            _ZONES[tzid] = ZoneInfo(tzid)
+        except (ZoneInfoNotFoundError, ValueError):
+            _ZONES[tzid] = None
+    return _ZONES[tzid]
+
+
+def _unescape(value: str) -> str:
+    if '\\' not in value:
+        return value
+    return _TEXT_ESCAPE_RE.sub(lambda m: _TEXT_ESCAPES[m.group(0)], value)
+
+
+def _split_line(line: str) -> Tuple[str, str, str]:
+    """'NAME;PARAMS:VALUE' -> (NAME, PARAMS, VALUE); colons inside quoted params are skipped"""
+    colon = line.find(':')
+    semicolon = line.find(';')
+    if semicolon == -1 or semicolon > colon:
+        return line[:colon].upper(), '', line[colon + 1:]
+    in_quotes = False
+    for index in range(semicolon + 1, len(line)):
+        char = line[index]
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ':' and not in_quotes:
+            return line[:semicolon].upper(), line[semicolon + 1:index], line[index + 1:]
+    return line[:semicolon].upper(), line[semicolon + 1:], ''
+
+
+def _params(raw: str) -> Dict[str, str]:
+    params = {}
+    for part in raw.split(';'):
+        name, _, value = part.partition('=')
+        params[name.strip().upper()] = value.strip().strip('"')
+    return params
+
+
+def _parse_date(raw_params: str, value: str):
+    """DTSTART/DTEND value -> date / datetime, or None when malformed"""
+    value = value.strip()
+    params = _params(raw_params) if raw_params else {}
+    try:
+        if len(value) == 8 or params.get('VALUE', '').upper() == 'DATE':
+            return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+        if len(value) < 15 or value[8] != 'T':
+            return None
+        parsed = datetime(int(value[:4]), int(value[4:6]), int(value[6:8]),
+                          int(value[9:11]), int(value[11:13]), int(value[13:15]))
+    except ValueError:
+        return None
+    if value.endswith('Z'):
+        return parsed.replace(tzinfo=timezone.utc)
+    tzid = params.get('TZID')
+    if tzid:
+        zone = _zone(tzid)
+        # feed_timezones_known() routes feeds with unknown zones to icalendar
+        return parsed.replace(tzinfo=zone) if zone else None
+    return parsed
+
+
+def feed_timezones_known(text: str) -> bool:
+    """True when zoneinfo resolves every TZID the feed mentions"""
+    return all(_zone(tzid.strip()) for tzid in set(_TZID_RE.findall(text)))
+
+
+def _unfold(block: str) -> List[str]:
+    # RFC 5545 folding: a line break followed by one space or tab
+    if '\n ' in block or '\n\t' in block:
+        block = re.sub(r'\r?\n[ \t]', '', block)
+    return block.split('\n')
+
+
+def _read_block(block: str, properties: frozenset) -> Dict[str, Any]:
+    """Decode the wanted properties of one VEVENT block (between its BEGIN/END lines)"""
+    event: Dict[str, Any] = {}
+    nested = 0
+    for line in _unfold(block):
+        if line.endswith('\r'):
+            line = line[:-1]
+        if not line:
+            continue
+        # Nested components (VALARM) are skipped whole
+        if line.startswith('BEGIN:'):
+            nested += 1
+            continue
+        if line.startswith('END:'):
+            nested -= 1
+            continue
+        if nested:
+            continue
+        name_end = line.find(';')
+        colon = line.find(':')
+        if name_end == -1 or name_end > colon:
+            name_end = colon
+        if name_end <= 0 or line[:name_end].upper() not in properties:
+            continue
+
+        name, raw_params, value = _split_line(line)
+        key = name.lower()
+        if name == 'CATEGORIES':
+            event.setdefault(key, []).extend(
+                _unescape(part.strip()) for part in _LIST_SEPARATOR_RE.split(value) if part.strip()
+            )
+        elif key in event:
+            continue
+        elif name in _DATE_PROPERTIES:
+            parsed = _parse_date(raw_params, value)
+            if parsed is not None:
+                event[key] = parsed
+        else:
+            event[key] = _unescape(value)
+    return event
+
+
+def _block_in_window(block: str, window: EventWindow) -> bool:
+    """Decode just the block's DTSTART and check it against window"""
+    match = _DTSTART_RE.search(block)
+    if not match:
+        return True
+    line = re.sub(r'\r?\n[ \t]', '', match.group(0)).rstrip('\r')
+    _, raw_params, value = _split_line(line)
+    dtstart = _parse_date(raw_params, value)
+    return dtstart is None or window.contains(dtstart)
+
+
+def _stream_vevents(text: str, properties: frozenset,
+                    window: Optional[EventWindow] = None) -> Iterator[Dict[str, Any]]:
+    begin, end = 'BEGIN:VEVENT', '\nEND:VEVENT'
+    position = 0 if text.startswith(begin) else text.find('\n' + begin)
+    while position != -1:
+        start = text.find('\n', position + 1)
+        if start == -1:
+            return
+        stop = text.find(end, start)
+        if stop == -1:
+            stop = len(text)
+        block = text[start + 1:stop]
+        if window is None or _block_in_window(block, window):
+            yield _read_block(block, properties)
+        position = text.find('\n' + begin, stop)
+
+
+def project_component(component, properties: frozenset) -> Dict[str, Any]:
+    """icalendar VEVENT -> the same dict shape _stream_vevents() yields"""
+    event: Dict[str, Any] = {}
+    for name in properties:
+        value = component.get(name)
+        if value is None:
+            continue
+        if name == 'CATEGORIES':
+            values = value if isinstance(value, list) else [value]
+            event['categories'] = [str(cat) for item in values for cat in getattr(item, 'cats', [item])]
+            continue
+        if isinstance(value, list):
+            value = value[0]
+        if name in _DATE_PROPERTIES:
+            if hasattr(value, 'dt'):
+                event[name.lower()] = value.dt
+        else:
+            event[name.lower()] = str(value)
+    return event
+
+
+def iter_vevents(content: bytes, properties: frozenset = PROPERTIES,
+                 window: Optional[EventWindow] = None) -> Iterator[Dict[str, Any]]:
+    """Yield each VEVENT in an ICS body (starting inside window) as a dict of the wanted properties"""
+    text = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+    if feed_timezones_known(text):
+        yield from _stream_vevents(text, properties, window)
+        return
+    from icalendar import Calendar
+    for component in Calendar.from_ical(content).walk('VEVENT'):
+        event = project_component(component, properties)
+        if window is None or 'dtstart' not in event or window.contains(event['dtstart']):
+            yield event
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Keyword classifier shared by the scrapers' _determine_event_type / _extract_tags.
+
+Every scraper used to lowercase title + description, walk its event-type
+rules and then lowercase again for its tag lists. Each scraper now declares
+a Vocabulary (event-type rules in priority order, tags in output order).
+Vocabulary.classify() lowercases once and derives both the event type and
+the tags from that one string; classify_many() does a whole parsed feed at
+once, classifying each distinct text once (recurring series repeat theirs).
+
+Matching is plain substring tests, keeping the old semantics ('ai' still
+matches inside 'said'). A scraper applies one to three vocabularies of a few
+dozen keywords to an event, and for that CPython's substring search beats a
+single scan with a compiled multi-keyword automaton (see
+benchmarks/bench_classifier.py); the automaton only wins when all the
+vocabularies are applied to every text, which no scraper does.
+"""
+from typing import Container, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+
+class Classification(NamedTuple):
+    event_type: str
+    tags: List[str]
+
+
+class Vocabulary:
+    """
+    One scraper's keyword lists.
+
+    event_types     (keyword, event type) rules; the first rule whose keyword
+                    occurs wins, else default_type
+    tags            keywords reported as tags when they occur, in this order
+    """
+
+    def __init__(self, event_types: Sequence[Tuple[str, str]] = (), tags: Sequence[str] = (),
+                 default_type: str = 'Event'):
+        self.event_types = tuple((keyword.lower(), label) for keyword, label in event_types)
+        self.tags = tuple(dict.fromkeys(tag.lower() for tag in tags))
+        self.default_type = default_type
+        self.keywords = tuple(dict.fromkeys([keyword for keyword, _ in self.event_types] + list(self.tags)))
+
+    def type_of(self, found: Container[str]) -> str:
+        """Event type given the keywords found (or the lowercased text itself)"""
+        for keyword, label in self.event_types:
+            if keyword in found:
+                return label
+        return self.default_type
+
+    def tags_of(self, found: Container[str]) -> List[str]:
+        """Tags given the keywords found (or the lowercased text itself)"""
+        return [tag for tag in self.tags if tag in found] if found else []
+
+    def event_type(self, *texts: str) -> str:
+        """Event type of the texts joined with spaces"""
+        return self.type_of(' '.join(texts).lower())
+
+    def extract_tags(self, *texts: str) -> List[str]:
+        """Tags found in the texts joined with spaces"""
+        return self.tags_of(' '.join(texts).lower())
+
+    def classify(self, text: str) -> Classification:
+        """Event type and tags from one lowercasing of text"""
+        lowered = text.lower()
+        return Classification(self.type_of(lowered), self.tags_of(lowered))
+
+    def classify_many(self, texts: Iterable[str]) -> List[Classification]:
+        """classify() for a batch; repeated texts are classified once and share the result"""
+        results: Dict[str, Classification] = {}
+        out = []
+        for text in texts:
+            result = results.get(text)
+            if result is None:
+                result = results[text] = self.classify(text)
+            out.append(result)
+        return out
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Persistent delta-sync state for the Localist calendar (events.princeton.edu).
+
+The scraper's date range is split into week-long slices aligned to Mondays.
+For every slice the state remembers when it was last synced and which event
+ids it returned. For every event id it keeps a hash of the raw API payload,
+when the event was last seen, and the event parsed from that payload.
+
+An empty state is seeded from one ranged pull over the whole range, its
+events bucketed into slices by start date (seed()), so a cold sync costs
+what a full scrape does rather than a request per slice. After that a poll
+refetches only the slices that are due. Near-term slices, where events get
+added and edited, are due after a few minutes. Slices further out are due
+less often, and a slice that was never synced (the range moving forward) is
+always due. In a refetched slice, events whose payload hash is
+unchanged keep their stored parsed event. Slices that are not due are
+served from the state without a request.
+
+The academic group ids used by the group-sharded mode are cached here too,
+with a TTL, since the group list changes far less often than events.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from event_record import json_default
+from http_cache import CACHE_DIR
+
+SLICE_DAYS = 7
+
+# (slice starts within this many days of today, refetch after); first match wins
+REFRESH_POLICY = (
+    (14, timedelta(minutes=15)),
+    (60, timedelta(hours=1)),
+)
+# Slices further out, and slices already in the past
+DEFAULT_REFRESH = timedelta(hours=12)
+
+GROUPS_PATH = os.path.join(CACHE_DIR, 'localist', 'academic_groups.json')
+GROUPS_TTL = timedelta(days=7)
+
+Slice = Tuple[date, date]
+
+
+def date_slices(start: date, end: date, days: int = SLICE_DAYS) -> List[Slice]:
+    """
+    Inclusive (start, end) slices covering start..end. Boundaries fall on
+    Mondays so a slice keeps its key as the range moves forward day by day;
+    only the first and last slices are clipped.
+    """
+    slices = []
+    slice_start = start - timedelta(days=start.weekday())
+    while slice_start <= end:
+        slice_end = slice_start + timedelta(days=days - 1)
+        slices.append((max(slice_start, start), min(slice_end, end)))
+        slice_start = slice_end + timedelta(days=1)
+    return slices
+
+
+def slice_key(day: date) -> str:
+    """Monday of the slice containing day"""
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def payload_hash(raw: Dict[str, Any]) -> str:
+    """Hash of one raw Localist event object, independent of key order"""
+    body = json.dumps(raw, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def refresh_after(slice_: Slice, today: date) -> timedelta:
+    """How old a slice's last sync may get before it is fetched again"""
+    start, end = slice_
+    if end < today:
+        return DEFAULT_REFRESH
+    ahead = (start - today).days
+    for within_days, interval in REFRESH_POLICY:
+        if ahead < within_days:
+            return interval
+    return DEFAULT_REFRESH
+
+
+class LocalistSyncState:
+    """On-disk sync state, one JSON file per event window"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.slices: Dict[str, Dict[str, Any]] = {}
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.parsed = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def for_variant(cls, variant: str = '',
+                    cache_dir: str = os.path.join(CACHE_DIR, 'localist')) -> 'LocalistSyncState':
+        """State file for a cache variant (event_window.cache_variant())"""
+        name = 'sync_state'
+        if variant:
+            name += '-' + hashlib.sha1(variant.encode('utf-8')).hexdigest()[:12]
+        return cls(os.path.join(cache_dir, f'{name}.json'))
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.slices = data.get('slices', {})
+        self.events = data.get('events', {})
+
+    def save(self):
+        data = {'saved_at': datetime.now().isoformat(), 'slices': self.slices, 'events': self.events}
+        tmp_path = f'{self.path}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, default=json_default)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f'  WARNING: could not write Localist sync state {self.path}: {e}')
+
+    def due(self, slice_: Slice, now: datetime) -> bool:
+        """True when the slice was never synced, covers new days, or is older than its refresh interval"""
+        entry = self.slices.get(slice_key(slice_[0]))
+        if not entry or entry.get('start') != slice_[0].isoformat() or entry.get('end') != slice_[1].isoformat():
+            return True
+        try:
+            synced_at = datetime.fromisoformat(entry['synced_at'])
+        except (KeyError, ValueError):
+            return True
+        return now - synced_at >= refresh_after(slice_, now.date())
+
+    def update_slice(self, slice_: Slice, raw_events: Iterable[Dict[str, Any]],
+                     parse: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]], now: datetime):
+        """
+        Record a freshly fetched slice. Each raw event is parsed only if its
+        payload hash differs from the stored one.
+        """
+        seen_at = now.isoformat()
+        ids = []
+        with self._lock:
+            for raw in raw_events:
+                digest = payload_hash(raw)
+                event_id = str(raw.get('event', raw).get('id') or digest)
+                entry = self.events.get(event_id)
+                if entry is not None and entry.get('hash') == digest:
+                    self.reused += 1
+                else:
+                    entry = self.events[event_id] = {'hash': digest, 'event': parse(raw)}
+                    self.parsed += 1
+                entry['last_seen'] = seen_at
+                ids.append(event_id)
+            self.slices[slice_key(slice_[0])] = {
+                'start': slice_[0].isoformat(),
+                'end': slice_[1].isoformat(),
+                'synced_at': seen_at,
+                'ids': list(dict.fromkeys(ids)),
+            }
+
+    def seed(self, slices: List[Slice], raw_events: Iterable[Dict[str, Any]],
+             day_of: Callable[[Dict[str, Any]], Optional[date]],
+             parse: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]], now: datetime):
+        """
+        Record every slice from one pull over the whole range. Each raw event
+        goes to the slice of day_of(raw); events without a day, or outside
+        the range, go to the first or last slice.
+        """
+        if not slices:
+            return
+        buckets: Dict[str, List[Dict[str, Any]]] = {slice_key(start): [] for start, _ in slices}
+        first, last = slices[0], slices[-1]
+        for raw in raw_events:
+            day = day_of(raw)
+            if day is None or day < first[0]:
+                day = first[0]
+            elif day > last[1]:
+                day = last[1]
+            buckets[slice_key(day)].append(raw)
+        for slice_ in slices:
+            self.update_slice(slice_, buckets[slice_key(slice_[0])], parse, now)
+
+    def collect(self, slices: Iterable[Slice]) -> List[Dict[str, Any]]:
+        """Stored parsed events of the given slices, each event id once"""
+        seen = set()
+        events = []
+        for slice_ in slices:
+            entry = self.slices.get(slice_key(slice_[0]))
+            for event_id in (entry or {}).get('ids', ()):
+                if event_id in seen:
+                    continue
+                seen.add(event_id)
+                event = self.events.get(event_id, {}).get('event')
+                if event:
+                    events.append(event)
+        return events
+
+    def prune(self, slices: Iterable[Slice]):
+        """Forget slices outside the current range and events no kept slice references"""
+        keep = {slice_key(start) for start, _ in slices}
+        self.slices = {key: entry for key, entry in self.slices.items() if key in keep}
+        referenced = {event_id for entry in self.slices.values() for event_id in entry.get('ids', ())}
+        self.events = {event_id: entry for event_id, entry in self.events.items() if event_id in referenced}
+
+
+def load_groups(path: str = GROUPS_PATH, ttl: Optional[timedelta] = GROUPS_TTL) -> Optional[List[Dict[str, Any]]]:
+    """Cached group list, or None when missing or older than ttl (ttl=None accepts any age)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+        fetched_at = datetime.fromisoformat(entry['fetched_at'])
+    except (OSError, ValueError, KeyError):
+        return None
+    if ttl is not None and datetime.now() - fetched_at > ttl:
+        return None
+    return entry.get('groups')
+
+
+def store_groups(groups: List[Dict[str, Any]], path: str = GROUPS_PATH):
+    entry = {'fetched_at': datetime.now().isoformat(), 'groups': groups}
+    tmp_path = f'{path}.{threading.get_ident()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f'  WARNING: could not write Localist group cache {path}: {e}')
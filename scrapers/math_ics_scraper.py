@@ -1,18 +1,57 @@
 #!/usr/bin/env python3
-import requests
 import json
 from datetime import datetime
 import re
-from typing import List, Dict, Any
-from icalendar import Calendar
-import pytz
+from typing import List, Dict, Any, Optional
+from event_record import Event, json_default
+from event_window import EventWindow, RUN_WINDOW, cache_variant
+from http_client import HTTP_CLIENT
+from http_cache import FEED_CACHE
+from ics_stream import iter_vevents
+from parse_stage import PARSE_STAGE
+from keyword_classifier import Vocabulary
+from date_normalizer import to_local
+from department_catalog import DEPARTMENT_CATALOG
+
+# Event types by priority, then tags in the order they are reported
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'),
+        ('seminar', 'Seminar'),
+        ('workshop', 'Workshop'),
+        ('talk', 'Talk'),
+        ('lecture', 'Lecture'),
+        ('conference', 'Conference'),
+        ('panel', 'Panel'),
+        ('discussion', 'Discussion'),
+        ('symposium', 'Symposium'),
+        ('recital', 'Recital'),
+        ('concert', 'Concert'),
+        ('performance', 'Performance'),
+        ('meeting', 'Meeting'),
+        ('exam', 'Exam'),
+        ('office hours', 'Office Hours'),
+    ],
+    tags=[
+        # Department-specific
+        'mathematics', 'math', 'mathematical', 'algebra', 'analysis', 'geometry', 'topology',
+        'number theory', 'combinatorics', 'probability', 'statistics', 'differential equations',
+        'optimization', 'numerical analysis', 'applied math', 'pure math',
+        'theoretical computer science', 'mathematical physics',
+        # General
+        'princeton', 'university', 'academic', 'event', 'colloquium', 'seminar',
+    ],
+)
+
 
 class MathICSScraper:
-    def __init__(self):
+    def __init__(self, window: Optional[EventWindow] = None):
         self.base_url = "https://www.math.princeton.edu"
         self.ics_url = "https://www.math.princeton.edu/events-feed.ics"
         self.department_name = "Mathematics"
-        self.meta_category = "sciences_engineering"
+        self.meta_category = DEPARTMENT_CATALOG.meta_category(self.department_name)
+        self.feed_cache = FEED_CACHE
+        self.window = window if window is not None else RUN_WINDOW.get()
         
     def scrape_math_events(self) -> List[Dict[str, Any]]:
         """Scrape events from the Mathematics department using their ICS calendar feed"""
@@ -22,23 +61,15 @@ class MathICSScraper:
         try:
             print(f"🔍 Fetching ICS feed from: {self.ics_url}")
             
-            response = requests.get(self.ics_url, timeout=30)
+            response, cached = self.feed_cache.conditional_get(HTTP_CLIENT.get, self.ics_url, timeout=30,
+                                                               variant=cache_variant(self.window))
+            if cached is not None:
+                print(f"♻️  Feed unchanged, reusing {len(cached['events'])} cached events")
+                return cached['events']
             response.raise_for_status()
             
-            # Parse the ICS content
-            cal = Calendar.from_ical(response.content)
-            
-            all_events = []
-            
-            for component in cal.walk():
-                if component.name == "VEVENT":
-                    event = self._extract_event_from_ics(component)
-                    if event and event.get('title'):
-                        all_events.append(event)
-            
-            # Remove duplicates and sort by date
-            unique_events = self._deduplicate_events(all_events)
-            unique_events.sort(key=lambda x: x.get('start_date', ''))
+            unique_events = PARSE_STAGE.run(self.department_name, parse_math_feed, response.content, self.window)
+            self.feed_cache.store(self.ics_url, response, unique_events, variant=cache_variant(self.window))
             
             print(f"🎯 Total events found: {len(unique_events)}")
             return unique_events
@@ -47,29 +78,35 @@ class MathICSScraper:
             print(f"❌ Error scraping Mathematics events: {e}")
             return []
     
-    def _extract_event_from_ics(self, component) -> Dict[str, Any]:
-        """Extract event information from an ICS component"""
-        event = {
-            'id': '',
-            'title': '',
-            'description': '',
-            'start_date': '',
-            'end_date': None,
-            'time': '',
-            'location': 'Princeton University',
-            'event_type': 'Event',
-            'department': self.department_name,
-            'meta_category': self.meta_category,
-            'source_url': f"{self.base_url}/events",
-            'source_name': f'{self.department_name} Department Events',
-            'speaker': '',
-            'audience': '',
-            'topics': [],
-            'departments': [],
-            'tags': [],
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
-        }
+    def parse_feed(self, content: bytes) -> List[Dict[str, Any]]:
+        """Parse ICS feed content into sorted, deduplicated events"""
+        all_events = []
+
+        for component in iter_vevents(content, window=self.window):
+            event = self._extract_event_from_ics(component)
+            if event and event.get('title'):
+                all_events.append(event)
+
+        # One classification per distinct title / title + description
+        types = VOCABULARY.classify_many([event['title'] for event in all_events])
+        tags = VOCABULARY.classify_many([f"{event['title']} {event['description']}" for event in all_events])
+        for event, by_title, by_text in zip(all_events, types, tags):
+            event['event_type'] = by_title.event_type
+            event['tags'] = list(event['tags']) + by_text.tags
+
+        # Remove duplicates and sort by date
+        unique_events = self._deduplicate_events(all_events)
+        unique_events.sort(key=lambda x: x.get('start_date', ''))
+        return unique_events
+    
+    def _extract_event_from_ics(self, component: Dict[str, Any]) -> Event:
+        """Extract event information from a VEVENT dict (ics_stream.iter_vevents)"""
+        event = Event(
+            department=self.department_name,
+            meta_category=self.meta_category,
+            source_url=f"{self.base_url}/events",
+            source_name=f'{self.department_name} Department Events',
+        )
         
         # Extract title
         if component.get('summary'):
@@ -83,38 +120,30 @@ class MathICSScraper:
             event['description'] = description
         
         # Extract start date and time
-        if component.get('dtstart'):
-            dtstart = component.get('dtstart')
-            if hasattr(dtstart, 'dt'):
-                start_dt = dtstart.dt
-                if isinstance(start_dt, datetime):
-                    # Convert to Princeton timezone if it's timezone-aware
-                    if start_dt.tzinfo:
-                        princeton_tz = pytz.timezone('America/New_York')
-                        start_dt = start_dt.astimezone(princeton_tz)
-                    
-                    event['start_date'] = start_dt.strftime('%Y-%m-%d')
-                    event['time'] = start_dt.strftime('%I:%M %p')
-                else:
-                    event['start_date'] = start_dt.strftime('%Y-%m-%d')
+        start_dt = component.get('dtstart')
+        if start_dt:
+            if isinstance(start_dt, datetime):
+                # Convert to Princeton timezone if it's timezone-aware
+                start_dt = to_local(start_dt)
+                
+                event['start_date'] = start_dt.strftime('%Y-%m-%d')
+                event['time'] = start_dt.strftime('%I:%M %p')
+            else:
+                event['start_date'] = start_dt.strftime('%Y-%m-%d')
         
         # Extract end date and time
-        if component.get('dtend'):
-            dtend = component.get('dtend')
-            if hasattr(dtend, 'dt'):
-                end_dt = dtend.dt
-                if isinstance(end_dt, datetime):
-                    if end_dt.tzinfo:
-                        princeton_tz = pytz.timezone('America/New_York')
-                        end_dt = end_dt.astimezone(princeton_tz)
-                    
-                    event['end_date'] = end_dt.strftime('%Y-%m-%d')
-                    # If same day, add end time
-                    if event.get('start_date') == event['end_date']:
-                        if event.get('time'):
-                            event['time'] += f" - {end_dt.strftime('%I:%M %p')}"
-                else:
-                    event['end_date'] = end_dt.strftime('%Y-%m-%d')
+        end_dt = component.get('dtend')
+        if end_dt:
+            if isinstance(end_dt, datetime):
+                end_dt = to_local(end_dt)
+                
+                event['end_date'] = end_dt.strftime('%Y-%m-%d')
+                # If same day, add end time
+                if event.get('start_date') == event['end_date']:
+                    if event.get('time'):
+                        event['time'] += f" - {end_dt.strftime('%I:%M %p')}"
+            else:
+                event['end_date'] = end_dt.strftime('%Y-%m-%d')
         
         # Extract location
         if component.get('location'):
@@ -128,68 +157,9 @@ class MathICSScraper:
             if url and url.startswith('http'):
                 event['source_url'] = url
         
-        # Determine event type and tags
-        event['event_type'] = self._determine_event_type(event['title'])
-        event['tags'] = self._extract_tags(event['title'], event['description'])
-        
+        # Event type and tags are classified for the whole feed in parse_feed()
         return event
     
-    def _determine_event_type(self, title: str) -> str:
-        """Determine event type based on title"""
-        if not title:
-            return 'Event'
-            
-        title_lower = title.lower()
-        
-        type_keywords = {
-            'colloquium': 'Colloquium',
-            'seminar': 'Seminar',
-            'workshop': 'Workshop',
-            'talk': 'Talk',
-            'lecture': 'Lecture',
-            'conference': 'Conference',
-            'panel': 'Panel',
-            'discussion': 'Discussion',
-            'symposium': 'Symposium',
-            'recital': 'Recital',
-            'concert': 'Concert',
-            'performance': 'Performance',
-            'meeting': 'Meeting',
-            'exam': 'Exam',
-            'office hours': 'Office Hours'
-        }
-        
-        for keyword, event_type in type_keywords.items():
-            if keyword in title_lower:
-                return event_type
-        
-        return 'Event'
-    
-    def _extract_tags(self, title: str, description: str) -> List[str]:
-        """Extract relevant tags from title and description"""
-        text = (title + ' ' + (description or '')).lower()
-        tags = []
-        
-        # Add department-specific tags
-        math_tags = [
-            'mathematics', 'math', 'mathematical', 'algebra', 'analysis', 'geometry',
-            'topology', 'number theory', 'combinatorics', 'probability', 'statistics',
-            'differential equations', 'optimization', 'numerical analysis', 'applied math',
-            'pure math', 'theoretical computer science', 'mathematical physics'
-        ]
-        
-        for tag in math_tags:
-            if tag in text:
-                tags.append(tag)
-        
-        # Add general tags
-        general_tags = ['princeton', 'university', 'academic', 'event', 'colloquium', 'seminar']
-        for tag in general_tags:
-            if tag in text and tag not in tags:
-                tags.append(tag)
-        
-        return tags
-    
     def _deduplicate_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate events"""
         seen = set()
@@ -221,10 +191,16 @@ class MathICSScraper:
         }
         
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+            json.dump(output, f, indent=2, ensure_ascii=False, default=json_default)
         
         print(f"💾 Saved {len(events)} events to {filename}")
 
+
+def parse_math_feed(content: bytes, window: Optional[EventWindow] = None) -> List[Dict[str, Any]]:
+    """Picklable entry point for PARSE_STAGE"""
+    return MathICSScraper(window).parse_feed(content)
+
+
 if __name__ == "__main__":
     scraper = MathICSScraper()
     events = scraper.scrape_math_events()
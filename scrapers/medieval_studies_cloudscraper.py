@@ -1,31 +1,60 @@
 #!/usr/bin/env python3
-import cloudscraper
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime
 import re
 import time
 from typing import List, Dict, Any
+from http_client import create_session, BROWSER_HEADERS
+from detail_cache import DETAIL_CACHE
+from keyword_classifier import Vocabulary
+from date_normalizer import normalize
+from department_catalog import DEPARTMENT_CATALOG
+
+# Event types by priority, then tags in the order they are reported
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'),
+        ('seminar', 'Seminar'),
+        ('workshop', 'Workshop'),
+        ('talk', 'Talk'),
+        ('lecture', 'Lecture'),
+        ('conference', 'Conference'),
+        ('panel', 'Panel'),
+        ('discussion', 'Discussion'),
+        ('symposium', 'Symposium'),
+        ('meeting', 'Meeting'),
+        ('book club', 'Book Club'),
+        ('reception', 'Reception'),
+        ('welcome', 'Welcome Event'),
+        ('study group', 'Study Group'),
+        ('reading group', 'Reading Group'),
+    ],
+    tags=[
+        'medieval', 'medieval studies', 'csla', 'committee for the study of late antiquity',
+        'late antiquity', 'medieval book club', 'medieval studies book club', 'princeton',
+        'university', 'academic', 'event', 'humanities',
+    ],
+)
+
+# Tags read from the event page text
+CONTENT_VOCABULARY = Vocabulary(
+    tags=[
+        'medieval', 'medieval studies', 'late antiquity', 'csla', 'book club', 'reading group',
+        'study group', 'reception', 'welcome', 'faculty', 'students', 'graduate', 'undergraduate',
+        'research', 'scholarship', 'academic', 'humanities',
+    ],
+)
+
 
 class MedievalStudiesCloudScraper:
     def __init__(self):
-        self.scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'windows', 'desktop': True},
-            delay=10
-        )
-        self.scraper.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        self.scraper = create_session(BROWSER_HEADERS, browser=True)
         self.base_url = "https://medievalstudies.princeton.edu"
         self.events_url = "https://medievalstudies.princeton.edu/events"
         self.department_name = "Medieval Studies"
-        self.meta_category = "arts_humanities"
+        self.meta_category = DEPARTMENT_CATALOG.meta_category(self.department_name)
+        self.detail_cache = DETAIL_CACHE
         
     def scrape_medieval_studies_events(self) -> List[Dict[str, Any]]:
         """Scrape events from the Medieval Studies department using The Events Calendar"""
@@ -65,7 +94,7 @@ class MedievalStudiesCloudScraper:
                     if event and event.get('title'):
                         # Get additional details from individual event page
                         if event.get('source_url'):
-                            detailed_event = self._fetch_event_details(event['source_url'])
+                            detailed_event = self.detail_cache.lookup(event, lambda: self._fetch_event_details(event['source_url']))
                             if detailed_event:
                                 event.update(detailed_event)
                         
@@ -146,7 +175,7 @@ class MedievalStudiesCloudScraper:
                 # Also extract the display text
                 date_span = time_elem.find('span', class_='tribe-event-date-start')
                 if date_span:
-                    date_text = date_span.get_text(strip=True)
+                    date_text = date_span.get_text(' ', strip=True)
                     # Parse date text like "Tue, 9/9 · 4:30 pm"
                     parsed_date = self._parse_date_text(date_text)
                     if parsed_date:
@@ -181,30 +210,15 @@ class MedievalStudiesCloudScraper:
     
     def _parse_date_text(self, date_text: str) -> Dict[str, str]:
         """Parse date text like 'Tue, 9/9 · 4:30 pm'"""
-        try:
-            # Split by the bullet point
-            parts = date_text.split('·')
-            if len(parts) >= 2:
-                date_part = parts[0].strip()
-                time_part = parts[1].strip()
-                
-                # Parse date part (e.g., "Tue, 9/9")
-                date_match = re.search(r'(\d{1,2})/(\d{1,2})', date_part)
-                if date_match:
-                    month = date_match.group(1)
-                    day = date_match.group(2)
-                    # Assume current year
-                    current_year = datetime.now().year
-                    formatted_date = f"{current_year}-{month.zfill(2)}-{day.zfill(2)}"
-                    
-                    return {
-                        'date': formatted_date,
-                        'time': time_part
-                    }
-        except:
-            pass
+        # The listing leaves out the year; assume the current one
+        when = normalize(date_text, datetime.now().year)
+        if not when or when.all_day:
+            return None
         
-        return None
+        return {
+            'date': when.date,
+            'time': when.clock_range().lower()
+        }
     
     def _fetch_event_details(self, event_url: str) -> Dict[str, Any]:
         """Fetch detailed information from individual event page"""
@@ -258,76 +272,15 @@ class MedievalStudiesCloudScraper:
     
     def _determine_event_type(self, title: str) -> str:
         """Determine event type based on title"""
-        if not title:
-            return 'Event'
-            
-        title_lower = title.lower()
-        
-        type_keywords = {
-            'colloquium': 'Colloquium',
-            'seminar': 'Seminar',
-            'workshop': 'Workshop',
-            'talk': 'Talk',
-            'lecture': 'Lecture',
-            'conference': 'Conference',
-            'panel': 'Panel',
-            'discussion': 'Discussion',
-            'symposium': 'Symposium',
-            'meeting': 'Meeting',
-            'book club': 'Book Club',
-            'reception': 'Reception',
-            'welcome': 'Welcome Event',
-            'study group': 'Study Group',
-            'reading group': 'Reading Group'
-        }
-        
-        for keyword, event_type in type_keywords.items():
-            if keyword in title_lower:
-                return event_type
-        
-        return 'Event'
+        return VOCABULARY.event_type(title or '')
     
     def _extract_tags(self, title: str, sponsor: str) -> List[str]:
         """Extract relevant tags from title and sponsor"""
-        text = (title + ' ' + sponsor).lower()
-        tags = []
-        
-        # Add department-specific tags
-        medieval_tags = [
-            'medieval', 'medieval studies', 'csla', 'committee for the study of late antiquity',
-            'late antiquity', 'medieval book club', 'medieval studies book club',
-            'princeton', 'university', 'academic', 'event', 'humanities'
-        ]
-        
-        for tag in medieval_tags:
-            if tag in text and tag not in tags:
-                tags.append(tag)
-        
-        # Add general tags
-        general_tags = ['princeton', 'university', 'academic', 'event']
-        for tag in general_tags:
-            if tag in text and tag not in tags:
-                tags.append(tag)
-        
-        return tags
+        return VOCABULARY.extract_tags(title, sponsor)
     
     def _extract_content_tags(self, content_text: str) -> List[str]:
         """Extract additional tags from event content"""
-        tags = []
-        
-        # Look for specific content indicators
-        content_keywords = [
-            'medieval', 'medieval studies', 'late antiquity', 'csla',
-            'book club', 'reading group', 'study group', 'reception',
-            'welcome', 'faculty', 'students', 'graduate', 'undergraduate',
-            'research', 'scholarship', 'academic', 'humanities'
-        ]
-        
-        for keyword in content_keywords:
-            if keyword in content_text and keyword not in tags:
-                tags.append(keyword)
-        
-        return tags
+        return CONTENT_VOCABULARY.extract_tags(content_text)
     
     def _has_next_page(self, soup, current_page: int) -> bool:
         """Check if there's a next page"""
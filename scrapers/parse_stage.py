@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Parse stage shared by the HTML and ICS scrapers.
+
+Scrapers hand raw response bytes to PARSE_STAGE together with a module-level
+parse function. By default the function runs inline on the calling thread.
+In the combiner's --pipeline mode PARSE_STAGE is backed by a
+ProcessPoolExecutor, so BeautifulSoup / icalendar parsing spreads across
+cores and stops holding the GIL the fetch threads need.
+
+Parse functions and their arguments must be picklable: module-level
+functions taking plain data (bytes, str, dict), never scraper instances.
+"""
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def _timed_call(fn: Callable, args: Tuple) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def count_events(result: Any) -> int:
+    """
+    Events produced by a parse call: an event list or an (events, ...) tuple.
+    Detail-page dicts enrich events already counted, so they count as 0.
+    """
+    if isinstance(result, tuple):
+        result = result[0]
+    if isinstance(result, list):
+        return len(result)
+    return 0
+
+
+class ParseStage:
+    """Runs parse functions inline or on an executor, with per-label timing"""
+
+    def __init__(self):
+        self.executor: Optional[Executor] = None
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def using(self, executor: Executor):
+        """Route parse calls to executor for the duration of the block"""
+        previous = self.executor
+        self.executor = executor
+        try:
+            yield self
+        finally:
+            self.executor = previous
+
+    def submit(self, label: str, fn: Callable, *args) -> Future:
+        """Parse in the background; label groups the timing stats (usually the department)"""
+        future: Future = Future()
+        if self.executor is None:
+            try:
+                future.set_result(self._record(label, _timed_call(fn, args)))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        def done(inner: Future):
+            try:
+                future.set_result(self._record(label, inner.result()))
+            except Exception as e:
+                future.set_exception(e)
+
+        self.executor.submit(_timed_call, fn, args).add_done_callback(done)
+        return future
+
+    def run(self, label: str, fn: Callable, *args) -> Any:
+        """Parse and wait for the result"""
+        return self.submit(label, fn, *args).result()
+
+    def _record(self, label: str, timed: Tuple[Any, float]) -> Any:
+        result, seconds = timed
+        with self._lock:
+            stats = self.stats.setdefault(label, {'calls': 0, 'seconds': 0.0, 'events': 0})
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['events'] += count_events(result)
+        return result
+
+    def totals(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'calls': sum(s['calls'] for s in self.stats.values()),
+                'seconds': sum(s['seconds'] for s in self.stats.values()),
+                'events': sum(s['events'] for s in self.stats.values()),
+            }
+
+    def print_summary(self):
+        with self._lock:
+            stats = dict(self.stats)
+        if not stats:
+            return
+        print("\nPARSE STAGE:")
+        for label, s in sorted(stats.items(), key=lambda x: x[1]['seconds'], reverse=True):
+            rate = s['events'] / s['seconds'] if s['seconds'] else 0.0
+            print(f"  - {label}: {s['calls']} parses, {s['events']} events, "
+                  f"{s['seconds']:.2f}s, {rate:.0f} events/sec")
+
+
+# Shared by all scrapers in the process
+PARSE_STAGE = ParseStage()
@@ -1,112 +1,120 @@
 #!/usr/bin/env python3
-import cloudscraper
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime
 import re
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from event_record import Event, json_default
+from event_window import EventWindow, RUN_WINDOW
+from calendar_feed import CalendarFeed, FeedFetch
+from http_client import create_session, BROWSER_HEADERS
+from detail_cache import DETAIL_CACHE
+from parse_stage import PARSE_STAGE
+from keyword_classifier import Vocabulary
+from date_normalizer import clock, normalize, normalize_range
+from department_catalog import DEPARTMENT_CATALOG
+
+# Event types by priority, then tags in the order they are reported
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'),
+        ('seminar', 'Seminar'),
+        ('workshop', 'Workshop'),
+        ('talk', 'Talk'),
+        ('lecture', 'Lecture'),
+        ('conference', 'Conference'),
+        ('panel', 'Panel'),
+        ('discussion', 'Discussion'),
+        ('symposium', 'Symposium'),
+        ('meeting', 'Meeting'),
+        ('exam', 'Exam'),
+        ('office hours', 'Office Hours'),
+        ('fpo', 'PhD Defense'),
+        ('distinguished lecture', 'Distinguished Lecture'),
+    ],
+    tags=[
+        # Department-specific
+        'physics', 'physical', 'quantum', 'particle', 'nuclear', 'astrophysics', 'biophysics',
+        'condensed matter', 'high energy', 'theoretical', 'experimental', 'mathematical physics',
+        'cosmology', 'gravity', 'atomic', 'molecular', 'statistical mechanics', 'phenomenology',
+        'cpbf', 'het', 'pcts', 'pqi',
+        # General
+        'princeton', 'university', 'academic', 'event', 'research',
+    ],
+)
+
+# Tags read from the event page text
+CONTENT_VOCABULARY = Vocabulary(
+    tags=[
+        'quantum', 'particle', 'nuclear', 'astrophysics', 'biophysics', 'condensed matter',
+        'high energy', 'theoretical', 'experimental', 'mathematical physics', 'cosmology', 'gravity',
+        'atomic', 'molecular', 'statistical mechanics', 'phenomenology', 'research', 'scholarship',
+        'academic', 'faculty', 'students', 'postdocs', 'fellows',
+    ],
+)
+
 
 class PhysicsCloudScraper:
-    def __init__(self):
-        self.scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'windows', 'desktop': True},
-            delay=10
-        )
-        self.scraper.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+    def __init__(self, window: Optional[EventWindow] = None):
+        self.scraper = create_session(BROWSER_HEADERS, browser=True)
         self.base_url = "https://physics.princeton.edu"
         self.events_url = "https://physics.princeton.edu/events"
         self.department_name = "Physics"
-        self.meta_category = "sciences_engineering"
+        self.meta_category = DEPARTMENT_CATALOG.meta_category(self.department_name)
+        self.detail_cache = DETAIL_CACHE
+        self.window = window if window is not None else RUN_WINDOW.get()
         
-    def _try_json_feed(self) -> List[Dict[str, Any]]:
-        """Try the FullCalendar JSON feed endpoint first (avoids Cloudflare HTML blocking)"""
-        import re as _re
-        from datetime import datetime as _dt
+    def _feed(self) -> CalendarFeed:
         # Physics uses phy.princeton.edu for the JSON feed (physics.princeton.edu redirects there)
-        json_url = "https://phy.princeton.edu/feeds/events/calendar.json"
-        current_year = _dt.now().year
-        params = {
-            'uuid': '2cea06c3-31b5-478b-b470-477cf35c7a4d',
-            'et': 'node',
-            'ei': '7896',
-            'start': f'{current_year}-01-01T00:00:00',
-            'end': f'{current_year + 1}-12-31T23:59:59',
-            'timeZone': 'America/New_York',
-        }
+        return CalendarFeed(self.department_name, 'phy.princeton.edu', self.meta_category, window=self.window,
+                            parse_item=self._event_from_feed_item, getter=self.scraper.get, headers={})
+
+    def fetch_feed(self) -> Optional[FeedFetch]:
+        """
+        The FullCalendar JSON feed (avoids Cloudflare HTML blocking), not
+        yet parsed; None when it cannot be fetched.
+        """
+        feed = self._feed()
         try:
-            print(f"    Trying JSON feed: {json_url}")
-            resp = self.scraper.get(json_url, params=params, timeout=30)
-            resp.raise_for_status()
-            data = resp.json()
-            if not isinstance(data, list) or len(data) == 0:
-                return []
-            events = []
-            for item in data:
-                title = item.get('title', '').strip()
-                if not title:
-                    continue
-                start_str = item.get('start', '')
-                date_part = start_str[:10] if start_str else ''
-                time_part = ''
-                if 'T' in start_str:
-                    t = start_str[11:16]
-                    hour = int(t[:2])
-                    minute = int(t[3:5])
-                    ampm = 'AM' if hour < 12 else 'PM'
-                    display_hour = hour % 12 or 12
-                    time_part = f'{display_hour}:{minute:02d} {ampm}'
-                end_str = item.get('end', '')
-                end_date = end_str[:10] if end_str else None
-                if 'T' in end_str and date_part == end_date:
-                    t = end_str[11:16]
-                    hour = int(t[:2])
-                    minute = int(t[3:5])
-                    ampm = 'AM' if hour < 12 else 'PM'
-                    display_hour = hour % 12 or 12
-                    end_time_part = f'{display_hour}:{minute:02d} {ampm}'
-                    if time_part:
-                        time_part = f'{time_part} - {end_time_part}'
-                url = item.get('url', '')
-                if url and not url.startswith('http'):
-                    url = 'https://phy.princeton.edu' + url
-                safe_title = _re.sub(r'[^a-zA-Z0-9]', '_', title[:20])
-                events.append({
-                    'id': f"physics_{date_part}_{safe_title}",
-                    'title': title,
-                    'description': item.get('description', '') or '',
-                    'start_date': date_part,
-                    'end_date': end_date,
-                    'time': time_part,
-                    'location': item.get('location', '') or 'Princeton University',
-                    'event_type': self._determine_event_type(title),
-                    'department': self.department_name,
-                    'meta_category': self.meta_category,
-                    'source_url': url or self.events_url,
-                    'source_name': f'{self.department_name} Department Events',
-                    'speaker': '',
-                    'audience': '',
-                    'topics': [],
-                    'departments': [],
-                    'tags': self._extract_tags(title, ''),
-                    'series': self._extract_series_from_title(title),
-                    'image_url': '',
-                    'created_at': _dt.now().isoformat(),
-                    'updated_at': _dt.now().isoformat(),
-                })
-            print(f"    JSON feed: found {len(events)} events")
-            return events
+            print(f"    Trying JSON feed: {feed.json_url}")
+            return feed.fetch_feed()
         except Exception as e:
             print(f"    JSON feed failed: {e}")
-            return []
+            return None
+
+    def _event_from_feed_item(self, item: Dict[str, Any]) -> Optional[Event]:
+        """Event from one calendar.json item"""
+        title = (item.get('title') or '').strip()
+        if not title:
+            return None
+        when = normalize_range(item.get('start', '') or '', item.get('end', '') or '')
+        date_part = when.date if when else ''
+        end_date = (when.end_date or None) if when else None
+        time_part = ''
+        if when and not when.all_day:
+            # End time only for events that finish the same day
+            time_part = when.clock_range() if when.end_date == date_part else clock(when.start)
+        url = item.get('url', '')
+        if url and not url.startswith('http'):
+            url = 'https://phy.princeton.edu' + url
+        safe_title = re.sub(r'[^a-zA-Z0-9]', '_', title[:20])
+        return Event(
+            id=f"physics_{date_part}_{safe_title}",
+            title=title,
+            description=item.get('description', '') or '',
+            start_date=date_part,
+            end_date=end_date,
+            time=time_part,
+            location=item.get('location', '') or 'Princeton University',
+            event_type=self._determine_event_type(title),
+            department=self.department_name,
+            meta_category=self.meta_category,
+            source_url=url or self.events_url,
+            source_name=f'{self.department_name} Department Events',
+            tags=self._extract_tags(title, ''),
+            series=self._extract_series_from_title(title),
+        )
 
     def scrape_physics_events(self) -> List[Dict[str, Any]]:
         """Scrape events from the Physics department - tries JSON feed first, then HTML"""
@@ -114,7 +122,20 @@ class PhysicsCloudScraper:
         print("=" * 60)
 
         # Try JSON feed first (more reliable, avoids Cloudflare HTML protection)
-        json_events = self._try_json_feed()
+        return self.parse_fetched(self.fetch_feed())
+
+    def parse_fetched(self, fetched: Optional[FeedFetch]) -> List[Dict[str, Any]]:
+        """
+        Events of a fetch_feed() result. When the feed failed or holds no
+        events this falls back to scraping the HTML events page, which
+        fetches as well as parses.
+        """
+        json_events = []
+        if fetched is not None:
+            try:
+                json_events = self._feed().parse_fetched(fetched)
+            except Exception as e:
+                print(f"    JSON feed failed: {e}")
         if json_events:
             unique = self._deduplicate_events(json_events)
             unique.sort(key=lambda x: x.get('start_date', ''))
@@ -122,6 +143,9 @@ class PhysicsCloudScraper:
             return unique
 
         print("JSON feed unavailable, falling back to HTML scraper...")
+        return self._scrape_html()
+
+    def _scrape_html(self) -> List[Dict[str, Any]]:
         all_events = []
 
         try:
@@ -131,51 +155,20 @@ class PhysicsCloudScraper:
             response = self.scraper.get(self.events_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Check if we got a Cloudflare challenge page
-            if "Just a moment" in response.text or "Cloudflare" in response.text:
-                print("⚠️  Cloudflare challenge detected, trying alternative approach...")
-                # Try to find any event-related content
-                all_text = soup.get_text()
-                if "fc-events-list" in all_text:
-                    print("✅ Found calendar content in page")
-                else:
-                    print("❌ No calendar content found")
-                    return []
+            page_events, from_calendar_list = PARSE_STAGE.run(
+                self.department_name, parse_physics_listing, response.content, response.encoding or 'utf-8'
+            )
+            if not page_events:
+                return []
             
-            # Find the FullCalendar events list
-            events_list = soup.find('ul', class_='fc-events-list')
-            if not events_list:
-                print("🔍 Looking for alternative event containers...")
-                # Try to find any event-like content
-                event_containers = soup.find_all(['div', 'li'], class_=lambda x: x and any(word in str(x).lower() for word in ['event', 'calendar', 'fc-']))
-                if event_containers:
-                    print(f"🔍 Found {len(event_containers)} potential event containers")
-                    # Try to extract events from these containers
-                    for container in event_containers:
-                        event = self._extract_event_from_alternative_container(container)
-                        if event and event.get('title'):
-                            all_events.append(event)
-                else:
-                    print("❌ No events list or alternative containers found")
-                    print("📄 Page content preview:", soup.get_text()[:500])
-                    return []
-            else:
-                # Extract events from the list
-                event_items = events_list.find_all('li')
-                print(f"🔍 Found {len(event_items)} events in calendar list")
+            for event in page_events:
+                # Get additional details from individual event page
+                if from_calendar_list and event.get('source_url'):
+                    detailed_event = self.detail_cache.lookup(event, lambda: self._fetch_event_details(event['source_url']))
+                    if detailed_event:
+                        event.update(detailed_event)
                 
-                for item in event_items:
-                    event = self._extract_event_from_item(item)
-                    if event and event.get('title'):
-                        # Get additional details from individual event page
-                        if event.get('source_url'):
-                            detailed_event = self._fetch_event_details(event['source_url'])
-                            if detailed_event:
-                                event.update(detailed_event)
-                        
-                        all_events.append(event)
+                all_events.append(event)
             
             # Remove duplicates and sort by date
             unique_events = self._deduplicate_events(all_events)
@@ -188,6 +181,55 @@ class PhysicsCloudScraper:
             print(f"❌ Error scraping Physics events: {e}")
             return []
     
+    def parse_listing(self, content: bytes, encoding: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Extract the events on the HTML events page. Returns (events,
+        from_calendar_list); detail pages are only worth fetching for events
+        taken from the FullCalendar list.
+        """
+        text = content.decode(encoding, errors='replace')
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Check if we got a Cloudflare challenge page
+        if "Just a moment" in text or "Cloudflare" in text:
+            print("⚠️  Cloudflare challenge detected, trying alternative approach...")
+            # Try to find any event-related content
+            all_text = soup.get_text()
+            if "fc-events-list" in all_text:
+                print("✅ Found calendar content in page")
+            else:
+                print("❌ No calendar content found")
+                return [], False
+        
+        # Find the FullCalendar events list
+        events_list = soup.find('ul', class_='fc-events-list')
+        events = []
+        if not events_list:
+            print("🔍 Looking for alternative event containers...")
+            # Try to find any event-like content
+            event_containers = soup.find_all(['div', 'li'], class_=lambda x: x and any(word in str(x).lower() for word in ['event', 'calendar', 'fc-']))
+            if event_containers:
+                print(f"🔍 Found {len(event_containers)} potential event containers")
+                # Try to extract events from these containers
+                for container in event_containers:
+                    event = self._extract_event_from_alternative_container(container)
+                    if event and event.get('title'):
+                        events.append(event)
+            else:
+                print("❌ No events list or alternative containers found")
+                print("📄 Page content preview:", soup.get_text()[:500])
+            return events, False
+        
+        # Extract events from the list
+        event_items = events_list.find_all('li')
+        print(f"🔍 Found {len(event_items)} events in calendar list")
+        
+        for item in event_items:
+            event = self._extract_event_from_item(item)
+            if event and event.get('title'):
+                events.append(event)
+        return events, True
+    
     def _extract_event_from_item(self, item) -> Dict[str, Any]:
         """Extract event information from a FullCalendar list item"""
         event = {
@@ -287,77 +329,15 @@ class PhysicsCloudScraper:
     
     def _parse_physics_date(self, date_text: str) -> Dict[str, str]:
         """Parse Physics department date format: 'Sep 8, 2025, 12:30 p.m. – 1:30 p.m.'"""
-        try:
-            # Pattern: "Sep 8, 2025, 12:30 p.m. – 1:30 p.m."
-            pattern = r'(\w+)\s+(\d{1,2}),?\s+(\d{4}),\s+(\d{1,2}):(\d{2})\s*(a\.m\.|p\.m\.)\s*–\s*(\d{1,2}):(\d{2})\s*(a\.m\.|p\.m\.)'
-            match = re.search(pattern, date_text)
-            
-            if match:
-                month, day, year, start_hour, start_min, start_ampm, end_hour, end_min, end_ampm = match.groups()
-                
-                # Convert month abbreviation to number
-                month_num = self._month_to_number(month)
-                
-                # Format date
-                date = f"{year}-{month_num}-{day.zfill(2)}"
-                
-                # Format start time
-                start_time = self._format_time(start_hour, start_min, start_ampm)
-                
-                # Format end time
-                end_time = self._format_time(end_hour, end_min, end_ampm)
-                
-                # Combine times
-                time_range = f"{start_time} - {end_time}"
-                
-                return {
-                    'date': date,
-                    'time': time_range,
-                    'end_time': end_time
-                }
-            
-            # Try simpler pattern without end time: "Sep 8, 2025, 12:30 p.m."
-            simple_pattern = r'(\w+)\s+(\d{1,2}),?\s+(\d{4}),\s+(\d{1,2}):(\d{2})\s*(a\.m\.|p\.m\.)'
-            simple_match = re.search(simple_pattern, date_text)
-            
-            if simple_match:
-                month, day, year, hour, minute, ampm = simple_match.groups()
-                month_num = self._month_to_number(month)
-                date = f"{year}-{month_num}-{day.zfill(2)}"
-                time = self._format_time(hour, minute, ampm)
-                
-                return {
-                    'date': date,
-                    'time': time,
-                    'end_time': ''
-                }
-            
-        except Exception as e:
-            print(f"    ⚠️  Error parsing date: {date_text} - {e}")
-        
-        return {}
-    
-    def _format_time(self, hour: str, minute: str, ampm: str) -> str:
-        """Format time from hour, minute, and AM/PM"""
-        hour_int = int(hour)
-        minute_int = int(minute)
-        
-        # Convert to 12-hour format
-        if ampm.lower() == 'p.m.' and hour_int != 12:
-            hour_int += 12
-        elif ampm.lower() == 'a.m.' and hour_int == 12:
-            hour_int = 0
+        when = normalize(date_text)
+        if not when or when.all_day:
+            return {}
         
-        return f"{hour_int:02d}:{minute_int:02d}"
-    
-    def _month_to_number(self, month: str) -> str:
-        """Convert month abbreviation to number"""
-        months = {
-            'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-            'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
-            'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+        return {
+            'date': when.date,
+            'time': when.time_range(),
+            'end_time': when.end_time()
         }
-        return months.get(month, '01')
     
     def _extract_series_from_title(self, title: str) -> str:
         """Extract series information from event title"""
@@ -384,126 +364,68 @@ class PhysicsCloudScraper:
     
     def _determine_event_type(self, title: str) -> str:
         """Determine event type based on title"""
-        if not title:
-            return 'Event'
-            
-        title_lower = title.lower()
-        
-        type_keywords = {
-            'colloquium': 'Colloquium',
-            'seminar': 'Seminar',
-            'workshop': 'Workshop',
-            'talk': 'Talk',
-            'lecture': 'Lecture',
-            'conference': 'Conference',
-            'panel': 'Panel',
-            'discussion': 'Discussion',
-            'symposium': 'Symposium',
-            'meeting': 'Meeting',
-            'exam': 'Exam',
-            'office hours': 'Office Hours',
-            'fpo': 'PhD Defense',
-            'distinguished lecture': 'Distinguished Lecture'
-        }
-        
-        for keyword, event_type in type_keywords.items():
-            if keyword in title_lower:
-                return event_type
-        
-        return 'Event'
+        return VOCABULARY.event_type(title or '')
     
     def _extract_tags(self, title: str, series: str) -> List[str]:
         """Extract relevant tags from title and series"""
-        text = (title + ' ' + series).lower()
-        tags = []
-        
-        # Add department-specific tags
-        physics_tags = [
-            'physics', 'physical', 'quantum', 'particle', 'nuclear', 'astrophysics',
-            'biophysics', 'condensed matter', 'high energy', 'theoretical', 'experimental',
-            'mathematical physics', 'cosmology', 'gravity', 'atomic', 'molecular',
-            'statistical mechanics', 'phenomenology', 'cpbf', 'het', 'pcts', 'pqi'
-        ]
-        
-        for tag in physics_tags:
-            if tag in text:
-                tags.append(tag)
-        
-        # Add general tags
-        general_tags = ['princeton', 'university', 'academic', 'event', 'research']
-        for tag in general_tags:
-            if tag in text and tag not in tags:
-                tags.append(tag)
-        
-        return tags
+        return VOCABULARY.extract_tags(title, series)
     
     def _fetch_event_details(self, event_url: str) -> Dict[str, Any]:
         """Fetch detailed information from individual event page"""
         try:
             print(f"    🔍 Fetching details from: {event_url}")
             response = self.scraper.get(event_url, timeout=30)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            details = {}
-            
-            # Extract description
-            desc_elem = soup.find('meta', {'name': 'description'})
-            if desc_elem and desc_elem.get('content'):
-                details['description'] = desc_elem.get('content')
-            
-            # Extract location if available
-            location_elem = soup.find('div', class_='field--name-field-ps-events-location-name')
-            if location_elem:
-                details['location'] = location_elem.get_text(strip=True)
-            
-            # Extract speaker if available
-            speaker_elem = soup.find('div', class_='field--name-field-ps-events-speaker')
-            if speaker_elem:
-                speaker_name = speaker_elem.find('div', class_='field--name-field-ps-event-speaker-name')
-                if speaker_name:
-                    details['speaker'] = speaker_name.get_text(strip=True)
-                
-                speaker_affil = speaker_elem.find('div', class_='field--name-field-ps-event-speaker-affil')
-                if speaker_affil:
-                    details['speaker_affiliation'] = speaker_affil.get_text(strip=True)
-            
-            # Extract audience if available
-            audience_elem = soup.find('div', class_='field--name-field-ps-events-audience')
-            if audience_elem:
-                details['audience'] = audience_elem.get_text(strip=True)
-            
-            # Extract additional tags from content
-            content_elem = soup.find('div', class_='node__content')
-            if content_elem:
-                content_text = content_elem.get_text().lower()
-                additional_tags = self._extract_content_tags(content_text)
-                if additional_tags:
-                    details['tags'] = additional_tags
-            
-            return details
+            return PARSE_STAGE.run(self.department_name, parse_physics_details, response.content)
             
         except Exception as e:
             print(f"    ⚠️  Error fetching event details: {e}")
             return {}
     
+    def parse_event_details(self, content: bytes) -> Dict[str, Any]:
+        """Extract the detail fields from an event page"""
+        soup = BeautifulSoup(content, 'html.parser')
+
+        details = {}
+
+        # Extract description
+        desc_elem = soup.find('meta', {'name': 'description'})
+        if desc_elem and desc_elem.get('content'):
+            details['description'] = desc_elem.get('content')
+
+        # Extract location if available
+        location_elem = soup.find('div', class_='field--name-field-ps-events-location-name')
+        if location_elem:
+            details['location'] = location_elem.get_text(strip=True)
+
+        # Extract speaker if available
+        speaker_elem = soup.find('div', class_='field--name-field-ps-events-speaker')
+        if speaker_elem:
+            speaker_name = speaker_elem.find('div', class_='field--name-field-ps-event-speaker-name')
+            if speaker_name:
+                details['speaker'] = speaker_name.get_text(strip=True)
+
+            speaker_affil = speaker_elem.find('div', class_='field--name-field-ps-event-speaker-affil')
+            if speaker_affil:
+                details['speaker_affiliation'] = speaker_affil.get_text(strip=True)
+
+        # Extract audience if available
+        audience_elem = soup.find('div', class_='field--name-field-ps-events-audience')
+        if audience_elem:
+            details['audience'] = audience_elem.get_text(strip=True)
+
+        # Extract additional tags from content
+        content_elem = soup.find('div', class_='node__content')
+        if content_elem:
+            content_text = content_elem.get_text().lower()
+            additional_tags = self._extract_content_tags(content_text)
+            if additional_tags:
+                details['tags'] = additional_tags
+
+        return details
+    
     def _extract_content_tags(self, content_text: str) -> List[str]:
         """Extract additional tags from event content"""
-        tags = []
-        
-        # Look for specific content indicators
-        content_keywords = [
-            'quantum', 'particle', 'nuclear', 'astrophysics', 'biophysics',
-            'condensed matter', 'high energy', 'theoretical', 'experimental',
-            'mathematical physics', 'cosmology', 'gravity', 'atomic', 'molecular',
-            'statistical mechanics', 'phenomenology', 'research', 'scholarship',
-            'academic', 'faculty', 'students', 'postdocs', 'fellows'
-        ]
-        
-        for keyword in content_keywords:
-            if keyword in content_text:
-                tags.append(keyword)
-        
-        return tags
+        return CONTENT_VOCABULARY.extract_tags(content_text)
     
     def _deduplicate_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate events"""
@@ -536,10 +458,21 @@ class PhysicsCloudScraper:
         }
         
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+            json.dump(output, f, indent=2, ensure_ascii=False, default=json_default)
         
         print(f"💾 Saved {len(events)} events to {filename}")
 
+
+def parse_physics_listing(content: bytes, encoding: str) -> Tuple[List[Dict[str, Any]], bool]:
+    """Picklable entry point for PARSE_STAGE"""
+    return PhysicsCloudScraper().parse_listing(content, encoding)
+
+
+def parse_physics_details(content: bytes) -> Dict[str, Any]:
+    """Picklable entry point for PARSE_STAGE"""
+    return PhysicsCloudScraper().parse_event_details(content)
+
+
 if __name__ == "__main__":
     scraper = PhysicsCloudScraper()
     events = scraper.scrape_physics_events()
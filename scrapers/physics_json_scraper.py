@@ -5,10 +5,43 @@ Scrapes events from Physics Department JSON calendar feed
 """
 
 import json
-import requests
 from datetime import datetime
 import pytz
 from typing import List, Dict, Any
+from http_client import HTTP_CLIENT
+from keyword_classifier import Vocabulary
+from department_catalog import DEPARTMENT_CATALOG
+
+
+# Event types by priority, then tags in the order they are reported
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'),
+        ('seminar', 'Seminar'),
+        ('workshop', 'Workshop'),
+        ('talk', 'Talk'),
+        ('lecture', 'Lecture'),
+        ('conference', 'Conference'),
+        ('panel', 'Panel'),
+        ('discussion', 'Discussion'),
+        ('symposium', 'Symposium'),
+        ('meeting', 'Meeting'),
+        ('exam', 'Exam'),
+        ('office hours', 'Office Hours'),
+        ('lab', 'Lab Session'),
+        ('tutorial', 'Tutorial'),
+        ('recitation', 'Recitation'),
+    ],
+    tags=[
+        # Department-specific
+        'physics', 'physical', 'mechanics', 'thermodynamics', 'electromagnetism', 'optics',
+        'quantum', 'particle', 'nuclear', 'astrophysics', 'cosmology', 'condensed matter', 'plasma',
+        'fluid dynamics', 'statistical mechanics', 'relativity', 'string theory',
+        'quantum field theory', 'quantum mechanics',
+        # General
+        'princeton', 'university', 'academic', 'event', 'colloquium', 'seminar',
+    ],
+)
 
 
 class PhysicsJSONScraper:
@@ -23,7 +56,7 @@ class PhysicsJSONScraper:
         print(f"🔍 Fetching JSON feed from: {self.json_url}")
         
         try:
-            response = requests.get(self.json_url, timeout=30)
+            response = HTTP_CLIENT.get(self.json_url, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -57,7 +90,7 @@ class PhysicsJSONScraper:
                 'location': str(event_data.get('location', '')),
                 'url': str(event_data.get('url', '')),
                 'department': self.department_name,
-                'meta_category': 'sciences_engineering',
+                'meta_category': DEPARTMENT_CATALOG.meta_category('Physics'),
                 'event_type': 'Event',
                 'tags': [],
                 'speaker': str(event_data.get('speaker', '')),
@@ -76,59 +109,11 @@ class PhysicsJSONScraper:
     
     def _determine_event_type(self, title: str) -> str:
         """Determine event type based on title"""
-        if not title:
-            return 'Event'
-            
-        title_lower = title.lower()
-        
-        type_keywords = {
-            'colloquium': 'Colloquium',
-            'seminar': 'Seminar',
-            'workshop': 'Workshop',
-            'talk': 'Talk',
-            'lecture': 'Lecture',
-            'conference': 'Conference',
-            'panel': 'Panel',
-            'discussion': 'Discussion',
-            'symposium': 'Symposium',
-            'meeting': 'Meeting',
-            'exam': 'Exam',
-            'office hours': 'Office Hours',
-            'lab': 'Lab Session',
-            'tutorial': 'Tutorial',
-            'recitation': 'Recitation'
-        }
-        
-        for keyword, event_type in type_keywords.items():
-            if keyword in title_lower:
-                return event_type
-        
-        return 'Event'
+        return VOCABULARY.event_type(title or '')
     
     def _extract_tags(self, title: str, description: str) -> List[str]:
         """Extract relevant tags from title and description"""
-        text = (title + ' ' + (description or '')).lower()
-        tags = []
-        
-        # Add department-specific tags
-        physics_tags = [
-            'physics', 'physical', 'mechanics', 'thermodynamics', 'electromagnetism',
-            'optics', 'quantum', 'particle', 'nuclear', 'astrophysics', 'cosmology',
-            'condensed matter', 'plasma', 'fluid dynamics', 'statistical mechanics',
-            'relativity', 'string theory', 'quantum field theory', 'quantum mechanics'
-        ]
-        
-        for tag in physics_tags:
-            if tag in text:
-                tags.append(tag)
-        
-        # Add general tags
-        general_tags = ['princeton', 'university', 'academic', 'event', 'colloquium', 'seminar']
-        for tag in general_tags:
-            if tag in text and tag not in tags:
-                tags.append(tag)
-        
-        return tags
+        return VOCABULARY.extract_tags(title, description or '')
     
     def _deduplicate_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate events"""
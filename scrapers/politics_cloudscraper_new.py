@@ -1,26 +1,27 @@
 #!/usr/bin/env python3
-import cloudscraper
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime
 import re
 from typing import List, Dict, Any
+from http_client import create_session, BROWSER_HEADERS
+from keyword_classifier import Vocabulary
+from date_normalizer import parse_date
+from department_catalog import DEPARTMENT_CATALOG
+
+# Tags in the order they are reported
+VOCABULARY = Vocabulary(
+    tags=[
+        'politics', 'political', 'colloquium', 'seminar', 'lecture', 'conference',
+        'international relations', 'ir', 'csdp', 'american politics', 'comparative politics',
+        'political theory', 'political economy', 'public policy', 'governance',
+    ],
+)
+
 
 class PoliticsCloudScraperNew:
     def __init__(self):
-        self.scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'windows', 'desktop': True},
-            delay=10
-        )
-        self.scraper.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        self.scraper = create_session(BROWSER_HEADERS, browser=True)
         self.base_url = "https://politics.princeton.edu"
         
     def scrape_politics_events(self) -> List[Dict[str, Any]]:
@@ -80,7 +81,7 @@ class PoliticsCloudScraperNew:
             'location': '',
             'event_type': 'Colloquium',
             'department': 'Politics',
-            'meta_category': 'social_sciences',
+            'meta_category': DEPARTMENT_CATALOG.meta_category('Politics'),
             'source_url': f"{self.base_url}/events",
             'source_name': 'Politics Department Events',
             'tags': [],
@@ -188,42 +189,12 @@ class PoliticsCloudScraperNew:
     
     def _parse_date(self, date_text: str) -> str:
         """Parse date text to YYYY-MM-DD format"""
-        try:
-            # Try different date formats
-            date_formats = [
-                '%b %d, %Y',    # Sep 15, 2025
-                '%B %d, %Y',    # September 15, 2025
-                '%b %d %Y',     # Sep 15 2025
-                '%B %d %Y'      # September 15 2025
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    parsed_date = datetime.strptime(date_text, fmt)
-                    return parsed_date.strftime('%Y-%m-%d')
-                except:
-                    continue
-            
-            return ""
-        except:
-            return ""
+        day = parse_date(date_text)
+        return day.isoformat() if day else ""
     
     def _extract_tags(self, title: str, description: str) -> List[str]:
         """Extract relevant tags"""
-        text = (title + ' ' + description).lower()
-        tags = []
-        
-        politics_tags = [
-            'politics', 'political', 'colloquium', 'seminar', 'lecture', 'conference',
-            'international relations', 'ir', 'csdp', 'american politics', 'comparative politics',
-            'political theory', 'political economy', 'public policy', 'governance'
-        ]
-        
-        for tag in politics_tags:
-            if tag in text:
-                tags.append(tag)
-        
-        return tags
+        return VOCABULARY.extract_tags(title, description)
     
     def _deduplicate_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate events"""
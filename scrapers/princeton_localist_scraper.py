@@ -6,12 +6,22 @@ which uses the Localist platform. This covers many departments that are
 Cloudflare-blocked on their individual sites.
 """
 
-import requests
+import contextvars
 import json
-from datetime import datetime
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
 import re
-import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from event_record import Event, json_default
+from event_window import EventWindow, RUN_WINDOW, cache_variant
+from http_cache import FEED_CACHE
+from localist_sync import GROUPS_TTL, LocalistSyncState, Slice, date_slices, load_groups, store_groups
+from http_client import create_session
+from rate_limit import API_RATE_LIMITER
+from keyword_classifier import Vocabulary
+from date_normalizer import clock, parse_iso
+from department_catalog import DEPARTMENT_CATALOG
 
 # Academic department group names to prioritize (partial matches)
 ACADEMIC_KEYWORDS = [
@@ -28,59 +38,37 @@ ACADEMIC_KEYWORDS = [
     'neuroscience', 'pacm', 'citp', 'piirs', 'andlinger',
 ]
 
-# Map group names to meta_category
-META_CATEGORY_MAP = {
-    'mathematics': 'sciences_engineering',
-    'physics': 'sciences_engineering',
-    'chemistry': 'sciences_engineering',
-    'biology': 'sciences_engineering',
-    'molecular biology': 'sciences_engineering',
-    'geosciences': 'sciences_engineering',
-    'astrophysical': 'sciences_engineering',
-    'computer science': 'sciences_engineering',
-    'electrical': 'sciences_engineering',
-    'mechanical': 'sciences_engineering',
-    'chemical': 'sciences_engineering',
-    'civil': 'sciences_engineering',
-    'operations research': 'sciences_engineering',
-    'neuroscience': 'sciences_engineering',
-    'ecology': 'sciences_engineering',
-    'environmental': 'sciences_engineering',
-    'pacm': 'sciences_engineering',
-    'andlinger': 'sciences_engineering',
-    'economics': 'social_sciences',
-    'politics': 'social_sciences',
-    'sociology': 'social_sciences',
-    'psychology': 'social_sciences',
-    'anthropology': 'social_sciences',
-    'public affairs': 'social_sciences',
-    'spia': 'social_sciences',
-    'finance': 'social_sciences',
-    'piirs': 'social_sciences',
-    'history': 'arts_humanities',
-    'english': 'arts_humanities',
-    'philosophy': 'arts_humanities',
-    'art': 'arts_humanities',
-    'music': 'arts_humanities',
-    'religion': 'arts_humanities',
-    'classics': 'arts_humanities',
-    'slavic': 'arts_humanities',
-    'comparative literature': 'arts_humanities',
-    'humanities': 'arts_humanities',
-    'medieval': 'arts_humanities',
-    'french': 'arts_humanities',
-    'italian': 'arts_humanities',
-    'spanish': 'arts_humanities',
-    'portuguese': 'arts_humanities',
-    'linguistics': 'arts_humanities',
-    'near eastern': 'area_studies',
-    'east asian': 'area_studies',
-    'latin american': 'area_studies',
-    'hellenic': 'area_studies',
-    'african': 'area_studies',
-    'gender': 'interdisciplinary',
-    'citp': 'interdisciplinary',
-}
+
+def is_academic_group(name: str) -> bool:
+    """True when a Localist group name matches ACADEMIC_KEYWORDS"""
+    lower = name.lower()
+    return any(keyword in lower for keyword in ACADEMIC_KEYWORDS)
+
+
+# Event types by priority
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'),
+        ('seminar', 'Seminar'),
+        ('lecture', 'Lecture'),
+        ('workshop', 'Workshop'),
+        ('conference', 'Conference'),
+        ('symposium', 'Symposium'),
+        ('panel', 'Panel'),
+        ('talk', 'Talk'),
+        ('discussion', 'Discussion'),
+        ('presentation', 'Presentation'),
+        ('dissertation', 'Dissertation Defense'),
+        ('defense', 'Dissertation Defense'),
+        ('fpo', 'Dissertation Defense'),
+        ('concert', 'Concert'),
+        ('recital', 'Recital'),
+        ('performance', 'Performance'),
+        ('exhibition', 'Exhibition'),
+        ('screening', 'Film Screening'),
+        ('meeting', 'Meeting'),
+    ],
+)
 
 
 class PrincetonLocalistScraper:
@@ -89,15 +77,28 @@ class PrincetonLocalistScraper:
     Uses the Localist REST API for reliable, structured data access.
     """
 
-    def __init__(self):
+    def __init__(self, window: Optional[EventWindow] = None, page_workers: int = 4):
         self.base_url = 'https://events.princeton.edu'
         self.api_base = f'{self.base_url}/api/2'
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json',
             'Accept-Language': 'en-US,en;q=0.9',
         })
+        self.feed_cache = FEED_CACHE
+        self.window = window if window is not None else RUN_WINDOW.get()
+        # Pages after the first are fetched page_workers at a time; the rate
+        # limiter caps requests/sec against the API across all of them
+        self.page_workers = page_workers
+        self.rate_limiter = API_RATE_LIMITER
+
+    def _range_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Ask the API for the window's dates only (this also keys the feed cache)"""
+        if self.window and self.window.start:
+            params['start'] = self.window.start.isoformat()
+        if self.window and self.window.end:
+            params['end'] = self.window.end.isoformat()
+        return params
 
     def fetch_groups(self) -> List[Dict[str, Any]]:
         """Fetch all department/group listings from the Localist API"""
@@ -105,6 +106,7 @@ class PrincetonLocalistScraper:
         page = 1
         while True:
             try:
+                self.rate_limiter.acquire(self.api_base)
                 resp = self.session.get(
                     f'{self.api_base}/groups',
                     params={'page': page, 'pp': 100},
@@ -120,7 +122,6 @@ class PrincetonLocalistScraper:
                 if page >= total_pages:
                     break
                 page += 1
-                time.sleep(0.5)
             except Exception as e:
                 print(f'  Error fetching groups page {page}: {e}')
                 break
@@ -129,64 +130,248 @@ class PrincetonLocalistScraper:
     def fetch_events_page(self, page: int, pp: int = 100, group_id: Optional[int] = None,
                           days: int = 365) -> Dict[str, Any]:
         """Fetch a single page of events from the Localist API"""
-        params = {'page': page, 'pp': pp, 'days': days}
+        params = self._range_params({'page': page, 'pp': pp, 'days': days})
         if group_id:
             params['group_id'] = group_id
+        self.rate_limiter.acquire(self.api_base)
         resp = self.session.get(f'{self.api_base}/events', params=params, timeout=30)
         resp.raise_for_status()
         return resp.json()
 
+    def fetch_parsed_page(self, page: int, pp: int = 100, days: int = 365,
+                          group_id: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int, int]:
+        """
+        Fetch and parse one events page through the conditional-GET cache.
+        Returns (events, raw event count, total pages).
+        """
+        url = f'{self.api_base}/events'
+        params = self._range_params({'page': page, 'pp': pp, 'days': days})
+        if group_id:
+            params['group_id'] = group_id
+        self.rate_limiter.acquire(url)
+        resp, cached = self.feed_cache.conditional_get(self.session.get, url, params=params, timeout=30)
+        if cached is not None:
+            meta = cached.get('meta', {})
+            return cached['events'], meta.get('raw_count', 0), meta.get('total_pages', 1)
+        resp.raise_for_status()
+        data = resp.json()
+
+        raw_events = data.get('events', [])
+        total_pages = data.get('page', {}).get('total', 1)
+        events = []
+        for raw in raw_events:
+            event = self._parse_event(raw)
+            if event:
+                events.append(event)
+        self.feed_cache.store(url, resp, events, params=params,
+                              meta={'raw_count': len(raw_events), 'total_pages': total_pages})
+        return events, len(raw_events), total_pages
+
     def scrape_events(self, days: int = 365) -> List[Dict[str, Any]]:
-        """Scrape all academic events from the Princeton Localist calendar"""
+        """
+        Scrape all academic events from the Princeton Localist calendar.
+
+        Page 1 reports the page count; the remaining pages are then fetched
+        concurrently and each is parsed as soon as it arrives.
+        """
         print('SCRAPING PRINCETON LOCALIST EVENTS CALENDAR')
         print('=' * 60)
         print(f'Source: {self.base_url}')
 
         all_events = []
-        page = 1
-        total_pages = None
-
-        while True:
-            try:
-                print(f'  Fetching page {page}{"/" + str(total_pages) if total_pages else ""}...')
-                data = self.fetch_events_page(page=page, pp=100, days=days)
-
-                raw_events = data.get('events', [])
-                if not raw_events:
-                    print('  No more events found, stopping.')
-                    break
-
-                page_info = data.get('page', {})
-                if total_pages is None:
-                    total_pages = page_info.get('total', 1)
+        try:
+            print('  Fetching page 1...')
+            events, raw_count, total_pages = self.fetch_parsed_page(page=1, pp=100, days=days)
+            if not raw_count:
+                print('  No more events found, stopping.')
+            else:
+                all_events.extend(events)
+                print(f'    Got {raw_count} events from page 1/{total_pages}')
+                all_events.extend(self._fetch_remaining_pages(total_pages, days))
+        except Exception as e:
+            print(f'  Error on page 1: {e}')
 
-                for raw in raw_events:
-                    event = self._parse_event(raw)
-                    if event:
-                        all_events.append(event)
+        unique = self._deduplicate(all_events)
+        unique.sort(key=lambda x: x.get('start_date', ''))
+        print(f'Total unique events from Localist: {len(unique)}')
+        return unique
 
-                print(f'    Got {len(raw_events)} events (total so far: {len(all_events)})')
+    def _fetch_remaining_pages(self, total_pages: int, days: int) -> List[Dict[str, Any]]:
+        """Fetch and parse pages 2..total_pages on page_workers threads"""
+        pages = range(2, total_pages + 1)
+        if not pages:
+            return []
+        parsed: Dict[int, List[Dict[str, Any]]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.page_workers, len(pages)))) as pool:
+            # Each worker runs in a copy of this context so payload recording still applies
+            futures = {pool.submit(contextvars.copy_context().run, self.fetch_parsed_page, page, 100, days): page
+                       for page in pages}
+            for future in as_completed(futures):
+                page = futures[future]
+                try:
+                    events, raw_count, _ = future.result()
+                except Exception as e:
+                    print(f'  Error on page {page}: {e}')
+                    continue
+                parsed[page] = events
+                print(f'    Got {raw_count} events from page {page}/{total_pages}')
+        # Page order keeps deduplication deterministic
+        return [event for page in sorted(parsed) for event in parsed[page]]
+
+    def academic_groups(self, ttl: timedelta = GROUPS_TTL) -> List[Dict[str, Any]]:
+        """
+        Localist groups matching ACADEMIC_KEYWORDS, as {'id', 'name'} dicts.
+        Resolved through fetch_groups() at most once per ttl and cached on
+        disk; a stale cache is used when the groups API fails.
+        """
+        groups = load_groups(ttl=ttl)
+        if groups is not None:
+            return groups
+        print('  Resolving academic groups...')
+        fetched = self.fetch_groups()
+        if not fetched:
+            return load_groups(ttl=None) or []
+        groups = []
+        for raw in fetched:
+            group = raw.get('group', raw)
+            if group.get('id') and is_academic_group(group.get('name', '')):
+                groups.append({'id': group['id'], 'name': group['name']})
+        print(f'    {len(groups)} of {len(fetched)} groups are academic')
+        store_groups(groups)
+        return groups
 
-                if page >= total_pages:
-                    break
-                page += 1
-                time.sleep(0.5)
+    def scrape_academic_events(self, days: int = 365) -> List[Dict[str, Any]]:
+        """
+        Academic-only mode: fetch the event streams of the academic groups
+        (group_id=...) in parallel instead of the whole campus calendar.
+        """
+        print('SCRAPING PRINCETON LOCALIST ACADEMIC GROUPS')
+        print('=' * 60)
+        groups = self.academic_groups()
+        if not groups:
+            print('  No academic groups resolved')
+            return []
+
+        print(f'  Fetching {len(groups)} group streams...')
+        parsed: Dict[int, List[Dict[str, Any]]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(self.page_workers, len(groups)))) as pool:
+            futures = {pool.submit(contextvars.copy_context().run, self.fetch_group_events, group['id'], days): group
+                       for group in groups}
+            for future in as_completed(futures):
+                group = futures[future]
+                try:
+                    parsed[group['id']] = future.result()
+                except Exception as e:
+                    print(f"  Error fetching {group['name']}: {e}")
+                    continue
+                print(f"    {group['name']}: {len(parsed[group['id']])} events")
+
+        # Group order keeps deduplication deterministic; cross-listed events appear once
+        events = [event for group in groups for event in parsed.get(group['id'], ())]
+        unique = self._deduplicate(events)
+        unique.sort(key=lambda x: x.get('start_date', ''))
+        print(f'Total unique academic events from Localist: {len(unique)}')
+        return unique
 
-            except Exception as e:
-                print(f'  Error on page {page}: {e}')
+    def fetch_group_events(self, group_id: int, days: int = 365) -> List[Dict[str, Any]]:
+        """Every parsed event of one group's stream"""
+        events = []
+        page = total_pages = 1
+        while page <= total_pages:
+            batch, raw_count, total_pages = self.fetch_parsed_page(page, 100, days, group_id=group_id)
+            if not raw_count:
                 break
-
-        unique = self._deduplicate(all_events)
+            events.extend(batch)
+            page += 1
+        return events
+
+    def sync_events(self, days: int = 365, state: Optional[LocalistSyncState] = None) -> List[Dict[str, Any]]:
+        """
+        Delta sync for frequent polling: only the date slices that are due
+        (localist_sync.REFRESH_POLICY) are fetched, and only events whose raw
+        payload changed are parsed again. Everything else comes from the
+        stored sync state. An empty state is seeded from one ranged pull, as
+        scrape_events() makes, instead of a request per slice.
+        """
+        print('SYNCING PRINCETON LOCALIST EVENTS CALENDAR')
+        print('=' * 60)
+        state = state or LocalistSyncState.for_variant(cache_variant(self.window))
+        now = datetime.now()
+        slices = date_slices(*self._sync_range(days, now.date()))
+        if not state.slices and slices:
+            try:
+                raw_events = self.fetch_slice((slices[0][0], slices[-1][1]))
+            except Exception as e:
+                # Fall back to fetching the slices one by one
+                print(f'  Error seeding the sync state: {e}')
+            else:
+                state.seed(slices, raw_events, self._raw_start_day, self._parse_event, now)
+                print(f'  Seeded {len(slices)} date slices from one ranged pull')
+        due = [slice_ for slice_ in slices if state.due(slice_, now)]
+        print(f'  {len(due)} of {len(slices)} date slices due')
+
+        if due:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.page_workers, len(due)))) as pool:
+                futures = {pool.submit(contextvars.copy_context().run, self.fetch_slice, slice_): slice_
+                           for slice_ in due}
+                for future in as_completed(futures):
+                    slice_ = futures[future]
+                    try:
+                        raw_events = future.result()
+                    except Exception as e:
+                        # The slice keeps its stored events and stays due
+                        print(f'  Error syncing {slice_[0]}..{slice_[1]}: {e}')
+                        continue
+                    state.update_slice(slice_, raw_events, self._parse_event, now)
+        print(f'  Parsed {state.parsed} new or changed events, reused {state.reused}')
+
+        events = state.collect(slices)
+        state.prune(slices)
+        state.save()
+        unique = self._deduplicate(events)
         unique.sort(key=lambda x: x.get('start_date', ''))
         print(f'Total unique events from Localist: {len(unique)}')
         return unique
 
-    def _parse_event(self, raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _sync_range(self, days: int, today: date) -> Slice:
+        """The dates scrape_events() would cover: the window, else today plus days"""
+        start = self.window.start if self.window and self.window.start else today
+        end = self.window.end if self.window and self.window.end else start + timedelta(days=days - 1)
+        return start, end
+
+    def fetch_slice(self, slice_: Slice, pp: int = 100) -> List[Dict[str, Any]]:
+        """All raw event objects starting in one date slice"""
+        url = f'{self.api_base}/events'
+        raw_events = []
+        page = total_pages = 1
+        while page <= total_pages:
+            params = {'page': page, 'pp': pp, 'start': slice_[0].isoformat(), 'end': slice_[1].isoformat()}
+            self.rate_limiter.acquire(url)
+            resp = self.session.get(url, params=params, timeout=30)
+            resp.raise_for_status()
+            data = resp.json()
+            raw_events.extend(data.get('events', []))
+            total_pages = data.get('page', {}).get('total', 1)
+            page += 1
+        return raw_events
+
+    def _raw_start_day(self, raw: Dict[str, Any]) -> Optional[date]:
+        """Start date of a raw Localist event, for bucketing it into a sync slice"""
+        ev = raw.get('event', raw)
+        first_date = ev.get('first_date', '') or ev.get('start', '')
+        value = parse_iso(str(first_date)) if first_date else None
+        return value.date() if value else None
+
+    def _parse_event(self, raw: Dict[str, Any]) -> Optional[Event]:
         """Parse a Localist API event object into our standard format"""
         try:
             # Localist wraps event data under 'event' key
             ev = raw.get('event', raw)
 
+            first_date = ev.get('first_date', '') or ev.get('start', '')
+            if self.window and first_date and not self.window.contains_iso(str(first_date)):
+                return None
+
             title = ev.get('title', '').strip()
             if not title:
                 return None
@@ -196,7 +381,6 @@ class PrincetonLocalistScraper:
             end_date = None
             event_time = ''
 
-            first_date = ev.get('first_date', '') or ev.get('start', '')
             last_date = ev.get('last_date', '') or ev.get('end', '')
 
             if first_date:
@@ -272,31 +456,27 @@ class PrincetonLocalistScraper:
             # Speaker
             speaker = ev.get('speaker', '') or ''
 
-            return {
-                'id': combined_id,
-                'title': title,
-                'description': description[:1000] if description else '',
-                'start_date': start_date,
-                'end_date': end_date,
-                'time': event_time,
-                'location': location,
-                'event_type': event_type,
-                'department': dept_name or 'Princeton University',
-                'meta_category': meta_category,
-                'source_url': source_url,
-                'source_name': 'Princeton Events Calendar',
-                'speaker': speaker,
-                'audience': ev.get('audience', '') or '',
-                'topics': [],
-                'departments': [dept_name] if dept_name else [],
-                'tags': tags,
-                'series': ev.get('event_instances', [{}])[0].get('event_instance', {}).get('subtitle', '') if ev.get('event_instances') else '',
-                'speaker_affiliation': '',
-                'speaker_url': '',
-                'image_url': ev.get('photo_url', '') or '',
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat(),
-            }
+            instances = ev.get('event_instances')
+            return Event(
+                id=combined_id,
+                title=title,
+                description=description[:1000] if description else '',
+                start_date=start_date,
+                end_date=end_date,
+                time=event_time,
+                location=location,
+                event_type=event_type,
+                department=dept_name or 'Princeton University',
+                meta_category=meta_category,
+                source_url=source_url,
+                source_name='Princeton Events Calendar',
+                speaker=speaker,
+                audience=ev.get('audience', '') or '',
+                departments=[dept_name] if dept_name else (),
+                tags=tags,
+                series=instances[0].get('event_instance', {}).get('subtitle', '') if instances else '',
+                image_url=ev.get('photo_url', '') or '',
+            )
 
         except Exception as e:
             print(f'  Error parsing event: {e}')
@@ -304,63 +484,23 @@ class PrincetonLocalistScraper:
 
     def _parse_date(self, date_str: str) -> str:
         """Extract YYYY-MM-DD from an ISO datetime string or date string"""
-        if not date_str:
-            return ''
-        # Match YYYY-MM-DD at the start
-        m = re.match(r'(\d{4}-\d{2}-\d{2})', str(date_str))
-        if m:
-            return m.group(1)
-        return ''
+        value = parse_iso(str(date_str)) if date_str else None
+        return value.strftime('%Y-%m-%d') if value else ''
 
     def _parse_time(self, datetime_str: str) -> str:
-        """Extract HH:MM time from an ISO datetime string"""
-        if not datetime_str:
+        """Extract display time ('4:30 PM') from an ISO datetime string"""
+        if not datetime_str or 'T' not in str(datetime_str):
             return ''
-        m = re.search(r'T(\d{2}):(\d{2})', str(datetime_str))
-        if m:
-            hour = int(m.group(1))
-            minute = int(m.group(2))
-            ampm = 'AM' if hour < 12 else 'PM'
-            display_hour = hour % 12 or 12
-            return f'{display_hour}:{minute:02d} {ampm}'
-        return ''
+        value = parse_iso(str(datetime_str))
+        return clock(value) if value else ''
 
     def _get_meta_category(self, dept_name: str) -> str:
         """Map department name to meta_category"""
-        lower = dept_name.lower()
-        for keyword, category in META_CATEGORY_MAP.items():
-            if keyword in lower:
-                return category
-        return 'interdisciplinary'
+        return DEPARTMENT_CATALOG.meta_category(dept_name)
 
     def _determine_event_type(self, title: str, description: str = '') -> str:
         """Determine event type from title/description"""
-        text = (title + ' ' + description).lower()
-        type_keywords = {
-            'colloquium': 'Colloquium',
-            'seminar': 'Seminar',
-            'lecture': 'Lecture',
-            'workshop': 'Workshop',
-            'conference': 'Conference',
-            'symposium': 'Symposium',
-            'panel': 'Panel',
-            'talk': 'Talk',
-            'discussion': 'Discussion',
-            'presentation': 'Presentation',
-            'dissertation': 'Dissertation Defense',
-            'defense': 'Dissertation Defense',
-            'fpo': 'Dissertation Defense',
-            'concert': 'Concert',
-            'recital': 'Recital',
-            'performance': 'Performance',
-            'exhibition': 'Exhibition',
-            'screening': 'Film Screening',
-            'meeting': 'Meeting',
-        }
-        for keyword, event_type in type_keywords.items():
-            if keyword in text:
-                return event_type
-        return 'Event'
+        return VOCABULARY.event_type(title, description)
 
     def _deduplicate(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate events by title + date"""
@@ -385,11 +525,16 @@ class PrincetonLocalistScraper:
             'events': events
         }
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
+            json.dump(output, f, indent=2, ensure_ascii=False, default=json_default)
         print(f'Saved {len(events)} events to {filename}')
 
 
 if __name__ == '__main__':
     scraper = PrincetonLocalistScraper()
-    events = scraper.scrape_events(days=365)
+    if '--sync' in sys.argv:
+        events = scraper.sync_events(days=365)
+    elif '--academic' in sys.argv:
+        events = scraper.scrape_academic_events(days=365)
+    else:
+        events = scraper.scrape_events(days=365)
     scraper.save_events(events)
@@ -4,12 +4,48 @@ Psychology Department CloudScraper
 Scrapes events from Psychology Department website
 """
 
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
-import re
 from typing import List, Dict, Any
+from http_client import HTTP_CLIENT
 import time
+from keyword_classifier import Vocabulary
+from date_normalizer import normalize
+from department_catalog import DEPARTMENT_CATALOG
+
+
+# Event types by priority, then tags in the order they are reported
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'),
+        ('seminar', 'Seminar'),
+        ('workshop', 'Workshop'),
+        ('talk', 'Talk'),
+        ('lecture', 'Lecture'),
+        ('conference', 'Conference'),
+        ('panel', 'Panel'),
+        ('discussion', 'Discussion'),
+        ('symposium', 'Symposium'),
+        ('meeting', 'Meeting'),
+        ('exam', 'Exam'),
+        ('office hours', 'Office Hours'),
+        ('lab', 'Lab Session'),
+        ('tutorial', 'Tutorial'),
+        ('recitation', 'Recitation'),
+        ('series', 'Series'),
+        ('research', 'Research Seminar'),
+        ('cognitive', 'Cognitive Seminar'),
+    ],
+    tags=[
+        # Department-specific
+        'psychology', 'psychological', 'cognitive', 'behavioral', 'social', 'developmental',
+        'clinical', 'experimental', 'neuroscience', 'brain', 'memory', 'learning', 'perception',
+        'attention', 'emotion', 'personality', 'research', 'lab', 'study', 'experiment', 'data',
+        'analysis',
+        # General
+        'princeton', 'university', 'academic', 'event', 'colloquium', 'seminar',
+    ],
+)
 
 
 class PsychologyCloudScraper:
@@ -17,7 +53,7 @@ class PsychologyCloudScraper:
         self.department_name = "Psychology"
         self.base_url = "https://psychology.princeton.edu"
         self.events_url = "https://psychology.princeton.edu/events"
-        self.meta_category = "social_sciences"
+        self.meta_category = DEPARTMENT_CATALOG.meta_category(self.department_name)
         
     def scrape_psychology_events(self) -> List[Dict[str, Any]]:
         """Scrape events from Psychology department"""
@@ -35,7 +71,7 @@ class PsychologyCloudScraper:
                 'Upgrade-Insecure-Requests': '1',
             }
             
-            response = requests.get(self.events_url, headers=headers, timeout=30)
+            response = HTTP_CLIENT.get(self.events_url, headers=headers, timeout=30)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -102,7 +138,7 @@ class PsychologyCloudScraper:
             # Extract date and time
             date_field = item.find('div', class_='field--name-field-ps-events-date')
             if date_field:
-                date_text = date_field.get_text(strip=True)
+                date_text = date_field.get_text(' ', strip=True)
                 event['start_date'], event['time'] = self._parse_date_time(date_text)
             
             # Extract location
@@ -133,94 +169,18 @@ class PsychologyCloudScraper:
     
     def _parse_date_time(self, date_text: str) -> tuple:
         """Parse date and time from text"""
-        try:
-            # Extract date part (e.g., "Oct 20, 2025")
-            date_match = re.search(r'([A-Za-z]{3} \d{1,2}, \d{4})', date_text)
-            if date_match:
-                date_str = date_match.group(1)
-                # Convert to YYYY-MM-DD format
-                dt = datetime.strptime(date_str, '%b %d, %Y')
-                formatted_date = dt.strftime('%Y-%m-%d')
-            else:
-                formatted_date = ''
-            
-            # Extract time part (e.g., "12:00 pm")
-            time_match = re.search(r'(\d{1,2}:\d{2} [ap]m)', date_text)
-            if time_match:
-                time_str = time_match.group(1)
-                # Convert to 24-hour format
-                try:
-                    time_obj = datetime.strptime(time_str, '%I:%M %p')
-                    formatted_time = time_obj.strftime('%H:%M')
-                except:
-                    formatted_time = time_str
-            else:
-                formatted_time = ''
-            
-            return formatted_date, formatted_time
-            
-        except Exception as e:
-            print(f"Error parsing date/time: {e}")
+        when = normalize(date_text)
+        if not when:
             return '', ''
+        return when.date, when.start_time()
     
     def _determine_event_type(self, title: str) -> str:
         """Determine event type based on title"""
-        if not title:
-            return 'Event'
-            
-        title_lower = title.lower()
-        
-        type_keywords = {
-            'colloquium': 'Colloquium',
-            'seminar': 'Seminar',
-            'workshop': 'Workshop',
-            'talk': 'Talk',
-            'lecture': 'Lecture',
-            'conference': 'Conference',
-            'panel': 'Panel',
-            'discussion': 'Discussion',
-            'symposium': 'Symposium',
-            'meeting': 'Meeting',
-            'exam': 'Exam',
-            'office hours': 'Office Hours',
-            'lab': 'Lab Session',
-            'tutorial': 'Tutorial',
-            'recitation': 'Recitation',
-            'series': 'Series',
-            'research': 'Research Seminar',
-            'cognitive': 'Cognitive Seminar'
-        }
-        
-        for keyword, event_type in type_keywords.items():
-            if keyword in title_lower:
-                return event_type
-        
-        return 'Event'
+        return VOCABULARY.event_type(title or '')
     
     def _extract_tags(self, title: str, description: str) -> List[str]:
         """Extract relevant tags from title and description"""
-        text = (title + ' ' + (description or '')).lower()
-        tags = []
-        
-        # Add department-specific tags
-        psychology_tags = [
-            'psychology', 'psychological', 'cognitive', 'behavioral', 'social',
-            'developmental', 'clinical', 'experimental', 'neuroscience', 'brain',
-            'memory', 'learning', 'perception', 'attention', 'emotion', 'personality',
-            'research', 'lab', 'study', 'experiment', 'data', 'analysis'
-        ]
-        
-        for tag in psychology_tags:
-            if tag in text:
-                tags.append(tag)
-        
-        # Add general tags
-        general_tags = ['princeton', 'university', 'academic', 'event', 'colloquium', 'seminar']
-        for tag in general_tags:
-            if tag in text and tag not in tags:
-                tags.append(tag)
-        
-        return tags
+        return VOCABULARY.extract_tags(title, description or '')
     
     def _deduplicate_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate events"""
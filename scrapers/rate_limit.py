@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Per-host token-bucket rate limiting.
+
+Replaces fixed time.sleep() politeness delays: concurrent workers can overlap
+their network latency while the request rate against any one host stays at
+or below the configured requests/sec.
+"""
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, sleeping as long as needed. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the tokens up front so waiting callers queue in order
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """One TokenBucket per host"""
+
+    def __init__(self, requests_per_second: float = 1.0, burst: float = 1.0):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc or url
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+            return self._buckets[host]
+
+    def acquire(self, url: str) -> float:
+        return self.bucket(url).acquire()
+
+
+# Shared politeness budget for HTML scrapers: at most 1 request/sec per host
+HOST_RATE_LIMITER = HostRateLimiter(requests_per_second=1.0)
+
+# JSON APIs meant for programmatic clients (Localist) get a larger budget
+API_RATE_LIMITER = HostRateLimiter(requests_per_second=5.0, burst=5.0)
@@ -4,20 +4,53 @@ Sociology Department Alternative Scraper
 Tries different approaches to bypass 403 Forbidden
 """
 
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
-import re
 from typing import List, Dict, Any
+from http_client import HTTP_CLIENT
 import time
 import random
+from keyword_classifier import Vocabulary
+from date_normalizer import normalize
+from department_catalog import DEPARTMENT_CATALOG
+
+
+# Event types by priority, then tags in the order they are reported
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'),
+        ('seminar', 'Seminar'),
+        ('workshop', 'Workshop'),
+        ('talk', 'Talk'),
+        ('lecture', 'Lecture'),
+        ('conference', 'Conference'),
+        ('panel', 'Panel'),
+        ('discussion', 'Discussion'),
+        ('symposium', 'Symposium'),
+        ('meeting', 'Meeting'),
+        ('exam', 'Exam'),
+        ('office hours', 'Office Hours'),
+        ('lab', 'Lab Session'),
+        ('tutorial', 'Tutorial'),
+        ('recitation', 'Recitation'),
+        ('series', 'Series'),
+    ],
+    tags=[
+        # Department-specific
+        'sociology', 'social', 'society', 'inequality', 'race', 'gender', 'class', 'migration',
+        'immigration', 'urban', 'rural', 'family', 'education', 'health', 'crime', 'deviance',
+        'social movements', 'social policy', 'social change', 'social theory', 'methodology',
+        # General
+        'princeton', 'university', 'academic', 'event', 'colloquium', 'seminar',
+    ],
+)
 
 
 class SociologyAlternativeScraper:
     def __init__(self):
         self.department_name = "Sociology"
         self.base_url = "https://sociology.princeton.edu"
-        self.meta_category = "social_sciences"
+        self.meta_category = DEPARTMENT_CATALOG.meta_category(self.department_name)
         
     def scrape_sociology_events(self) -> List[Dict[str, Any]]:
         """Try multiple approaches to scrape Sociology events"""
@@ -67,7 +100,7 @@ class SociologyAlternativeScraper:
                 # Add random delay
                 time.sleep(random.uniform(1, 3))
                 
-                response = requests.get(url, headers=headers, timeout=30)
+                response = HTTP_CLIENT.get(url, headers=headers, timeout=30)
                 
                 if response.status_code == 200:
                     print(f"    SUCCESS! Got response from {url}")
@@ -185,7 +218,7 @@ class SociologyAlternativeScraper:
             for selector in date_selectors:
                 date_elem = item.select_one(selector)
                 if date_elem and date_elem.get_text(strip=True):
-                    date_text = date_elem.get_text(strip=True)
+                    date_text = date_elem.get_text(' ', strip=True)
                     event['start_date'], event['time'] = self._parse_date_time(date_text)
                     break
             
@@ -227,108 +260,18 @@ class SociologyAlternativeScraper:
     
     def _parse_date_time(self, date_text: str) -> tuple:
         """Parse date and time from text"""
-        try:
-            # Try different date patterns
-            date_patterns = [
-                r'([A-Za-z]{3}, [A-Za-z]{3} \d{1,2}, \d{4})',  # Mon, Oct 20, 2025
-                r'([A-Za-z]{3} \d{1,2}, \d{4})',  # Oct 20, 2025
-                r'(\d{1,2}/\d{1,2}/\d{4})',  # 10/20/2025
-                r'(\d{4}-\d{2}-\d{2})',  # 2025-10-20
-            ]
-            
-            formatted_date = ''
-            for pattern in date_patterns:
-                date_match = re.search(pattern, date_text)
-                if date_match:
-                    date_str = date_match.group(1)
-                    try:
-                        if ',' in date_str:
-                            dt = datetime.strptime(date_str, '%a, %b %d, %Y')
-                        elif '/' in date_str:
-                            dt = datetime.strptime(date_str, '%m/%d/%Y')
-                        elif '-' in date_str:
-                            dt = datetime.strptime(date_str, '%Y-%m-%d')
-                        else:
-                            dt = datetime.strptime(date_str, '%b %d, %Y')
-                        formatted_date = dt.strftime('%Y-%m-%d')
-                        break
-                    except:
-                        continue
-            
-            # Try to find time
-            time_match = re.search(r'(\d{1,2}:\d{2} [ap]m)', date_text)
-            if time_match:
-                time_str = time_match.group(1)
-                try:
-                    time_obj = datetime.strptime(time_str, '%I:%M %p')
-                    formatted_time = time_obj.strftime('%H:%M')
-                except:
-                    formatted_time = time_str
-            else:
-                formatted_time = ''
-            
-            return formatted_date, formatted_time
-            
-        except Exception as e:
-            print(f"Error parsing date/time: {e}")
+        when = normalize(date_text)
+        if not when:
             return '', ''
+        return when.date, when.start_time()
     
     def _determine_event_type(self, title: str) -> str:
         """Determine event type based on title"""
-        if not title:
-            return 'Event'
-            
-        title_lower = title.lower()
-        
-        type_keywords = {
-            'colloquium': 'Colloquium',
-            'seminar': 'Seminar',
-            'workshop': 'Workshop',
-            'talk': 'Talk',
-            'lecture': 'Lecture',
-            'conference': 'Conference',
-            'panel': 'Panel',
-            'discussion': 'Discussion',
-            'symposium': 'Symposium',
-            'meeting': 'Meeting',
-            'exam': 'Exam',
-            'office hours': 'Office Hours',
-            'lab': 'Lab Session',
-            'tutorial': 'Tutorial',
-            'recitation': 'Recitation',
-            'series': 'Series'
-        }
-        
-        for keyword, event_type in type_keywords.items():
-            if keyword in title_lower:
-                return event_type
-        
-        return 'Event'
+        return VOCABULARY.event_type(title or '')
     
     def _extract_tags(self, title: str, description: str) -> List[str]:
         """Extract relevant tags from title and description"""
-        text = (title + ' ' + (description or '')).lower()
-        tags = []
-        
-        # Add department-specific tags
-        sociology_tags = [
-            'sociology', 'social', 'society', 'inequality', 'race', 'gender',
-            'class', 'migration', 'immigration', 'urban', 'rural', 'family',
-            'education', 'health', 'crime', 'deviance', 'social movements',
-            'social policy', 'social change', 'social theory', 'methodology'
-        ]
-        
-        for tag in sociology_tags:
-            if tag in text:
-                tags.append(tag)
-        
-        # Add general tags
-        general_tags = ['princeton', 'university', 'academic', 'event', 'colloquium', 'seminar']
-        for tag in general_tags:
-            if tag in text and tag not in tags:
-                tags.append(tag)
-        
-        return tags
+        return VOCABULARY.extract_tags(title, description or '')
     
     def _deduplicate_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate events"""
@@ -1,26 +1,35 @@
 #!/usr/bin/env python3
-import cloudscraper
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime
-import re
 from typing import List, Dict, Any
+from http_client import create_session, BROWSER_HEADERS
+from keyword_classifier import Vocabulary
+from date_normalizer import clock, parse_date, parse_time_range
+from department_catalog import DEPARTMENT_CATALOG
+
+# Event types by priority, then tags in the order they are reported
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'),
+        ('seminar', 'Seminar'),
+        ('workshop', 'Workshop'),
+        ('lecture', 'Lecture'),
+        ('conference', 'Conference'),
+        ('talk', 'Talk'),
+        ('discussion', 'Discussion'),
+    ],
+    tags=[
+        'sociology', 'social', 'colloquium', 'seminar', 'workshop', 'lecture',
+        'talk', 'discussion', 'research', 'academic', 'university', 'princeton',
+        'speaker', 'presentation', 'event',
+    ],
+)
+
 
 class SociologyCloudScraperNew:
     def __init__(self):
-        self.scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'windows', 'desktop': True},
-            delay=10
-        )
-        self.scraper.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        self.scraper = create_session(BROWSER_HEADERS, browser=True)
         self.base_url = "https://sociology.princeton.edu"
         
     def scrape_sociology_events(self) -> List[Dict[str, Any]]:
@@ -80,7 +89,7 @@ class SociologyCloudScraperNew:
             'location': 'Princeton University',
             'event_type': 'Colloquium',
             'department': 'Sociology',
-            'meta_category': 'social_sciences',
+            'meta_category': DEPARTMENT_CATALOG.meta_category('Sociology'),
             'source_url': f"{self.base_url}/events",
             'source_name': 'Sociology Department Events',
             'speaker': '',
@@ -162,57 +171,30 @@ class SociologyCloudScraperNew:
     
     def _parse_date_time(self, date_elem) -> Dict[str, str]:
         """Parse date and time from the Sociology date field structure"""
-        try:
-            # Look for the date badge first (month/day format)
-            date_badge = date_elem.find('div', class_='date-badge')
-            if date_badge:
-                month_elem = date_badge.find('div', class_='month')
-                day_elem = date_badge.find('div', class_='day')
-                
-                if month_elem and day_elem:
-                    month = month_elem.get_text(strip=True)
-                    day = day_elem.get_text(strip=True)
-                    # Assume current year for now
-                    year = datetime.now().year
-                    date_str = f"{month} {day}, {year}"
-                    
-                    try:
-                        parsed_date = datetime.strptime(date_str, '%b %d, %Y').strftime('%Y-%m-%d')
-                    except:
-                        parsed_date = ""
-            else:
-                # Look for the full date text
-                date_text = date_elem.get_text(strip=True)
-                date_match = re.search(r'([A-Z][a-z]{2}, [A-Z][a-z]+ \d{1,2}, \d{4})', date_text)
-                if date_match:
-                    date_str = date_match.group(1)
-                    try:
-                        parsed_date = datetime.strptime(date_str, '%a, %b %d, %Y').strftime('%Y-%m-%d')
-                    except:
-                        parsed_date = ""
-                else:
-                    parsed_date = ""
-            
-            # Extract time
-            time_text = date_elem.get_text(strip=True)
-            time_match = re.search(r'(\d{1,2}:\d{2}\s*[ap]m)', time_text)
-            time_str = time_match.group(1) if time_match else ""
-            
-            # Look for time range
-            time_range_match = re.search(r'(\d{1,2}:\d{2}\s*[ap]m)\s*–\s*(\d{1,2}:\d{2}\s*[ap]m)', time_text)
-            if time_range_match:
-                start_time = time_range_match.group(1)
-                end_time = time_range_match.group(2)
-                time_str = f"{start_time} - {end_time}"
-            
-            return {
-                'date': parsed_date,
-                'time': time_str
-            }
-            
-        except Exception as e:
-            print(f"      ⚠️  Error parsing date/time: {e}")
-            return {'date': '', 'time': ''}
+        date_text = date_elem.get_text(' ', strip=True)
+        parsed_date = ""
+        
+        # Look for the date badge first (month/day format)
+        date_badge = date_elem.find('div', class_='date-badge')
+        if date_badge:
+            month_elem = date_badge.find('div', class_='month')
+            day_elem = date_badge.find('div', class_='day')
+            if month_elem and day_elem:
+                # Assume current year for now
+                date_text = f"{month_elem.get_text(strip=True)} {day_elem.get_text(strip=True)}, {datetime.now().year} {date_text}"
+        
+        day = parse_date(date_text)
+        if day:
+            parsed_date = day.isoformat()
+        
+        # Time or time range
+        start_time, end_time = parse_time_range(date_text)
+        time_str = " - ".join(clock(value).lower() for value in (start_time, end_time) if value)
+        
+        return {
+            'date': parsed_date,
+            'time': time_str
+        }
     
     def _extract_speaker_info(self, speaker_elem) -> Dict[str, str]:
         """Extract speaker name, affiliation, and presentation title"""
@@ -262,41 +244,11 @@ class SociologyCloudScraperNew:
     
     def _determine_event_type(self, title: str, description: str) -> str:
         """Determine event type based on title and description"""
-        text = (title + ' ' + description).lower()
-        
-        if 'colloquium' in text:
-            return 'Colloquium'
-        elif 'seminar' in text:
-            return 'Seminar'
-        elif 'workshop' in text:
-            return 'Workshop'
-        elif 'lecture' in text:
-            return 'Lecture'
-        elif 'conference' in text:
-            return 'Conference'
-        elif 'talk' in text:
-            return 'Talk'
-        elif 'discussion' in text:
-            return 'Discussion'
-        else:
-            return 'Event'  # Default
+        return VOCABULARY.event_type(title, description)
     
     def _extract_tags(self, title: str, description: str, speaker: str) -> List[str]:
         """Extract relevant tags"""
-        text = (title + ' ' + description + ' ' + speaker).lower()
-        tags = []
-        
-        sociology_tags = [
-            'sociology', 'social', 'colloquium', 'seminar', 'workshop', 'lecture',
-            'talk', 'discussion', 'research', 'academic', 'university', 'princeton',
-            'speaker', 'presentation', 'event'
-        ]
-        
-        for tag in sociology_tags:
-            if tag in text:
-                tags.append(tag)
-        
-        return tags
+        return VOCABULARY.extract_tags(title, description, speaker)
     
     def _deduplicate_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate events"""
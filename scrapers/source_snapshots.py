@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Per-source snapshots for incremental combining.
+
+While a source runs inside an http_cache.PayloadRecorder, every upstream
+payload it fetches is recorded as (url, sha256). The recorder's fingerprint
+is the source's raw payload hash; SnapshotStore keeps that hash together
+with the source's parsed events so an unchanged source can be spliced back
+into the combined output without being re-merged.
+"""
+import json
+import os
+import re
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from event_record import json_default
+from http_cache import CACHE_DIR
+
+
+class SnapshotStore:
+    """On-disk store of the last payload hash and parsed events per source"""
+
+    def __init__(self, snapshot_dir: str = os.path.join(CACHE_DIR, 'sources')):
+        self.snapshot_dir = snapshot_dir
+
+    def _path(self, source_key: str) -> str:
+        safe_key = re.sub(r'[^a-zA-Z0-9_.-]', '_', source_key)
+        return os.path.join(self.snapshot_dir, f'{safe_key}.json')
+
+    def load(self, source_key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(source_key), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, source_key: str, payload_hash: str, events: List[Dict[str, Any]]):
+        snapshot = {
+            'source': source_key,
+            'payload_hash': payload_hash,
+            'updated_at': datetime.now().isoformat(),
+            'events': events,
+        }
+        path = self._path(source_key)
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            with open(f'{path}.tmp', 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, default=json_default)
+            os.replace(f'{path}.tmp', path)
+        except OSError as e:
+            print(f'  WARNING: could not write snapshot for {source_key}: {e}')
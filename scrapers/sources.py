@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Registry of event sources for the combiner.
+
+Each source is a Source subclass registered with @register. A source's
+fetch() pulls whatever it needs from upstream and parse() turns that payload
+into event dicts. The ICS, calendar.json and Drupal sources return raw
+responses from fetch() and do their parsing in parse(), so an incremental
+run can skip parse() for a source whose payloads are unchanged; the other
+sources still fetch and parse in fetch(). Scraper modules are only imported inside fetch()/parse(),
+so selecting a subset of sources (combine_cloudscraper_events.py --only ...)
+never loads the cloudscraper / bs4 / icalendar / playwright stacks of the
+sources that are not run.
+"""
+import importlib.util
+from typing import List, Dict, Any, Optional
+
+from department_catalog import DEPARTMENT_CATALOG
+
+# source key -> Source instance, in registration order
+SOURCES: Dict[str, 'Source'] = {}
+
+
+class Source:
+    """
+    One upstream the combiner can run.
+
+    key         stable id, used for --only and incremental snapshots
+    group       section the source is reported under
+    scrapers    how many scrapers this source counts as in the totals
+    """
+    key = ''
+    group = ''
+    scrapers = 1
+
+    def available(self) -> bool:
+        """False when an optional dependency the source needs is missing"""
+        return True
+
+    def fetch(self) -> Any:
+        """Download the upstream payload for this source, without parsing it"""
+        raise NotImplementedError
+
+    def parse(self, payload: Any) -> List[Dict[str, Any]]:
+        """
+        Turn a fetch() payload into event dicts. Sources backed by a legacy
+        scraper class fetch and parse in one call, so their payload already
+        is the event list.
+        """
+        return payload
+
+    def run(self) -> List[Dict[str, Any]]:
+        return self.parse(self.fetch())
+
+    def successes(self, events: List[Dict[str, Any]]) -> int:
+        """Number of scrapers that succeeded, given this source's events"""
+        return 1 if events else 0
+
+
+def register(source_cls):
+    """Class decorator: instantiate and register a Source subclass"""
+    add_source(source_cls())
+    return source_cls
+
+
+def add_source(source: Source) -> Source:
+    if source.key in SOURCES:
+        raise ValueError(f"Duplicate source key: {source.key}")
+    SOURCES[source.key] = source
+    return source
+
+
+def select_sources(only: Optional[List[str]] = None, use_browser: bool = True) -> List[Source]:
+    """
+    Sources to run, in registration order.
+
+    only may name source keys or groups (e.g. 'ics', 'drupal', 'math').
+    The browser group is skipped unless use_browser is set or it is named
+    explicitly in only.
+    """
+    if not only:
+        return [s for s in SOURCES.values() if use_browser or s.group != 'browser']
+    unknown = [name for name in only if name not in SOURCES and name not in groups()]
+    if unknown:
+        raise ValueError(f"Unknown source(s): {', '.join(unknown)}. Known: {', '.join(SOURCES)}")
+    return [s for s in SOURCES.values() if s.key in only or s.group in only]
+
+
+def groups() -> List[str]:
+    seen = []
+    for source in SOURCES.values():
+        if source.group not in seen:
+            seen.append(source.group)
+    return seen
+
+
+# --- ICS feeds ---
+
+@register
+class ICSDepartmentsSource(Source):
+    """All department ICS feeds (fetched concurrently by universal_ics_scraper)"""
+    key = 'ics'
+    group = 'ics'
+
+    def fetch(self):
+        from universal_ics_scraper import fetch_all_ics_departments
+        return fetch_all_ics_departments()
+
+    def parse(self, payload):
+        from universal_ics_scraper import parse_all_ics_departments
+        return parse_all_ics_departments(payload)
+
+
+# --- Individual scrapers with their own modules ---
+
+@register
+class MathSource(Source):
+    key = 'math'
+    group = 'individual'
+
+    def fetch(self):
+        from math_ics_scraper import MathICSScraper
+        return MathICSScraper().scrape_math_events()
+
+
+@register
+class PhilosophySource(Source):
+    key = 'philosophy'
+    group = 'individual'
+
+    def fetch(self):
+        from philosophy_ics_scraper import PhilosophyICSScraper
+        return PhilosophyICSScraper().scrape_philosophy_events()
+
+
+@register
+class PhysicsSource(Source):
+    key = 'physics'
+    group = 'individual'
+
+    def fetch(self):
+        from physics_cloudscraper import PhysicsCloudScraper
+        scraper = PhysicsCloudScraper()
+        return scraper, scraper.fetch_feed()
+
+    def parse(self, payload):
+        # Falls back to the HTML events page when the feed has nothing
+        scraper, fetched = payload
+        return scraper.parse_fetched(fetched)
+
+
+@register
+class GeosciencesSource(Source):
+    key = 'geosciences'
+    group = 'individual'
+
+    def fetch(self):
+        from geosciences_json_scraper import GeosciencesJSONScraper
+        scraper = GeosciencesJSONScraper()
+        return scraper, scraper.fetch_feed()
+
+    def parse(self, payload):
+        scraper, fetched = payload
+        return scraper.parse_fetched(fetched)
+
+
+@register
+class CSSource(Source):
+    key = 'cs'
+    group = 'individual'
+
+    def fetch(self):
+        from cs_cloudscraper import CSCloudScraper
+        return CSCloudScraper().scrape_cs_events()
+
+
+@register
+class EconomicsSource(Source):
+    key = 'economics'
+    group = 'individual'
+
+    def fetch(self):
+        from economics_cloudscraper_new import EconomicsCloudScraperNew
+        return EconomicsCloudScraperNew().scrape_economics_events()
+
+
+@register
+class SPIASource(Source):
+    key = 'spia'
+    group = 'individual'
+
+    def fetch(self):
+        from spia_cloudscraper_new import SPIACloudScraperNew
+        return SPIACloudScraperNew().scrape_spia_events()
+
+
+# --- Universal Drupal scraper for non-Cloudflare departments ---
+
+class DrupalSource(Source):
+    group = 'drupal'
+
+    def __init__(self, department: str, base_url: str, events_url: str, meta_category: str):
+        self.key = f'drupal_{department}'
+        self.department = department
+        self.base_url = base_url
+        self.events_url = events_url
+        self.meta_category = meta_category
+
+    def fetch(self):
+        # Cheapest tier that still fills in speaker, full description and
+        # tags: the HTML listing with detail pages, or the browser
+        from fetch_tiers import DETAIL_FIELDS, FETCH_TIERS, FetchTarget
+        target = FetchTarget(self.department, self.base_url, self.events_url, self.meta_category,
+                             fields=DETAIL_FIELDS)
+        return FETCH_TIERS.fetch(target)
+
+    def parse(self, payload):
+        from fetch_tiers import FETCH_TIERS
+        return FETCH_TIERS.parse(payload).events
+
+
+UNIVERSAL_DRUPAL_DEPARTMENTS = [
+    ('politics', 'https://politics.princeton.edu', 'https://politics.princeton.edu/events'),
+]
+
+for _department, _base_url, _events_url in UNIVERSAL_DRUPAL_DEPARTMENTS:
+    add_source(DrupalSource(_department, _base_url, _events_url, DEPARTMENT_CATALOG.meta_category(_department)))
+
+
+# --- Playwright browser tier for Cloudflare-protected departments ---
+
+@register
+class BrowserSource(Source):
+    """
+    Departments once blocked by Cloudflare. Each goes through the cheapest
+    fetch tier that works for it; only those left needing the browser are
+    rendered, together in one shared browser.
+    """
+    key = 'browser'
+    group = 'browser'
+
+    def available(self) -> bool:
+        return importlib.util.find_spec('playwright') is not None
+
+    @property
+    def scrapers(self) -> int:
+        from browser_scraper import BROWSER_DEPARTMENTS
+        return len(BROWSER_DEPARTMENTS)
+
+    def fetch(self):
+        from browser_scraper import BROWSER_DEPARTMENTS
+        from fetch_tiers import FetchTarget, scrape_targets
+        results = scrape_targets([FetchTarget(*dept) for dept in BROWSER_DEPARTMENTS])
+        return [event for result in results for event in result.events]
+
+    def successes(self, events):
+        return len(set(e.get('department', '') for e in events))
@@ -1,14 +1,91 @@
 #!/usr/bin/env python3
-import cloudscraper
 from bs4 import BeautifulSoup
+import contextvars
+import hashlib
 import json
 from datetime import datetime
 import re
-import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
+from http_client import create_session, BROWSER_HEADERS
+from html_encoding import response_encoding
+from rate_limit import HOST_RATE_LIMITER
+from detail_cache import DETAIL_CACHE
+from parse_stage import PARSE_STAGE
+import drupal_listing_lxml
+from keyword_classifier import Vocabulary
+from date_normalizer import month_number, parse_date
+from department_catalog import DEPARTMENT_CATALOG
+
+# Time patterns for date fields without span.time children, most specific first
+TIME_PATTERNS = [
+    re.compile(r'(\d{1,2}:\d{2}\s*(?:am|pm|AM|PM)(?:\s*–\s*\d{1,2}:\d{2}\s*(?:am|pm|AM|PM))?)', re.IGNORECASE),  # "3:00 pm – 4:20 pm"
+    re.compile(r'(\d{1,2}:\d{2}\s*(?:am|pm|AM|PM))', re.IGNORECASE),  # Single time like "3:00 pm"
+    re.compile(r'(\d{1,2}\s*(?:am|pm|AM|PM)(?:\s*–\s*\d{1,2}\s*(?:am|pm|AM|PM))?)', re.IGNORECASE),  # "3 pm – 4 pm"
+    re.compile(r'(\d{1,2}\s*(?:am|pm|AM|PM))', re.IGNORECASE),  # Single time like "3 pm"
+]
+
+# Listing pages are parsed with lxml when it is installed (same output, one tree walk)
+DEFAULT_LISTING_ENGINE = 'lxml' if drupal_listing_lxml.LXML_AVAILABLE else 'bs4'
+
+# Event types by priority
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('seminar', 'Seminar'),
+        ('colloquium', 'Colloquium'),
+        ('lecture', 'Lecture'),
+        ('talk', 'Talk'),
+        ('workshop', 'Workshop'),
+        ('conference', 'Conference'),
+        ('panel', 'Panel'),
+        ('discussion', 'Discussion'),
+        ('symposium', 'Symposium'),
+        ('meeting', 'Meeting'),
+        ('presentation', 'Presentation'),
+        ('kruzhok', 'Kruzhok'),
+        ('artist', 'Artist Talk'),
+        ('exhibition', 'Exhibition'),
+        ('film', 'Film Screening'),
+        ('screening', 'Film Screening'),
+    ],
+)
+
+# Common academic tags, after the department's meta-category tags
+COMMON_TAGS = [
+    'princeton', 'university', 'academic', 'event', 'education',
+    'seminar', 'colloquium', 'lecture', 'talk', 'workshop',
+    'conference', 'presentation', 'discussion', 'symposium',
+]
+COMMON_TAG_VOCABULARY = Vocabulary(tags=COMMON_TAGS)
+TAG_VOCABULARIES = {
+    meta_category: Vocabulary(tags=tags + COMMON_TAGS)
+    for meta_category, tags in {
+        'arts_humanities': ['humanities', 'arts', 'literature', 'history', 'philosophy', 'culture'],
+        'social_sciences': ['social sciences', 'sociology', 'politics', 'economics', 'anthropology'],
+        'sciences_engineering': ['science', 'engineering', 'technology', 'research', 'innovation'],
+        'area_studies': ['area studies', 'international', 'global', 'cultural studies'],
+        'interdisciplinary': ['interdisciplinary', 'cross-disciplinary', 'multidisciplinary'],
+    }.items()
+}
+
+
+class DetailPage(NamedTuple):
+    """An event's detail page: cached details, or the raw page still to parse"""
+    event: Dict[str, Any]
+    details: Optional[Dict[str, Any]] = None
+    content: Optional[bytes] = None
+    encoding: str = ''
+
+
+class DrupalPages(NamedTuple):
+    """fetch_pages() result: listing events and their detail pages, details not yet parsed"""
+    events: List[Dict[str, Any]]
+    details: List[DetailPage]
+
 
 class UniversalDrupalCloudScraper:
-    def __init__(self, department_name: str, base_url: str, events_url: str, meta_category: str):
+    def __init__(self, department_name: str, base_url: str, events_url: str, meta_category: str,
+                 listing_engine: str = DEFAULT_LISTING_ENGINE):
         """
         Universal Drupal scraper for Princeton departments
         
@@ -17,124 +94,176 @@ class UniversalDrupalCloudScraper:
             base_url: Base URL of the department (e.g., "https://history.princeton.edu")
             events_url: URL to the events page (e.g., "https://history.princeton.edu/events")
             meta_category: Meta category for the department (e.g., "arts_humanities")
+            listing_engine: "lxml" or "bs4" for extracting listing pages
         """
-        self.scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'windows', 'desktop': True},
-            delay=10
-        )
-        self.scraper.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
+        self.scraper = create_session(BROWSER_HEADERS, browser=True)
         self.department_name = department_name
         self.base_url = base_url
         self.events_url = events_url
         self.meta_category = meta_category
+        self.listing_engine = listing_engine
+        # Per-host token bucket shared by listing and detail requests
+        self.rate_limiter = HOST_RATE_LIMITER
+        # Detail pages are only re-fetched when the listing fingerprint changes
+        self.detail_cache = DETAIL_CACHE
         
-    def scrape_events(self, max_pages: int = 10, fetch_details: bool = True) -> List[Dict[str, Any]]:
-        """Scrape events from the department"""
+    def scrape_events(self, max_pages: int = 10, fetch_details: bool = True,
+                      detail_workers: int = 4) -> List[Dict[str, Any]]:
+        """
+        Scrape events from the department.
+
+        Detail pages are fetched on a pool of detail_workers threads while the
+        listing pages are still being walked; the per-host rate limiter keeps
+        the overall request rate within the politeness budget.
+        """
         print(f"SCRAPING {self.department_name.upper()} EVENTS")
         print("=" * 60)
 
+        try:
+            return self.fetch_events(max_pages, fetch_details, detail_workers)
+        except Exception as e:
+            print(f"Error scraping {self.department_name} events: {e}")
+            return []
+
+    def fetch_events(self, max_pages: int = 10, fetch_details: bool = True,
+                     detail_workers: int = 4) -> List[Dict[str, Any]]:
+        """scrape_events() that raises when a listing page cannot be fetched"""
+        return self.parse_fetched(self.fetch_pages(max_pages, fetch_details, detail_workers))
+
+    def fetch_pages(self, max_pages: int = 10, fetch_details: bool = True,
+                    detail_workers: int = 4) -> DrupalPages:
+        """
+        The request half of fetch_events(). Listing pages are parsed as they
+        arrive, since they decide which detail pages and further listing
+        pages to fetch; detail pages are downloaded but left for
+        parse_fetched(), unless the detail cache already has them.
+        """
+        detail_jobs = []
+        with ThreadPoolExecutor(max_workers=detail_workers) as detail_pool:
+            events = self._scrape_listing_pages(max_pages, fetch_details, detail_pool, detail_jobs)
+            detail_pages = [future.result() for future in detail_jobs]
+        return DrupalPages(events, [page for page in detail_pages if page is not None])
+
+    def parse_fetched(self, pages: DrupalPages) -> List[Dict[str, Any]]:
+        """The parse half: merge the detail pages into their listing events"""
+        for page in pages.details:
+            details = page.details
+            if details is None:
+                try:
+                    details = PARSE_STAGE.run(
+                        self.department_name, parse_event_details, self.department_name, self.base_url,
+                        self.events_url, self.meta_category, page.event, page.content, page.encoding
+                    )
+                except Exception as e:
+                    print(f"    Could not parse details for {page.event['title'][:30]}: {e}")
+                    continue
+                # Before the merge: the cache fingerprint is taken from the listing fields
+                if details:
+                    self.detail_cache.put(page.event, details, hashlib.sha256(page.content).hexdigest())
+            if details:
+                page.event.update(details)
+
+        # Remove duplicates and sort by date
+        unique_events = self._deduplicate_events(pages.events)
+        unique_events.sort(key=lambda x: x.get('start_date', ''))
+
+        print(f"Total unique events found: {len(unique_events)}")
+        return unique_events
+
+    def _scrape_listing_pages(self, max_pages: int, fetch_details: bool, detail_pool,
+                              detail_jobs: List) -> List[Dict[str, Any]]:
+        """Walk the listing pages, queueing detail fetches on detail_pool"""
         all_events = []
         page = 0
 
-        try:
-            while page <= max_pages:
-                # Build URL for current page
-                if page == 0:
-                    url = self.events_url
-                else:
-                    url = f"{self.events_url}?page={page}"
-
-                print(f"Scraping page {page} from: {url}")
-                
-                response = self.scraper.get(url, timeout=30)
-                response.raise_for_status()
-
-                # Handle encoding issues
-                response.encoding = response.apparent_encoding or 'utf-8'
-                soup = BeautifulSoup(response.content.decode(response.encoding, errors='replace'), 'html.parser')
-                
-                # Find event containers - try multiple selectors for different Drupal versions
-                event_containers = soup.find_all('div', class_='node--type-event') or \
-                                 soup.find_all('article', class_='node--type-event') or \
-                                 soup.find_all('div', class_='content-list-item') or \
-                                 soup.find_all('div', class_='event-item') or \
-                                 soup.find_all('article', class_='event') or \
-                                 soup.find_all('div', class_='views-row') or \
-                                 soup.find_all('li', class_='event') or \
-                                 soup.find_all('article', class_=lambda x: x and 'node' in x) or \
-                                 soup.find_all('div', class_=lambda x: x and 'event' in x.lower())
-
-                print(f"    Found {len(event_containers)} events on page {page}")
-
-                if not event_containers:
-                    print(f"    No events found on page {page}")
-                    break
-                
-                # Extract events from this page
-                for container in event_containers:
-                    event = self._extract_event_from_container(container)
-                    if event and event.get('title'):
-                        # Optionally fetch detailed information from individual event page
-                        if fetch_details and event.get('source_url'):
-                            detailed_event = self._fetch_event_details(event)
-                            if detailed_event:
-                                event.update(detailed_event)
-                        all_events.append(event)
-                
-                # Check for pagination
-                if not self._has_next_page(soup, page):
-                    break
-                
-                page += 1
-                time.sleep(2)  # Be respectful
+        while page <= max_pages:
+            # Build URL for current page
+            if page == 0:
+                url = self.events_url
+            else:
+                url = f"{self.events_url}?page={page}"
+
+            print(f"Scraping page {page} from: {url}")
             
-            # Remove duplicates and sort by date
-            unique_events = self._deduplicate_events(all_events)
-            unique_events.sort(key=lambda x: x.get('start_date', ''))
+            self.rate_limiter.acquire(url)
+            response = self.scraper.get(url, timeout=30)
+            response.raise_for_status()
+
+            # Header / <meta> charset; the body is only sniffed when both are missing
+            page_events, has_next = PARSE_STAGE.run(
+                self.department_name, parse_listing_page, self.department_name, self.base_url,
+                self.events_url, self.meta_category, response.content, response_encoding(response), page,
+                self.listing_engine
+            )
+
+            for event in page_events:
+                # Optionally fetch detailed information from individual event page
+                if fetch_details and event.get('source_url'):
+                    # Copy the context so the payload recorder sees the detail fetches
+                    detail_jobs.append(detail_pool.submit(
+                        contextvars.copy_context().run, self._fetch_detail_page, event
+                    ))
+                all_events.append(event)
+
+            if not has_next:
+                break
             
-            print(f"Total unique events found: {len(unique_events)}")
-            return unique_events
+            page += 1
 
-        except Exception as e:
-            print(f"Error scraping {self.department_name} events: {e}")
-            return []
+        return all_events
+
+    def parse_listing_page(self, content: bytes, encoding: str, page: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Extract the events on one listing page. Returns (events, has_next_page)."""
+        if self.listing_engine == 'lxml':
+            root = drupal_listing_lxml.parse_html(content, encoding)
+            event_containers, pagination = drupal_listing_lxml.scan_listing(root)
+            container_fields = drupal_listing_lxml.container_fields
+        else:
+            # Bytes and their known encoding go straight to the parser, no decoded copy
+            soup = BeautifulSoup(content, 'html.parser', from_encoding=encoding)
+
+            # Find event containers - try multiple selectors for different Drupal versions
+            event_containers = soup.find_all('div', class_='node--type-event') or \
+                             soup.find_all('article', class_='node--type-event') or \
+                             soup.find_all('div', class_='content-list-item') or \
+                             soup.find_all('div', class_='event-item') or \
+                             soup.find_all('article', class_='event') or \
+                             soup.find_all('div', class_='views-row') or \
+                             soup.find_all('li', class_='event') or \
+                             soup.find_all('article', class_=lambda x: x and 'node' in x) or \
+                             soup.find_all('div', class_=lambda x: x and 'event' in x.lower())
+            container_fields = self._container_fields
+
+        print(f"    Found {len(event_containers)} events on page {page}")
+
+        if not event_containers:
+            print(f"    No events found on page {page}")
+            return [], False
+
+        # Extract events from this page
+        events = []
+        for container in event_containers:
+            event = self._event_from_fields(container_fields(container))
+            if event and event.get('title'):
+                events.append(event)
+
+        # Check for pagination
+        if self.listing_engine == 'lxml':
+            return events, drupal_listing_lxml.has_next_page(pagination)
+        return events, self._has_next_page(soup, page)
     
     def _extract_event_from_container(self, container) -> Dict[str, Any]:
         """Extract event information from a Drupal container"""
-        event = {
-            'id': '',
-            'title': '',
-            'description': '',
-            'start_date': '',
-            'end_date': None,
-            'time': '',
-            'location': 'Princeton University',
-            'event_type': 'Event',
-            'department': self.department_name,
-            'meta_category': self.meta_category,
-            'source_url': '',
-            'source_name': f'{self.department_name} Events',
-            'speaker': '',
-            'audience': '',
-            'topics': [],
-            'departments': [],
-            'tags': [],
-            'series': '',
-            'speaker_affiliation': '',
-            'speaker_url': '',
-            'image_url': '',
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
-        }
-        
+        return self._event_from_fields(self._container_fields(container))
+
+    def _container_fields(self, container) -> Dict[str, Any]:
+        """
+        Raw strings pulled out of one event container with BeautifulSoup.
+        drupal_listing_lxml.container_fields() is the lxml equivalent; both
+        feed _event_from_fields() so the two engines build identical events.
+        """
+        fields = {}
+
         # Extract title and URL - try multiple selectors
         title_link = None
 
@@ -157,18 +286,8 @@ class UniversalDrupalCloudScraper:
                         break
 
         if title_link:
-            event['title'] = title_link.get_text(strip=True).encode('ascii', 'ignore').decode('ascii')
-            href = title_link.get('href')
-            if href:
-                if href.startswith('http'):
-                    event['source_url'] = href
-                else:
-                    event['source_url'] = self.base_url + href
-                safe_title = event['title'][:20].replace(' ', '_').encode('ascii', 'ignore').decode('ascii')
-                event['id'] = f"{self.department_name.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}_{safe_title}"
-        
-        # Extract date - try multiple methods
-        date_extracted = False
+            fields['title'] = title_link.get_text(strip=True)
+            fields['href'] = title_link.get('href')
 
         # Method 1: Date badge (original method)
         date_badge = container.find('div', class_='date-badge')
@@ -176,83 +295,127 @@ class UniversalDrupalCloudScraper:
             month_elem = date_badge.find('div', class_='month')
             day_elem = date_badge.find('div', class_='day')
             if month_elem and day_elem:
-                month = month_elem.get_text(strip=True)
-                day = day_elem.get_text(strip=True)
-                current_year = datetime.now().year
-                event['start_date'] = f"{current_year}-{self._month_to_number(month)}-{day.zfill(2)}"
-                date_extracted = True
+                fields['badge'] = (month_elem.get_text(strip=True), day_elem.get_text(strip=True))
 
         # Method 2: Date wrapper with dynamic tokens (politics site style)
-        if not date_extracted:
-            date_wrapper = container.find('div', class_='date-wrapper')
-            if date_wrapper:
-                month_field = date_wrapper.find('div', class_=lambda x: x and 'event-month' in x)
-                day_field = date_wrapper.find('div', class_=lambda x: x and 'event-day' in x)
-
-                if month_field and day_field:
-                    month = month_field.get_text(strip=True)
-                    day = day_field.get_text(strip=True)
-                    current_year = datetime.now().year
-                    event['start_date'] = f"{current_year}-{self._month_to_number(month)}-{day.zfill(2)}"
-                    date_extracted = True
-        
-        # Extract full date and time information
+        date_wrapper = container.find('div', class_='date-wrapper')
+        if date_wrapper:
+            month_field = date_wrapper.find('div', class_=lambda x: x and 'event-month' in x)
+            day_field = date_wrapper.find('div', class_=lambda x: x and 'event-day' in x)
+            if month_field and day_field:
+                fields['wrapper'] = (month_field.get_text(strip=True), day_field.get_text(strip=True))
+
+        # Full date and time information
         date_elem = container.find('div', class_='field--name-field-ps-events-date')
         if date_elem:
-            # Look for day span
             day_span = date_elem.find('span', class_='day')
             if day_span:
-                date_text = day_span.get_text(strip=True)
-                # Parse date like "Wed, Sep 24, 2025"
-                parsed_date = self._parse_date(date_text)
-                if parsed_date:
-                    event['start_date'] = parsed_date
-
-            # Look for time spans first (preferred method)
-            time_spans = date_elem.find_all('span', class_='time')
-            if time_spans:
-                if len(time_spans) == 1:
-                    event['time'] = time_spans[0].get_text(strip=True)
-                elif len(time_spans) == 2:
-                    # Handle time range like "4:30 pm – 6:00 pm"
-                    start_time = time_spans[0].get_text(strip=True)
-                    end_time = time_spans[1].get_text(strip=True)
-                    event['time'] = f"{start_time} – {end_time}"
-            else:
-                # Fallback: extract time from the full text content of the date element
-                date_text = date_elem.get_text(strip=True)
-                # Look for time patterns like "3:00 pm", "4:30 pm – 6:00 pm", etc.
-                time_patterns = [
-                    r'(\d{1,2}:\d{2}\s*(?:am|pm|AM|PM)(?:\s*–\s*\d{1,2}:\d{2}\s*(?:am|pm|AM|PM))?)',  # "3:00 pm – 4:20 pm"
-                    r'(\d{1,2}:\d{2}\s*(?:am|pm|AM|PM))',  # Single time like "3:00 pm"
-                    r'(\d{1,2}\s*(?:am|pm|AM|PM)(?:\s*–\s*\d{1,2}\s*(?:am|pm|AM|PM))?)',  # "3 pm – 4 pm"
-                    r'(\d{1,2}\s*(?:am|pm|AM|PM))'  # Single time like "3 pm"
-                ]
-
-                for pattern in time_patterns:
-                    match = re.search(pattern, date_text, re.IGNORECASE)
-                    if match:
-                        event['time'] = match.group(1).strip()
-                        break
-        
-        # Extract location
+                fields['date_day'] = day_span.get_text(strip=True)
+            fields['time_spans'] = [span.get_text(strip=True) for span in date_elem.find_all('span', class_='time')]
+            if not fields['time_spans']:
+                fields['date_text'] = date_elem.get_text(strip=True)
+
         location_elem = container.find('div', class_='field--name-field-ps-events-location-name')
         if location_elem:
             location_item = location_elem.find('div', class_='field__item')
             if location_item:
-                event['location'] = location_item.get_text(strip=True)
-        
-        # Extract audience information
+                fields['location'] = location_item.get_text(strip=True)
+
         audience_elem = container.find('div', class_='field--name-field-ps-events-audience')
         if audience_elem:
-            event['audience'] = audience_elem.get_text(strip=True)
-        
-        # Extract event category/series
+            fields['audience'] = audience_elem.get_text(strip=True)
+
         category_elem = container.find('div', class_='field--name-field-ps-events-category')
         if category_elem:
             category_item = category_elem.find('div', class_='field__item')
             if category_item:
-                event['series'] = category_item.get_text(strip=True)
+                fields['series'] = category_item.get_text(strip=True)
+
+        summary_elem = container.find('div', class_='field--name-field-ps-summary')
+        if summary_elem:
+            fields['summary'] = summary_elem.get_text(strip=True)
+
+        img_elem = container.find('img')
+        if img_elem:
+            fields['image_src'] = img_elem.get('src')
+
+        return fields
+
+    def _event_from_fields(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the event dict from the raw container fields"""
+        event = {
+            'id': '',
+            'title': '',
+            'description': '',
+            'start_date': '',
+            'end_date': None,
+            'time': '',
+            'location': 'Princeton University',
+            'event_type': 'Event',
+            'department': self.department_name,
+            'meta_category': self.meta_category,
+            'source_url': '',
+            'source_name': f'{self.department_name} Events',
+            'speaker': '',
+            'audience': '',
+            'topics': [],
+            'departments': [],
+            'tags': [],
+            'series': '',
+            'speaker_affiliation': '',
+            'speaker_url': '',
+            'image_url': '',
+            'created_at': datetime.now().isoformat(),
+            'updated_at': datetime.now().isoformat()
+        }
+        
+        if 'title' in fields:
+            event['title'] = fields['title'].encode('ascii', 'ignore').decode('ascii')
+            href = fields.get('href')
+            if href:
+                if href.startswith('http'):
+                    event['source_url'] = href
+                else:
+                    event['source_url'] = self.base_url + href
+                safe_title = event['title'][:20].replace(' ', '_').encode('ascii', 'ignore').decode('ascii')
+                event['id'] = f"{self.department_name.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}_{safe_title}"
+        
+        # Date badge first, then the date wrapper
+        month_day = fields.get('badge') or fields.get('wrapper')
+        if month_day:
+            month, day = month_day
+            month_num = month_number(month)
+            if month_num:
+                event['start_date'] = f"{datetime.now().year}-{month_num:02d}-{day.zfill(2)}"
+        
+        if fields.get('date_day'):
+            # Parse date like "Wed, Sep 24, 2025"
+            parsed_date = self._parse_date(fields['date_day'])
+            if parsed_date:
+                event['start_date'] = parsed_date
+
+        # Time spans first (preferred method)
+        time_spans = fields.get('time_spans')
+        if time_spans:
+            if len(time_spans) == 1:
+                event['time'] = time_spans[0]
+            elif len(time_spans) == 2:
+                # Handle time range like "4:30 pm – 6:00 pm"
+                event['time'] = f"{time_spans[0]} – {time_spans[1]}"
+        elif 'date_text' in fields:
+            # Fallback: extract time from the full text content of the date element
+            for pattern in TIME_PATTERNS:
+                match = pattern.search(fields['date_text'])
+                if match:
+                    event['time'] = match.group(1).strip()
+                    break
+        
+        if 'location' in fields:
+            event['location'] = fields['location']
+        if 'audience' in fields:
+            event['audience'] = fields['audience']
+        if 'series' in fields:
+            event['series'] = fields['series']
         
         # Extract speaker information from title
         if event.get('title'):
@@ -269,15 +432,11 @@ class UniversalDrupalCloudScraper:
                     if re.match(r'^[A-Z][a-z]+ [A-Z][a-z-]+', potential_speaker):
                         event['speaker'] = potential_speaker
         
-        # Extract summary/description
-        summary_elem = container.find('div', class_='field--name-field-ps-summary')
-        if summary_elem:
-            event['description'] = summary_elem.get_text(strip=True)
+        if 'summary' in fields:
+            event['description'] = fields['summary']
         
-        # Extract image URL
-        img_elem = container.find('img')
-        if img_elem and img_elem.get('src'):
-            src = img_elem.get('src')
+        src = fields.get('image_src')
+        if src:
             if src.startswith('http'):
                 event['image_url'] = src
             else:
@@ -289,190 +448,88 @@ class UniversalDrupalCloudScraper:
         
         return event
     
-    def _fetch_event_details(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Fetch detailed information from individual event page"""
+    def _fetch_detail_page(self, event: Dict[str, Any]) -> Optional[DetailPage]:
+        """The event's cached details, or its detail page downloaded but not parsed"""
+        details = self.detail_cache.cached(event)
+        if details is not None:
+            return DetailPage(event, details)
         try:
-            if not event.get('source_url'):
-                return None
-            
             print(f"    Fetching details for: {event['title'][:50].encode('ascii', 'ignore').decode('ascii')}...")
+            self.rate_limiter.acquire(event['source_url'])
             response = self.scraper.get(event['source_url'], timeout=30)
             response.raise_for_status()
-
-            # Handle encoding issues
-            response.encoding = response.apparent_encoding or 'utf-8'
-            soup = BeautifulSoup(response.content.decode(response.encoding, errors='replace'), 'html.parser')
-            details = {}
-
-            # Extract detailed description from meta description tag
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc and meta_desc.get('content'):
-                details['description'] = meta_desc['content'].strip()
-            else:
-                # Fallback to body content if meta description not found
-                description_elem = soup.find('div', class_='field--name-body') or soup.find('div', class_='field--name-field-ps-events-description')
-                if description_elem:
-                    details['description'] = description_elem.get_text(strip=True)
-
-            # Skip speaker extraction - focus on times only
-            # Extract speaker information (minimal/simple version)
-            speaker_elem = soup.find('div', class_='field--name-field-ps-events-speaker')
-            if speaker_elem:
-                # Simple speaker extraction - just get names, no complex parsing
-                speaker_names = []
-                speaker_links = speaker_elem.find_all('a')
-                for link in speaker_links:
-                    name = link.get_text(strip=True)
-                    if name and len(name) > 2:  # Avoid generic links
-                        speaker_names.append(name)
-
-                if speaker_names:
-                    details['speaker'] = '; '.join(speaker_names[:3])  # Limit to first 3 speakers
-
-            # Extract time information if not already extracted
-            if not event.get('time'):
-                date_elem = soup.find('div', class_='field--name-field-ps-events-date')
-                if date_elem:
-                    # Look for time spans
-                    time_spans = date_elem.find_all('span', class_='time')
-                    if time_spans:
-                        if len(time_spans) == 1:
-                            details['time'] = time_spans[0].get_text(strip=True)
-                        elif len(time_spans) == 2:
-                            # Handle time range like "4:30 pm – 6:00 pm"
-                            start_time = time_spans[0].get_text(strip=True)
-                            end_time = time_spans[1].get_text(strip=True)
-                            details['time'] = f"{start_time} – {end_time}"
-
-            # Extract additional topics/tags
-            topics_elem = soup.find('div', class_='field--name-field-ps-events-topics')
-            if topics_elem:
-                topic_items = topics_elem.find_all('div', class_='field__item')
-                topics = [item.get_text(strip=True) for item in topic_items if item.get_text(strip=True)]
-                details['topics'] = topics
-
-            time.sleep(1)  # Be respectful
-            return details
-
+            return DetailPage(event, None, response.content, response_encoding(response))
         except Exception as e:
             print(f"    Could not fetch details for {event['title'][:30]}: {e}")
             return None
+
+    def parse_event_details(self, event: Dict[str, Any], content: bytes, encoding: str) -> Dict[str, Any]:
+        """Extract the detail fields from an event page"""
+        soup = BeautifulSoup(content, 'html.parser', from_encoding=encoding)
+        details = {}
+
+        # Extract detailed description from meta description tag
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        if meta_desc and meta_desc.get('content'):
+            details['description'] = meta_desc['content'].strip()
+        else:
+            # Fallback to body content if meta description not found
+            description_elem = soup.find('div', class_='field--name-body') or soup.find('div', class_='field--name-field-ps-events-description')
+            if description_elem:
+                details['description'] = description_elem.get_text(strip=True)
+
+        # Skip speaker extraction - focus on times only
+        # Extract speaker information (minimal/simple version)
+        speaker_elem = soup.find('div', class_='field--name-field-ps-events-speaker')
+        if speaker_elem:
+            # Simple speaker extraction - just get names, no complex parsing
+            speaker_names = []
+            speaker_links = speaker_elem.find_all('a')
+            for link in speaker_links:
+                name = link.get_text(strip=True)
+                if name and len(name) > 2:  # Avoid generic links
+                    speaker_names.append(name)
+
+            if speaker_names:
+                details['speaker'] = '; '.join(speaker_names[:3])  # Limit to first 3 speakers
+
+        # Extract time information if not already extracted
+        if not event.get('time'):
+            date_elem = soup.find('div', class_='field--name-field-ps-events-date')
+            if date_elem:
+                # Look for time spans
+                time_spans = date_elem.find_all('span', class_='time')
+                if time_spans:
+                    if len(time_spans) == 1:
+                        details['time'] = time_spans[0].get_text(strip=True)
+                    elif len(time_spans) == 2:
+                        # Handle time range like "4:30 pm – 6:00 pm"
+                        start_time = time_spans[0].get_text(strip=True)
+                        end_time = time_spans[1].get_text(strip=True)
+                        details['time'] = f"{start_time} – {end_time}"
+
+        # Extract additional topics/tags
+        topics_elem = soup.find('div', class_='field--name-field-ps-events-topics')
+        if topics_elem:
+            topic_items = topics_elem.find_all('div', class_='field__item')
+            topics = [item.get_text(strip=True) for item in topic_items if item.get_text(strip=True)]
+            details['topics'] = topics
+
+        return details
     
     def _parse_date(self, date_text: str) -> str:
         """Parse date text like 'Monday, November 10, 2025' or 'Wed, Sep 24, 2025' or 'Sep 8, 2025'"""
-        try:
-            # Clean the text
-            date_text = re.sub(r'\s+', ' ', date_text.strip())
-
-            # Try pattern with full month name and day of week: "Monday, November 10, 2025"
-            date_match = re.search(r'\w+,\s+(\w+)\s+(\d{1,2}),\s+(\d{4})', date_text)
-            if date_match:
-                month = date_match.group(1)
-                day = date_match.group(2)
-                year = date_match.group(3)
-
-                # Convert month name to number
-                month_num = self._month_to_number(month)
-                return f"{year}-{month_num}-{day.zfill(2)}"
-
-            # Try pattern with day of week: "Wed, Sep 24, 2025"
-            date_match = re.search(r'(\w+),?\s+(\w+)\s+(\d{1,2}),?\s+(\d{4})', date_text)
-            if date_match:
-                # Skip the day of week if present
-                month = date_match.group(2)
-                day = date_match.group(3)
-                year = date_match.group(4)
-
-                # Convert month abbreviation to number
-                month_num = self._month_to_number(month)
-                return f"{year}-{month_num}-{day.zfill(2)}"
-
-            # Try pattern without day of week: "Sep 8, 2025"
-            date_match = re.search(r'(\w+)\s+(\d{1,2}),?\s+(\d{4})', date_text)
-            if date_match:
-                month = date_match.group(1)
-                day = date_match.group(2)
-                year = date_match.group(3)
-
-                # Convert month abbreviation to number
-                month_num = self._month_to_number(month)
-                return f"{year}-{month_num}-{day.zfill(2)}"
-        except:
-            pass
-
-        return ""
-    
-    def _month_to_number(self, month: str) -> str:
-        """Convert month name or abbreviation to number"""
-        months = {
-            # Abbreviations
-            'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-            'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
-            'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12',
-            # Full names
-            'January': '01', 'February': '02', 'March': '03', 'April': '04',
-            'May': '05', 'June': '06', 'July': '07', 'August': '08',
-            'September': '09', 'October': '10', 'November': '11', 'December': '12'
-        }
-        return months.get(month, '01')
+        day = parse_date(date_text)
+        return day.isoformat() if day else ""
     
     def _determine_event_type(self, title: str, series: str) -> str:
         """Determine event type based on title and series"""
-        text = (title + ' ' + series).lower()
-        
-        type_keywords = {
-            'seminar': 'Seminar',
-            'colloquium': 'Colloquium',
-            'lecture': 'Lecture',
-            'talk': 'Talk',
-            'workshop': 'Workshop',
-            'conference': 'Conference',
-            'panel': 'Panel',
-            'discussion': 'Discussion',
-            'symposium': 'Symposium',
-            'meeting': 'Meeting',
-            'presentation': 'Presentation',
-            'kruzhok': 'Kruzhok',
-            'artist': 'Artist Talk',
-            'exhibition': 'Exhibition',
-            'film': 'Film Screening',
-            'screening': 'Film Screening'
-        }
-        
-        for keyword, event_type in type_keywords.items():
-            if keyword in text:
-                return event_type
-        
-        return 'Event'
+        return VOCABULARY.event_type(title, series)
     
     def _extract_tags(self, title: str, description: str) -> List[str]:
         """Extract relevant tags from title and description"""
-        text = (title + ' ' + description).lower()
-        tags = []
-        
-        # Add department-specific tags based on meta category
-        if self.meta_category == 'arts_humanities':
-            tags.extend(['humanities', 'arts', 'literature', 'history', 'philosophy', 'culture'])
-        elif self.meta_category == 'social_sciences':
-            tags.extend(['social sciences', 'sociology', 'politics', 'economics', 'anthropology'])
-        elif self.meta_category == 'sciences_engineering':
-            tags.extend(['science', 'engineering', 'technology', 'research', 'innovation'])
-        elif self.meta_category == 'area_studies':
-            tags.extend(['area studies', 'international', 'global', 'cultural studies'])
-        elif self.meta_category == 'interdisciplinary':
-            tags.extend(['interdisciplinary', 'cross-disciplinary', 'multidisciplinary'])
-        
-        # Add common academic tags
-        common_tags = [
-            'princeton', 'university', 'academic', 'event', 'education',
-            'seminar', 'colloquium', 'lecture', 'talk', 'workshop',
-            'conference', 'presentation', 'discussion', 'symposium'
-        ]
-        tags.extend(common_tags)
-        
-        # Filter tags that appear in the text
-        filtered_tags = [tag for tag in tags if tag in text and tag not in tags]
-        return filtered_tags
+        vocabulary = TAG_VOCABULARIES.get(self.meta_category, COMMON_TAG_VOCABULARY)
+        return vocabulary.extract_tags(title, description)
     
     def _has_next_page(self, soup, current_page: int) -> bool:
         """Check if there's a next page"""
@@ -523,128 +580,144 @@ class UniversalDrupalCloudScraper:
         print(f"Saved {len(events)} events to {filename}")
 
 
+def parse_listing_page(department_name: str, base_url: str, events_url: str, meta_category: str,
+                       content: bytes, encoding: str, page: int,
+                       listing_engine: str = DEFAULT_LISTING_ENGINE) -> Tuple[List[Dict[str, Any]], bool]:
+    """Picklable entry point for PARSE_STAGE"""
+    scraper = UniversalDrupalCloudScraper(department_name, base_url, events_url, meta_category,
+                                          listing_engine=listing_engine)
+    return scraper.parse_listing_page(content, encoding, page)
+
+
+def parse_event_details(department_name: str, base_url: str, events_url: str, meta_category: str,
+                        event: Dict[str, Any], content: bytes, encoding: str) -> Dict[str, Any]:
+    """Picklable entry point for PARSE_STAGE"""
+    scraper = UniversalDrupalCloudScraper(department_name, base_url, events_url, meta_category)
+    return scraper.parse_event_details(event, content, encoding)
+
+
 # Department configurations for easy testing
 DEPARTMENT_CONFIGS = {
     'history': {
         'name': 'History',
         'base_url': 'https://history.princeton.edu',
         'events_url': 'https://history.princeton.edu/news-events/events',
-        'meta_category': 'arts_humanities'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('History')
     },
     'sociology': {
         'name': 'Sociology',
         'base_url': 'https://sociology.princeton.edu',
         'events_url': 'https://sociology.princeton.edu/events',
-        'meta_category': 'social_sciences'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Sociology')
     },
     'anthropology': {
         'name': 'Anthropology',
         'base_url': 'https://anthropology.princeton.edu',
         'events_url': 'https://anthropology.princeton.edu/news-events/events',
-        'meta_category': 'social_sciences'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Anthropology')
     },
     'african_studies': {
         'name': 'African Studies',
         'base_url': 'https://afs.princeton.edu',
         'events_url': 'https://afs.princeton.edu/events',
-        'meta_category': 'area_studies'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('African Studies')
     },
     'slavic_languages': {
         'name': 'Slavic Languages and Literatures',
         'base_url': 'https://slavic.princeton.edu',
         'events_url': 'https://slavic.princeton.edu/events',
-        'meta_category': 'arts_humanities'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Slavic Languages and Literatures')
     },
     'french_italian': {
         'name': 'French & Italian',
         'base_url': 'https://frit.princeton.edu',
         'events_url': 'https://frit.princeton.edu/events',
-        'meta_category': 'arts_humanities'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('French & Italian')
     },
     'neuroscience': {
         'name': 'Princeton Neuroscience Institute',
         'base_url': 'https://pni.princeton.edu',
         'events_url': 'https://pni.princeton.edu/events',
-        'meta_category': 'sciences_engineering'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Princeton Neuroscience Institute')
     },
     'uchv': {
         'name': 'University Center for Human Values',
         'base_url': 'https://uchv.princeton.edu',
         'events_url': 'https://uchv.princeton.edu/events',
-        'meta_category': 'interdisciplinary'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('University Center for Human Values')
     },
     'cbe': {
         'name': 'Chemical and Biological Engineering',
         'base_url': 'https://cbe.princeton.edu',
         'events_url': 'https://cbe.princeton.edu/events',
-        'meta_category': 'engineering'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Chemical and Biological Engineering')
     },
     'orfe': {
         'name': 'Operations Research and Financial Engineering',
         'base_url': 'https://orfe.princeton.edu',
         'events_url': 'https://orfe.princeton.edu/events',
-        'meta_category': 'engineering'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Operations Research and Financial Engineering')
     },
     'ece': {
         'name': 'Electrical and Computer Engineering',
         'base_url': 'https://ece.princeton.edu',
         'events_url': 'https://ece.princeton.edu/events',
-        'meta_category': 'engineering'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Electrical and Computer Engineering')
     }
 ,
     'history': {
         'name': 'History',
         'base_url': 'https://history.princeton.edu',
         'events_url': 'https://history.princeton.edu/news-events/events',
-        'meta_category': 'arts_humanities'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('History')
     },
     'classics': {
         'name': 'Classics',
         'base_url': 'https://classics.princeton.edu',
         'events_url': 'https://classics.princeton.edu/events',
-        'meta_category': 'arts_humanities'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Classics')
     },
     'english': {
         'name': 'English',
         'base_url': 'https://english.princeton.edu',
         'events_url': 'https://english.princeton.edu/events',
-        'meta_category': 'arts_humanities'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('English')
     },
     'art_archaeology': {
         'name': 'Art and Archaeology',
         'base_url': 'https://artandarchaeology.princeton.edu',
         'events_url': 'https://artandarchaeology.princeton.edu/events',
-        'meta_category': 'arts_humanities'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Art and Archaeology')
     },
     'comparative_literature': {
         'name': 'Comparative Literature',
         'base_url': 'https://complit.princeton.edu',
         'events_url': 'https://complit.princeton.edu/events',
-        'meta_category': 'arts_humanities'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Comparative Literature')
     },
     'near_eastern_studies': {
         'name': 'Near Eastern Studies',
         'base_url': 'https://nes.princeton.edu',
         'events_url': 'https://nes.princeton.edu/events',
-        'meta_category': 'area_studies'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Near Eastern Studies')
     },
     'east_asian_studies': {
         'name': 'East Asian Studies',
         'base_url': 'https://eas.princeton.edu',
         'events_url': 'https://eas.princeton.edu/events',
-        'meta_category': 'area_studies'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('East Asian Studies')
     },
     'french_italian': {
         'name': 'French & Italian',
         'base_url': 'https://frit.princeton.edu',
         'events_url': 'https://frit.princeton.edu/events',
-        'meta_category': 'arts_humanities'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('French & Italian')
     },
     'neuroscience': {
         'name': 'Princeton Neuroscience Institute',
         'base_url': 'https://pni.princeton.edu',
         'events_url': 'https://pni.princeton.edu/events',
-        'meta_category': 'sciences_engineering'
+        'meta_category': DEPARTMENT_CATALOG.meta_category('Princeton Neuroscience Institute')
     },
 }
 
@@ -4,171 +4,208 @@ Universal ICS calendar scraper for Princeton departments.
 All Princeton Drupal sites expose /feeds/events/ical.ics which bypasses
 Cloudflare bot protection (it's a calendar feed endpoint, not a browser page).
 """
-import requests
+import contextvars
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import re
-from typing import List, Dict, Any
-from icalendar import Calendar
-import pytz
+from typing import Any, Callable, List, Dict, Optional, Tuple
+from http_cache import FEED_CACHE
+from event_record import Event, json_default
+from event_window import EventWindow, RUN_WINDOW, cache_variant
+from http_client import HTTP_CLIENT
+from ics_stream import iter_vevents
+from parse_stage import PARSE_STAGE
+from keyword_classifier import Vocabulary
+from date_normalizer import clock, to_local
+from department_catalog import DEPARTMENT_CATALOG
 
-# All departments confirmed to have working ICS feeds
+# All departments confirmed to have working ICS feeds; meta_category comes from the department catalog
 ICS_DEPARTMENTS = [
-    # name, domain, meta_category
-    ('Anthropology',              'anthropology.princeton.edu',       'social_sciences'),
-    ('English',                   'english.princeton.edu',             'arts_humanities'),
-    ('Classics',                  'classics.princeton.edu',            'arts_humanities'),
-    ('Comparative Literature',    'complit.princeton.edu',             'arts_humanities'),
-    ('Music',                     'music.princeton.edu',               'arts_humanities'),
-    ('Art & Archaeology',         'artandarchaeology.princeton.edu',   'arts_humanities'),
-    ('Religion',                  'religion.princeton.edu',            'arts_humanities'),
-    ('Slavic Languages',          'slavic.princeton.edu',              'arts_humanities'),
-    ('Gender & Sexuality Studies','gss.princeton.edu',                 'interdisciplinary'),
-    ('Near Eastern Studies',      'nes.princeton.edu',                 'area_studies'),
-    ('Hellenic Studies',          'hellenic.princeton.edu',            'area_studies'),
-    ('African American Studies',  'aas.princeton.edu',                 'area_studies'),
-    ('CBE',                       'cbe.princeton.edu',                 'sciences_engineering'),
-    ('ORFE',                      'orfe.princeton.edu',                'sciences_engineering'),
-    ('ECE',                       'ece.princeton.edu',                 'sciences_engineering'),
-    ('Molecular Biology',         'molbio.princeton.edu',              'sciences_engineering'),
-    ('EEB',                       'eeb.princeton.edu',                 'sciences_engineering'),
-    ('CEE',                       'cee.princeton.edu',                 'sciences_engineering'),
-    ('MAE',                       'mae.princeton.edu',                 'sciences_engineering'),
-    ('CITP',                      'citp.princeton.edu',                'interdisciplinary'),
-    ('Sociology',                 'sociology.princeton.edu',           'social_sciences'),
-    ('Psychology',                'psychology.princeton.edu',          'social_sciences'),
-    ('History',                   'history.princeton.edu',             'arts_humanities'),
-    ('Neuroscience (PNI)',        'pni.princeton.edu',                 'sciences_engineering'),
-    ('UCHV',                      'uchv.princeton.edu',                'interdisciplinary'),
+    (name, domain, DEPARTMENT_CATALOG.meta_category(name)) for name, domain in [
+        ('Anthropology',               'anthropology.princeton.edu'),
+        ('English',                    'english.princeton.edu'),
+        ('Classics',                   'classics.princeton.edu'),
+        ('Comparative Literature',     'complit.princeton.edu'),
+        ('Music',                      'music.princeton.edu'),
+        ('Art & Archaeology',          'artandarchaeology.princeton.edu'),
+        ('Religion',                   'religion.princeton.edu'),
+        ('Slavic Languages',           'slavic.princeton.edu'),
+        ('Gender & Sexuality Studies', 'gss.princeton.edu'),
+        ('Near Eastern Studies',       'nes.princeton.edu'),
+        ('Hellenic Studies',           'hellenic.princeton.edu'),
+        ('African American Studies',   'aas.princeton.edu'),
+        ('CBE',                        'cbe.princeton.edu'),
+        ('ORFE',                       'orfe.princeton.edu'),
+        ('ECE',                        'ece.princeton.edu'),
+        ('Molecular Biology',          'molbio.princeton.edu'),
+        ('EEB',                        'eeb.princeton.edu'),
+        ('CEE',                        'cee.princeton.edu'),
+        ('MAE',                        'mae.princeton.edu'),
+        ('CITP',                       'citp.princeton.edu'),
+        ('Sociology',                  'sociology.princeton.edu'),
+        ('Psychology',                 'psychology.princeton.edu'),
+        ('History',                    'history.princeton.edu'),
+        ('Neuroscience (PNI)',         'pni.princeton.edu'),
+        ('UCHV',                       'uchv.princeton.edu'),
+    ]
 ]
 
 
+# Event types by priority
+VOCABULARY = Vocabulary(
+    event_types=[
+        ('colloquium', 'Colloquium'), ('seminar', 'Seminar'),
+        ('lecture', 'Lecture'), ('workshop', 'Workshop'),
+        ('conference', 'Conference'), ('symposium', 'Symposium'),
+        ('panel', 'Panel'), ('talk', 'Talk'),
+        ('dissertation', 'Dissertation Defense'), ('defense', 'Dissertation Defense'),
+        ('fpo', 'Dissertation Defense'), ('concert', 'Concert'),
+        ('recital', 'Recital'), ('performance', 'Performance'),
+        ('exhibition', 'Exhibition'), ('screening', 'Film Screening'),
+        ('reading', 'Reading'), ('meeting', 'Meeting'),
+    ],
+)
+
+
 class UniversalICSScraper:
     """Scrapes events from a Princeton department's ICS calendar feed."""
 
-    def __init__(self, department_name: str, domain: str, meta_category: str):
+    def __init__(self, department_name: str, domain: str, meta_category: str,
+                 window: Optional[EventWindow] = None):
         self.department_name = department_name
         self.domain = domain
         self.base_url = f'https://{domain}'
         self.ics_url = f'https://{domain}/feeds/events/ical.ics'
         self.meta_category = meta_category
-        self.princeton_tz = pytz.timezone('America/New_York')
+        self.source_name = f'{department_name} Events'
+        self.feed_cache = FEED_CACHE
+        # Events starting outside the window are skipped by the ICS reader
+        self.window = window if window is not None else RUN_WINDOW.get()
 
     def scrape_events(self) -> List[Dict[str, Any]]:
         print(f'Scraping {self.department_name} from {self.ics_url}')
         try:
-            resp = requests.get(
-                self.ics_url,
-                headers={'User-Agent': 'Mozilla/5.0', 'Accept': '*/*'},
-                timeout=20,
-            )
-            resp.raise_for_status()
-            cal = Calendar.from_ical(resp.content)
-            events = []
-            for component in cal.walk():
-                if component.name == 'VEVENT':
-                    event = self._parse_component(component)
-                    if event and event.get('title'):
-                        events.append(event)
-            events = self._deduplicate(events)
-            events.sort(key=lambda x: x.get('start_date', ''))
-            print(f'  {self.department_name}: {len(events)} events')
-            return events
+            return self.fetch_events()
         except Exception as e:
             print(f'  ERROR {self.department_name}: {e}')
             return []
 
-    def _parse_component(self, component) -> Dict[str, Any]:
-        title = str(component.get('summary', '')).strip()
+    def fetch_events(self) -> List[Dict[str, Any]]:
+        """scrape_events() that raises when the feed errors or is not an iCalendar file"""
+        return self.parse_fetched(self.fetch_feed())
+
+    def fetch_feed(self) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """
+        Conditional GET of the feed, not yet parsed: (response, cache entry
+        when unchanged). Raises when the feed errors or is not an iCalendar file.
+        """
+        resp, cached = self.feed_cache.conditional_get(
+            HTTP_CLIENT.get,
+            self.ics_url,
+            headers={'User-Agent': 'Mozilla/5.0', 'Accept': '*/*'},
+            timeout=20,
+            variant=cache_variant(self.window),
+        )
+        if cached is not None:
+            return resp, cached
+        resp.raise_for_status()
+        # Sites without a feed answer with their HTML 404 or challenge page
+        if not resp.content.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'BEGIN:VCALENDAR'):
+            raise ValueError(f'{self.ics_url} is not an iCalendar feed')
+        return resp, None
+
+    def parse_fetched(self, fetched: Tuple[Any, Optional[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Events of a fetch_feed() result; an unchanged feed is not parsed again"""
+        resp, cached = fetched
+        if cached is not None:
+            print(f'  {self.department_name}: unchanged, {len(cached["events"])} cached events')
+            return cached['events']
+        events = PARSE_STAGE.run(self.department_name, parse_ics_feed, self.department_name,
+                                 self.domain, self.meta_category, resp.content, self.window)
+        self.feed_cache.store(self.ics_url, resp, events, variant=cache_variant(self.window))
+        print(f'  {self.department_name}: {len(events)} events')
+        return events
+
+    def parse_feed(self, content: bytes) -> List[Dict[str, Any]]:
+        events = []
+        texts = []
+        for vevent in iter_vevents(content, window=self.window):
+            event = self._parse_component(vevent)
+            if event and event.get('title'):
+                events.append(event)
+                # The full description; the event keeps only the first 1000 characters
+                texts.append(f"{event['title']} {(vevent.get('description') or '').strip()}")
+        for event, classification in zip(events, VOCABULARY.classify_many(texts)):
+            event['event_type'] = classification.event_type
+        events = self._deduplicate(events)
+        events.sort(key=lambda x: x.get('start_date', ''))
+        return events
+
+    def _parse_component(self, component: Dict[str, Any]) -> Optional[Event]:
+        """
+        component is a VEVENT dict from ics_stream.iter_vevents(). The event
+        type is left to parse_feed(), which classifies the whole feed at once.
+        """
+        title = component.get('summary', '').strip()
         if not title:
-            return {}
+            return None
 
         start_date = ''
         event_time = ''
         end_date = None
 
-        dtstart = component.get('dtstart')
-        if dtstart and hasattr(dtstart, 'dt'):
-            dt = dtstart.dt
+        dt = component.get('dtstart')
+        if dt:
             if isinstance(dt, datetime):
-                if dt.tzinfo:
-                    dt = dt.astimezone(self.princeton_tz)
+                dt = to_local(dt)
                 start_date = dt.strftime('%Y-%m-%d')
-                event_time = dt.strftime('%I:%M %p').lstrip('0')
+                event_time = clock(dt)
             else:
                 start_date = dt.strftime('%Y-%m-%d')
 
-        dtend = component.get('dtend')
-        if dtend and hasattr(dtend, 'dt'):
-            dt = dtend.dt
+        dt = component.get('dtend')
+        if dt:
             if isinstance(dt, datetime):
-                if dt.tzinfo:
-                    dt = dt.astimezone(self.princeton_tz)
+                dt = to_local(dt)
                 end_date = dt.strftime('%Y-%m-%d')
                 if start_date == end_date and event_time:
-                    end_time = dt.strftime('%I:%M %p').lstrip('0')
+                    end_time = clock(dt)
                     event_time = f'{event_time} - {end_time}'
             else:
                 end_date = dt.strftime('%Y-%m-%d')
 
-        description = str(component.get('description', '') or '').strip()
-        location = str(component.get('location', '') or 'Princeton University').strip()
+        description = (component.get('description') or '').strip()
+        location = (component.get('location') or 'Princeton University').strip()
         if not location:
             location = 'Princeton University'
 
-        url = str(component.get('url', '') or '').strip()
+        url = (component.get('url') or '').strip()
         if url and not url.startswith('http'):
             url = self.base_url + url
         if not url:
             url = f'{self.base_url}/events'
 
-        uid = str(component.get('uid', '') or '')
+        uid = component.get('uid') or ''
         safe_title = re.sub(r'[^a-zA-Z0-9]', '_', title[:20])
         dept_slug = re.sub(r'[^a-zA-Z0-9]', '_', self.department_name.lower()[:15])
         event_id = f'ics_{dept_slug}_{uid or safe_title}'
 
-        return {
-            'id': event_id,
-            'title': title,
-            'description': description[:1000],
-            'start_date': start_date,
-            'end_date': end_date,
-            'time': event_time,
-            'location': location,
-            'event_type': self._determine_event_type(title, description),
-            'department': self.department_name,
-            'meta_category': self.meta_category,
-            'source_url': url,
-            'source_name': f'{self.department_name} Events',
-            'speaker': '',
-            'audience': '',
-            'topics': [],
-            'departments': [],
-            'tags': [],
-            'series': '',
-            'speaker_affiliation': '',
-            'speaker_url': '',
-            'image_url': '',
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat(),
-        }
-
-    def _determine_event_type(self, title: str, description: str = '') -> str:
-        text = (title + ' ' + description).lower()
-        for keyword, etype in [
-            ('colloquium', 'Colloquium'), ('seminar', 'Seminar'),
-            ('lecture', 'Lecture'), ('workshop', 'Workshop'),
-            ('conference', 'Conference'), ('symposium', 'Symposium'),
-            ('panel', 'Panel'), ('talk', 'Talk'),
-            ('dissertation', 'Dissertation Defense'), ('defense', 'Dissertation Defense'),
-            ('fpo', 'Dissertation Defense'), ('concert', 'Concert'),
-            ('recital', 'Recital'), ('performance', 'Performance'),
-            ('exhibition', 'Exhibition'), ('screening', 'Film Screening'),
-            ('reading', 'Reading'), ('meeting', 'Meeting'),
-        ]:
-            if keyword in text:
-                return etype
-        return 'Event'
+        return Event(
+            id=event_id,
+            title=title,
+            description=description[:1000],
+            start_date=start_date,
+            end_date=end_date,
+            time=event_time,
+            location=location,
+            department=self.department_name,
+            meta_category=self.meta_category,
+            source_url=url,
+            source_name=self.source_name,
+        )
 
     def _deduplicate(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         seen = set()
@@ -181,16 +218,110 @@ class UniversalICSScraper:
         return unique
 
 
-def scrape_all_ics_departments() -> List[Dict[str, Any]]:
+def parse_ics_feed(department_name: str, domain: str, meta_category: str, content: bytes,
+                   window: Optional[EventWindow] = None) -> List[Dict[str, Any]]:
+    """Picklable entry point for PARSE_STAGE"""
+    return UniversalICSScraper(department_name, domain, meta_category, window).parse_feed(content)
+
+
+def scrape_ics_departments_timed(concurrent: bool = True, max_workers: Optional[int] = None,
+                                 max_per_host: int = 2) -> List[Tuple[str, List[Dict[str, Any]], float]]:
+    """
+    Scrape every ICS department and return (name, events, seconds) per department.
+
+    With concurrent=True the feeds are fetched on a bounded thread pool (one
+    worker per department unless max_workers is given), so the wall-clock time
+    tracks the slowest feed instead of the sum of all of them. At most
+    max_per_host requests run against the same domain at once. Results always
+    come back in ICS_DEPARTMENTS order.
+    """
+    return _run_departments(UniversalICSScraper.scrape_events, concurrent, max_workers, max_per_host)
+
+
+def _run_departments(task: Callable[['UniversalICSScraper'], Any], concurrent: bool, max_workers: Optional[int],
+                     max_per_host: int) -> List[Tuple[str, Any, float]]:
+    """task(scraper) for every ICS department, as (name, result, seconds) in ICS_DEPARTMENTS order"""
+    host_slots: Dict[str, threading.Semaphore] = {}
+    for _, domain, _ in ICS_DEPARTMENTS:
+        host_slots.setdefault(domain, threading.Semaphore(max_per_host))
+
+    def run(name: str, domain: str, category: str) -> Tuple[str, Any, float]:
+        with host_slots[domain]:
+            start = time.perf_counter()
+            result = task(UniversalICSScraper(name, domain, category))
+            return name, result, time.perf_counter() - start
+
+    if not concurrent:
+        return [run(*dept) for dept in ICS_DEPARTMENTS]
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(ICS_DEPARTMENTS)) as pool:
+        # Copy the context per task so payload recorders see the worker fetches
+        futures = [pool.submit(contextvars.copy_context().run, run, *dept) for dept in ICS_DEPARTMENTS]
+        return [future.result() for future in futures]
+
+
+def scrape_all_ics_departments(concurrent: bool = True, max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
     """Scrape all Princeton departments that have ICS feeds."""
+    start = time.perf_counter()
+    results = scrape_ics_departments_timed(concurrent=concurrent, max_workers=max_workers)
+    wall = time.perf_counter() - start
+
     all_events = []
-    for name, domain, category in ICS_DEPARTMENTS:
-        scraper = UniversalICSScraper(name, domain, category)
-        events = scraper.scrape_events()
+    print('\nICS feed latency:')
+    for name, events, elapsed in results:
         all_events.extend(events)
+        print(f'  {name:<28} {elapsed:6.2f}s  {len(events)} events')
+    slowest = max((elapsed for _, _, elapsed in results), default=0.0)
+    total = sum(elapsed for _, _, elapsed in results)
+    print(f'  wall {wall:.2f}s, slowest feed {slowest:.2f}s, sum of feeds {total:.2f}s')
     return all_events
 
 
+def fetch_all_ics_departments(max_workers: Optional[int] = None) -> List[Tuple['UniversalICSScraper', Any]]:
+    """
+    First half of scrape_all_ics_departments(): every feed downloaded but not
+    parsed, as (scraper, fetch_feed() result) pairs. A department whose
+    feed fails is reported and left out.
+    """
+    def fetch(scraper: UniversalICSScraper):
+        try:
+            return scraper, scraper.fetch_feed()
+        except Exception as e:
+            print(f'  ERROR {scraper.department_name}: {e}')
+            return scraper, None
+
+    start = time.perf_counter()
+    results = _run_departments(fetch, True, max_workers, 2)
+    wall = time.perf_counter() - start
+    print('\nICS feed latency:')
+    for name, (_, fetched), elapsed in results:
+        status = 'failed' if fetched is None else ('unchanged' if fetched[1] is not None else 'fetched')
+        print(f'  {name:<28} {elapsed:6.2f}s  {status}')
+    print(f'  wall {wall:.2f}s, slowest feed {max((r[2] for r in results), default=0.0):.2f}s')
+    return [pair for _, pair, _ in results if pair[1] is not None]
+
+
+def parse_all_ics_departments(fetched: List[Tuple['UniversalICSScraper', Any]],
+                              max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Second half: parse the fetched feeds, concurrently so a PARSE_STAGE
+    process pool stays busy. Events come back in ICS_DEPARTMENTS order.
+    """
+    def parse(scraper: UniversalICSScraper, result) -> List[Dict[str, Any]]:
+        try:
+            return scraper.parse_fetched(result)
+        except Exception as e:
+            print(f'  ERROR {scraper.department_name}: {e}')
+            return []
+
+    if not fetched:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers or len(fetched)) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, parse, scraper, result)
+                   for scraper, result in fetched]
+        return [event for future in futures for event in future.result()]
+
+
 if __name__ == '__main__':
     events = scrape_all_ics_departments()
     output = {
@@ -202,5 +333,5 @@ if __name__ == '__main__':
         'events': events,
     }
     with open('universal_ics_events.json', 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+        json.dump(output, f, indent=2, ensure_ascii=False, default=json_default)
     print(f'\nTotal: {len(events)} events saved to universal_ics_events.json')